@@ -1,21 +1,45 @@
 #!/usr/bin/env python3
 """
-Read a CSV with columns: [N Anticipated Test Date] and [YYYY-MM-DD 0:00:00].
-Strip " 0:00:00" from dates and append rows to institution-1-test-data.csv.
-Usage: python add_anticipated_test_dates.py [input.csv]
-Default input: anticipated_test_dates.csv
+Read CSVs with columns: [N Anticipated Test Date] and [YYYY-MM-DD 0:00:00].
+Strip " 0:00:00" from dates and upsert the rows into institution-1-test-data.csv.
+
+Rows are keyed on (student_id, test_name, test_date): a key that is not in the
+test data yet is inserted, one that is but with different other fields is
+updated in place, and an identical one is skipped, so re-running on the same
+export changes nothing. The test data is rewritten through a temp file and
+renamed over the original, so a crash never leaves a half-written CSV.
+
+Usage: python add_anticipated_test_dates.py [input.csv | input_dir ...] [--output test-data.csv] [--dry-run]
+Default input: anticipated_test_dates.csv (directories contribute every *.csv in them)
 """
+import argparse
 import csv
+import os
 import re
-import sys
+import tempfile
 
 INPUT_CSV = "anticipated_test_dates.csv"
 OUTPUT_CSV = "institution-1-test-data.csv"
+TEST_NAME = "Anticipated Test Date"
+HEADER = ["student_id", "test_name", "test_date", "actual_exam_score"]
+
+
+def input_files(paths):
+    """Input CSV paths in order; a directory expands to its *.csv files, sorted by name."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".csv")
+            )
+        else:
+            files.append(path)
+    return files
 
-def main():
-    input_path = sys.argv[1] if len(sys.argv) > 1 else INPUT_CSV
-    rows_to_append = []
 
+def read_anticipated(input_path):
+    """(student_id, test_name, test_date, actual_exam_score) rows from one survey export."""
+    rows = []
     with open(input_path, newline="", encoding="utf-8") as f:
         reader = csv.reader(f)
         for row in reader:
@@ -36,18 +60,93 @@ def main():
                     break
             if not date_str:
                 continue
-            rows_to_append.append((student_id, "Anticipated Test Date", date_str, ""))
+            rows.append([student_id, TEST_NAME, date_str, ""])
+    return rows
+
+
+def _key(row):
+    return row[0].strip(), row[1].strip(), row[2].strip()
+
+
+def upsert(rows, output_csv=OUTPUT_CSV, dry_run=False):
+    """
+    Merge rows into output_csv by (student_id, test_name, test_date) and
+    return {'inserted', 'updated', 'skipped'} counts. Existing rows keep their
+    order (duplicates already in the file are left alone); new ones are
+    appended. Nothing is written on a dry run or when nothing changed.
+    """
+    header, existing, newline = HEADER, [], "\n"
+    if os.path.exists(output_csv):
+        with open(output_csv, newline="", encoding="utf-8") as f:
+            if f.readline().endswith("\r\n"):
+                newline = "\r\n"
+            f.seek(0)
+            reader = csv.reader(f)
+            header = next(reader, None) or HEADER
+            existing = [row for row in reader if row]
+
+    index = {}
+    for pos, row in enumerate(existing):
+        index.setdefault(_key(row), pos)
 
-    if not rows_to_append:
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    for row in rows:
+        pos = index.get(_key(row))
+        if pos is None:
+            index[_key(row)] = len(existing)
+            existing.append(row)
+            counts["inserted"] += 1
+        elif existing[pos] != row:
+            existing[pos] = row
+            counts["updated"] += 1
+        else:
+            counts["skipped"] += 1
+
+    if not dry_run and (counts["inserted"] or counts["updated"]):
+        _write_atomic(output_csv, header, existing, newline)
+    return counts
+
+
+def _write_atomic(path, header, rows, newline="\n"):
+    """Write header + rows to a temp file next to path, then rename it over path."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".csv", dir=directory)
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, lineterminator=newline)
+            writer.writerow(header)
+            writer.writerows(rows)
+        if os.path.exists(path):
+            os.chmod(tmp, os.stat(path).st_mode & 0o777)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Upsert anticipated test dates into the test data CSV.")
+    parser.add_argument("inputs", nargs="*", default=[INPUT_CSV], help="Survey export CSVs or directories of them.")
+    parser.add_argument("--output", default=OUTPUT_CSV, help=f"Test data CSV to update (default: {OUTPUT_CSV}).")
+    parser.add_argument("--dry-run", action="store_true", help="Report the counts without writing.")
+    args = parser.parse_args()
+
+    rows = []
+    files = input_files(args.inputs)
+    for path in files:
+        rows.extend(read_anticipated(path))
+
+    if not rows:
         print("No rows parsed. Check CSV format: first column 'N Anticipated Test Date', another column 'YYYY-MM-DD 0:00:00'")
         return
 
-    with open(OUTPUT_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        for r in rows_to_append:
-            writer.writerow(r)
-
-    print(f"Appended {len(rows_to_append)} rows to {OUTPUT_CSV} (dates cleaned: no 0:00:00).")
+    counts = upsert(rows, args.output, dry_run=args.dry_run)
+    action = "Would update" if args.dry_run else "Updated"
+    print(
+        f"{action} {args.output} from {len(files)} file(s), {len(rows)} rows (dates cleaned: no 0:00:00): "
+        f"{counts['inserted']} inserted, {counts['updated']} updated, {counts['skipped']} skipped."
+    )
 
 if __name__ == "__main__":
     main()
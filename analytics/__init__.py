@@ -0,0 +1,61 @@
+"""
+Headless metric computations behind the dashboard views.
+
+Every function takes and returns plain pandas objects (no Streamlit), so the
+same numbers can be cached per stage, benchmarked, or produced by batch jobs;
+main.py only renders them.
+"""
+
+from analytics.cohort import cohort_groups, cohort_heatmap
+from analytics.convata import (
+    convata_tiers,
+    first_exam_dates,
+    highest_practice_labels,
+    score_outcome_counts,
+    student_detail,
+    took_no_score,
+)
+from analytics.dates import date_labels
+from analytics.engagement import WeekTensor, engagement_tensor
+from analytics.exams import (
+    borderline_scores,
+    first_attempt_outcome_counts,
+    first_attempt_outcomes,
+    highest_practice_scores,
+    score_improvement,
+    student_test_summary,
+    test_date_distribution,
+    test_table,
+)
+from analytics.interventions import intervention_groups, intervention_summary, load_interventions, responded_ids
+from analytics.predictions import prediction_table, score_outlook, taker_shares, untested_summary
+
+__all__ = [
+    'WeekTensor',
+    'borderline_scores',
+    'cohort_groups',
+    'cohort_heatmap',
+    'convata_tiers',
+    'date_labels',
+    'engagement_tensor',
+    'first_attempt_outcome_counts',
+    'first_attempt_outcomes',
+    'first_exam_dates',
+    'highest_practice_labels',
+    'highest_practice_scores',
+    'intervention_groups',
+    'intervention_summary',
+    'load_interventions',
+    'prediction_table',
+    'responded_ids',
+    'score_improvement',
+    'score_outcome_counts',
+    'score_outlook',
+    'student_detail',
+    'student_test_summary',
+    'taker_shares',
+    'test_date_distribution',
+    'test_table',
+    'took_no_score',
+    'untested_summary',
+]
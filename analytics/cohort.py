@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Cohort engagement heatmap: students × weeks of attendance rate or completed
+question sets, aggregated server-side from the engagement tensor.
+
+Students are grouped (large group tier from tier.csv in one date window, or
+first-attempt outcome, so a student sits in the same group as their tier
+badge elsewhere in the dashboard), ordered
+within a group by their value over the whole range, and cut into at most
+MAX_HEATMAP_ROWS contiguous bands; weeks are cut into at most
+MAX_HEATMAP_WEEKS contiguous bins. Every cell is computed from prefix-sum
+differences (attended / scheduled for attendance, the average per
+student-week for question sets), so the chart receives a small matrix
+however many students and weeks there are.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics.exams import ATTENDANCE_WINDOWS, BORDERLINE_SCORE, OUTCOME_ORDER, PASSING_SCORE, student_test_summary
+
+# Heatmap metric -> (numerator, denominator); no denominator = average per student-week with a value
+HEATMAP_METRICS = {
+    'Large group attendance rate': ('num_attended_large_session', 'num_scheduled_large_session'),
+    'Small group attendance rate': ('num_attended_small_session', 'num_scheduled_small_session'),
+    'Completed question sets': ('total_completed_passages_discrete_sets', None),
+}
+COHORT_SORTS = ['Large group tier', 'First-attempt outcome']
+TIER_GROUPS = ['Tier 1', 'Tier 2', 'Tier 3', 'No tier row']
+DEFAULT_TIER_WINDOW = next(iter(ATTENDANCE_WINDOWS))   # the current window, as on Current Status
+OUTCOME_GROUPS = OUTCOME_ORDER + ['No first attempt']
+MAX_HEATMAP_ROWS = 100
+MAX_HEATMAP_WEEKS = 40
+
+
+def _ratio(num, den):
+    num = np.asarray(num, dtype='float64')
+    den = np.asarray(den, dtype='float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def tier_groups(tensor, tier_df, window=DEFAULT_TIER_WINDOW):
+    """large_group_tier in tier.csv's date_window per tensor student ('No tier row' when the student has none)."""
+    labels = pd.Series(TIER_GROUPS[3], index=tensor.students, dtype=object)
+    if tier_df is not None and not tier_df.empty:
+        rows = tier_df[tier_df['date_window'] == window].drop_duplicates('student_id', keep='last')
+        tiers = rows.set_index('student_id')['large_group_tier'].astype(object)
+        known = tiers.reindex(tensor.students)
+        labels = known.where(known.isin(TIER_GROUPS[:3]), TIER_GROUPS[3])
+    return pd.Series(pd.Categorical(labels.to_numpy(), categories=TIER_GROUPS), index=tensor.students)
+
+
+def outcome_groups(tensor, test_df):
+    """First-attempt outcome (Passed / Borderline / Below 495 / No first attempt) per tensor student."""
+    if test_df is not None and not test_df.empty:
+        scores = student_test_summary(test_df)['first_attempt_score'].reindex(tensor.students).to_numpy(dtype='float64')
+    else:
+        scores = np.full(len(tensor.students), np.nan)
+    labels = np.select(
+        [scores >= PASSING_SCORE, scores >= BORDERLINE_SCORE, ~np.isnan(scores)], OUTCOME_GROUPS[:3], OUTCOME_GROUPS[3]
+    )
+    return pd.Series(pd.Categorical(labels, categories=OUTCOME_GROUPS), index=tensor.students)
+
+
+def cohort_groups(tensor, sort_by, test_df=None, tier_df=None, window=DEFAULT_TIER_WINDOW):
+    """
+    Group per tensor student for one of COHORT_SORTS, as a categorical in
+    display order; the large group tier is read from tier_df's window.
+    """
+    if sort_by == COHORT_SORTS[1]:
+        return outcome_groups(tensor, test_df)
+    return tier_groups(tensor, tier_df, window)
+
+
+def _week_edges(tensor, first_week, last_week, max_weeks):
+    lo, hi = tensor.week_bounds(first_week, last_week)
+    step = max(1, -(-(hi - lo) // max_weeks))
+    return np.append(np.arange(lo, hi, step), hi) if hi > lo else np.array([lo])
+
+
+def _week_label(weeks, lo, hi):
+    return f'{weeks[lo]}' if hi - lo == 1 else f'{weeks[lo]}–{weeks[hi - 1]}'
+
+
+def _band_starts(group_sizes, max_rows):
+    """Start row of every band: each non-empty group gets bands in proportion to its size (at least one)."""
+    total = sum(group_sizes)
+    starts, offset = [], 0
+    for size in group_sizes:
+        if size:
+            n_bands = min(size, max(1, max_rows * size // total))
+            starts.extend(offset + np.linspace(0, size, n_bands + 1).astype(int)[:-1])
+        offset += size
+    return np.array(starts, dtype=int)
+
+
+def cohort_heatmap(tensor, metric, groups, first_week=None, last_week=None,
+                   max_rows=MAX_HEATMAP_ROWS, max_weeks=MAX_HEATMAP_WEEKS):
+    """
+    (matrix, bands) for one HEATMAP_METRICS entry over weeks first_week..last_week.
+    matrix is bands × week bins (values NaN where nothing was scheduled /
+    recorded), labelled 'group · ranks' by 'week' or 'first–last week';
+    bands has the group and number of students of every matrix row. groups
+    is a categorical per tensor student (see cohort_groups); students are
+    ordered by group, then by their own value over the range (highest
+    first), then by student_id.
+    """
+    numerator, denominator = HEATMAP_METRICS[metric]
+    edges = _week_edges(tensor, first_week, last_week, max_weeks)
+    num = tensor.bin_sums(numerator, edges)
+    den = tensor.bin_sums(denominator, edges) if denominator else tensor.bin_counts(numerator, edges)
+
+    codes = groups.reindex(tensor.students).cat.codes.to_numpy()
+    overall = _ratio(num.sum(axis=1), den.sum(axis=1))
+    order = np.lexsort((tensor.students, -np.nan_to_num(overall, nan=-np.inf), codes))
+    sizes = np.bincount(codes[codes >= 0], minlength=len(groups.cat.categories))
+    order = order[codes[order] >= 0]
+
+    starts = _band_starts(sizes, max_rows)
+    if not len(starts):
+        return pd.DataFrame(), pd.DataFrame(columns=['group', 'students'])
+    band_num = np.add.reduceat(num[order], starts, axis=0)
+    band_den = np.add.reduceat(den[order], starts, axis=0)
+    ends = np.append(starts[1:], len(order))
+
+    band_groups = groups.cat.categories[codes[order[starts]]]
+    group_start = np.repeat(np.cumsum(sizes) - sizes, sizes)[starts]
+    labels = [
+        f'{g} · {s - g0 + 1}' if e - s == 1 else f'{g} · {s - g0 + 1}–{e - g0}'
+        for g, s, e, g0 in zip(band_groups, starts, ends, group_start)
+    ]
+    bands = pd.DataFrame({
+        'group': pd.Categorical(band_groups, categories=groups.cat.categories),
+        'students': ends - starts,
+    }, index=labels)
+    matrix = pd.DataFrame(
+        _ratio(band_num, band_den),
+        index=labels,
+        columns=[_week_label(tensor.weeks, lo, hi) for lo, hi in zip(edges[:-1], edges[1:])],
+    )
+    return matrix, bands
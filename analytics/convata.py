@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Convata (March-May) cohort metrics: cleaned convata_data.csv rows with exam,
+attendance, participation and overall tiers, First Attempt score outcomes,
+first exam dates from mcat_source_data.csv and the student detail split.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics.dates import as_dates, date_labels, exam_year, in_months, month_key
+from analytics.exams import BORDERLINE_SCORE, PASSING_SCORE, practice_exam_counts
+
+RATE_COLUMNS = ['Class Attendance', 'Class Participation', 'In-Class Accuracy']
+SCORE_OUTCOME_ORDER = ['Passing', 'Borderline', 'Below 495', 'No score reported']
+# Student detail sort: most urgent outcome first within a tier
+OUTCOME_SORT = {'No score reported': 0, 'Below 495': 1, 'Borderline': 2, 'Passing': 3}
+TIER_LABELS = np.array(['Tier 1', 'Tier 2', 'Tier 3'], dtype=object)
+# (Tier 1 from, Tier 2 from); attendance needs strictly more than 70% for Tier 1
+ATTENDANCE_CUTS = (0.70, 0.50)
+PARTICIPATION_CUTS = (0.60, 0.40)
+EXAM_COUNT_CUTS = (5, 3)
+
+_cache = {}   # 'first_exam_dates' -> (mcat_source frame it was built from, dates)
+_lock = threading.Lock()
+
+
+def clean_convata(convata_df):
+    """Rows with an integer Student ID; percentage columns as 0-1 rates, First Attempt numeric."""
+    convata_df = convata_df.dropna(subset=['Student ID']).copy()
+    convata_df['Student ID'] = pd.to_numeric(convata_df['Student ID'], errors='coerce')
+    convata_df = convata_df[convata_df['Student ID'].notna()].copy()
+    convata_df['Student ID'] = convata_df['Student ID'].astype(int)
+
+    for col in RATE_COLUMNS:
+        if col in convata_df.columns:
+            convata_df[col] = convata_df[col].astype(str).str.replace('%', '').str.strip()
+            convata_df[col] = pd.to_numeric(convata_df[col], errors='coerce').fillna(0) / 100
+
+    convata_df['First Attempt'] = pd.to_numeric(convata_df.get('First Attempt', pd.Series(dtype=float)), errors='coerce')
+    return convata_df
+
+
+def _tier_nums(values, tier1, tier2, strict_tier1=False):
+    """Tier number (1-3) per value: Tier 1 at/above tier1 (above when strict_tier1), Tier 2 at/above tier2."""
+    values = np.asarray(values, dtype=float)
+    top = values > tier1 if strict_tier1 else values >= tier1
+    return np.select([top, values >= tier2], [1, 2], 3)
+
+
+def _tier_labels(nums):
+    """Tier labels as a categorical (three codes instead of one string object per row)."""
+    return pd.Categorical.from_codes(nums - 1, categories=TIER_LABELS)
+
+
+def score_outcomes(scores):
+    """Score Outcome per First Attempt score (NaN -> 'No score reported')."""
+    scores = np.asarray(scores, dtype=float)
+    return np.select(
+        [np.isnan(scores), scores >= PASSING_SCORE, scores >= BORDERLINE_SCORE],
+        ['No score reported', 'Passing', 'Borderline'],
+        'Below 495'
+    )
+
+
+def convata_tiers(convata_df, test_df=None):
+    """
+    Cleaned convata rows plus exam_count (valid practice exams in test_df),
+    Attendance / Participation / Exam Tier, the worst-of Overall Tier (and its
+    Overall Tier Num) and the First Attempt Score Outcome.
+    """
+    convata_df = clean_convata(convata_df)
+    if test_df is not None and not test_df.empty:
+        exam_counts = practice_exam_counts(test_df).rename(columns={'student_id': 'Student ID'})
+        convata_df = convata_df.merge(exam_counts, on='Student ID', how='left')
+        convata_df['exam_count'] = convata_df['exam_count'].fillna(0).astype(int)
+    else:
+        convata_df['exam_count'] = 0
+
+    # One columnar pass: tier numbers per rule, the worst of them, then labels
+    attendance = _tier_nums(convata_df['Class Attendance'], *ATTENDANCE_CUTS, strict_tier1=True)
+    participation = _tier_nums(convata_df['Class Participation'], *PARTICIPATION_CUTS)
+    exams = _tier_nums(convata_df['exam_count'], *EXAM_COUNT_CUTS)
+    overall = np.maximum(np.maximum(attendance, participation), exams)
+
+    convata_df['Attendance Tier'] = _tier_labels(attendance)
+    convata_df['Participation Tier'] = _tier_labels(participation)
+    convata_df['Exam Tier'] = _tier_labels(exams)
+    convata_df['Overall Tier Num'] = overall.astype('int64')
+    convata_df['Overall Tier'] = _tier_labels(overall)
+    convata_df['Score Outcome'] = pd.Categorical(score_outcomes(convata_df['First Attempt']), categories=SCORE_OUTCOME_ORDER)
+    return convata_df
+
+
+def score_outcome_counts(convata_df):
+    """Outcome, Count, Pct (share of the cohort as 'x.y%') for every outcome in SCORE_OUTCOME_ORDER."""
+    n_students = len(convata_df)
+    counts = convata_df['Score Outcome'].value_counts()
+    rows = []
+    for outcome in SCORE_OUTCOME_ORDER:
+        cnt = int(counts.get(outcome, 0))
+        pct = cnt / n_students * 100 if n_students > 0 else 0
+        rows.append({'Outcome': outcome, 'Count': cnt, 'Pct': f"{pct:.1f}%"})
+    return pd.DataFrame(rows)
+
+
+def highest_practice_labels(highest_practice):
+    """{student_id: highest practice score as a display string} from highest_practice_scores()."""
+    return highest_practice.apply(lambda x: str(int(x))).to_dict()
+
+
+def first_exam_dates(mcat_src):
+    """
+    date, label ('M/D/YY', '—' when blank) and month (monthly Period key) of
+    every student's first exam, indexed by student_id, from
+    mcat_source_data.csv. Built once per loaded mcat_source frame.
+    """
+    with _lock:
+        hit = _cache.get('first_exam_dates')
+        if hit is not None and hit[0] is mcat_src:
+            return hit[1]
+    dates = _first_exam_dates(mcat_src)
+    with _lock:
+        _cache['first_exam_dates'] = (mcat_src, dates)
+    return dates
+
+
+def _first_exam_dates(mcat_src):
+    if mcat_src is None or mcat_src.empty:
+        dates = pd.Series(pd.NaT, index=pd.Index([], dtype='int64', name='student_id'), dtype='datetime64[ns]')
+    else:
+        rows = mcat_src[mcat_src['student_id'].notna()]
+        dates = as_dates(rows['first_exam_date'])
+        dates.index = pd.Index(rows['student_id'].astype('int64'), name='student_id')
+        dates = dates[~dates.index.duplicated(keep='last')]
+    return pd.DataFrame({'date': dates, 'label': date_labels(dates), 'month': month_key(dates)})
+
+
+def took_no_score(mcat_src, highest_practice):
+    """
+    Students in the took_no_score category (exam date passed, no score): Student
+    ID (NA when unknown), 1st Exam Date, Highest Practice Score (from
+    highest_practice_scores()), College, as raw values sorted by exam date
+    (unknown dates last).
+    """
+    columns = ['Student ID', '1st Exam Date', 'Highest Practice Score', 'College']
+    if mcat_src is None or mcat_src.empty:
+        return pd.DataFrame(columns=columns)
+    rows = mcat_src[mcat_src['category'].astype(str).str.strip() == 'took_no_score']
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+    dates = as_dates(rows['first_exam_date'])
+    sids = rows['student_id']
+    sid_ints = sids.where(sids.notna() & (sids != 0)).astype('Int64')
+    table = pd.DataFrame({
+        'Student ID':              sid_ints,
+        '1st Exam Date':           dates,
+        'Highest Practice Score':  sid_ints.map(highest_practice).astype(float),
+        'College':                 rows['college'],
+    }).reset_index(drop=True)
+    return table.iloc[np.argsort(dates.to_numpy(), kind='stable')]
+
+
+def is_march_or_april(months, year):
+    """Whether each monthly first exam key falls in March or April of the exam year."""
+    return in_months(months, year, 3, 4)
+
+
+def student_detail(convata_df, exam_dates):
+    """
+    Tiered convata rows sorted Tier 3 first, then by outcome urgency and
+    attendance, split into (intervention before March, March/April
+    intervention, passing). exam_dates is first_exam_dates(); March/April
+    is taken in the year most first exams fall in.
+    """
+    convata_df = convata_df.copy()
+    convata_df['_outcome_sort'] = convata_df['Score Outcome'].map(OUTCOME_SORT).astype(int)
+    detail_sorted = convata_df.sort_values(
+        ['Overall Tier Num', '_outcome_sort', 'Class Attendance'],
+        ascending=[False, True, True]
+    )
+    intervention = detail_sorted[detail_sorted['Score Outcome'] != 'Passing']
+    passing = detail_sorted[detail_sorted['Score Outcome'] == 'Passing']
+    year = exam_year(exam_dates['date'])
+    mar_apr = is_march_or_april(intervention['Student ID'].map(exam_dates['month']), year)
+    return intervention[~mar_apr], intervention[mar_apr], passing
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Exam-date helpers over the parsed date columns (data_loader reads mcat_source
+first_exam_date and convata Next Attempt Date as datetimes, NaT when blank).
+
+Month filters compare a monthly Period key against a range inside one exam
+season year (the year most exam dates fall in), so "March-April" means the
+same thing whichever calendar year the cohort sits for the exam.
+"""
+
+import pandas as pd
+
+
+def as_dates(values, fmt='%m/%d/%y'):
+    """values as datetimes; strings (e.g. from an older snapshot) are parsed with fmt, anything else is NaT."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, format=fmt, errors='coerce')
+
+
+def date_labels(dates, missing='—'):
+    """Dates as 'M/D/YY' strings, the way the source CSVs write them; NaT as missing. Each distinct date is formatted once."""
+    dates = as_dates(dates)
+    present = dates.dropna()
+    labels = present.map({d: f'{d.month}/{d.day}/{d:%y}' for d in present.unique()})
+    return labels.astype(object).reindex(dates.index, fill_value=missing)
+
+
+def month_key(dates):
+    """Monthly Period per date (NaT when unknown)."""
+    return as_dates(dates).dt.to_period('M')
+
+
+def exam_year(dates):
+    """Calendar year most of the dates fall in, or None when there are none."""
+    years = as_dates(dates).dropna().dt.year
+    return int(years.mode().iloc[0]) if len(years) else None
+
+
+def season_months(year, months):
+    """{Period: name} for {month number: name} in the given exam year ({} when the year is unknown)."""
+    if year is None:
+        return {}
+    return {pd.Period(year=year, month=m, freq='M'): name for m, name in months.items()}
+
+
+def in_months(months, year, first_month, last_month):
+    """Whether each monthly Period key lies between first_month and last_month of year."""
+    if year is None:
+        return pd.Series(False, index=months.index)
+    start = pd.Period(year=year, month=first_month, freq='M')
+    end = pd.Period(year=year, month=last_month, freq='M')
+    return ((months >= start) & (months <= end)).fillna(False).astype(bool)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Dense student × week × metric view of the engagement data.
+
+The engagement export is a long table keyed by (student_id, week). WeekTensor
+lays it out once as a dense array with prefix sums along the week axis, so
+the total (or non-null count, mean, attendance rate) of any metric over any
+contiguous week range is a difference of two slices: constant time per
+student, one vectorized subtraction for the whole cohort, no groupby or
+boolean scan over the rows. engagement_tensor() caches the tensor per loaded
+engagement frame.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Metrics summed / averaged over week ranges, in tensor order
+ENGAGEMENT_METRICS = [
+    'num_attended_large_session', 'num_scheduled_large_session',
+    'num_attended_small_session', 'num_scheduled_small_session',
+    'cars_accuracy', 'sciences_accuracy', 'class_accuracy',
+    'completed_lessons', 'total_completed_passages_discrete_sets',
+]
+
+THROUGH_WEEK = 29   # weekly question set, accuracy and lesson views stop after this week
+
+_cache = {}   # 'tensor' -> (engagement frame it was built from, WeekTensor)
+_lock = threading.Lock()
+
+
+class WeekTensor:
+    """
+    Prefix sums of metrics over (student, week) cells. students and weeks are
+    the sorted distinct keys; week ranges are inclusive and given as week keys
+    (first / last None for open ends). A student or week with no row sums to
+    0 and counts 0, so means and rates come out NaN there.
+    """
+
+    def __init__(self, students, weeks, metrics, sums, counts, rows):
+        self.students = students
+        self.weeks = weeks
+        self.metrics = list(metrics)
+        self._column = {m: i for i, m in enumerate(self.metrics)}
+        # (students, weeks + 1, metrics): position w holds the total of weeks [0, w)
+        self._sums = sums
+        self._counts = counts
+        # (students, weeks + 1): cumulative number of weeks with a row
+        self._rows = rows
+
+    @classmethod
+    def from_frame(cls, df, key, week, metrics, dtype='float64'):
+        """
+        Build from a long frame with one or more rows per (key, week); rows
+        sharing a cell are added together. Rows with a missing key or week
+        are ignored, missing metric values count as absent (not 0).
+        """
+        keys = df[key].to_numpy()
+        week_keys = df[week].to_numpy()
+        ok = ~(pd.isna(keys) | pd.isna(week_keys))
+        s_pos, students = pd.factorize(keys[ok], sort=True)
+        w_pos, weeks = pd.factorize(week_keys[ok], sort=True)
+        n_students, n_weeks = len(students), len(weeks) + 1
+
+        cell = s_pos * n_weeks + w_pos + 1
+        size = n_students * n_weeks
+        sums = np.empty((n_students, n_weeks, len(metrics)), dtype=dtype)
+        counts = np.empty((n_students, n_weeks, len(metrics)), dtype='int16')
+        for i, metric in enumerate(metrics):
+            values = df[metric].to_numpy(dtype='float64', na_value=np.nan)[ok]
+            present = ~np.isnan(values)
+            sums[:, :, i] = np.bincount(cell[present], weights=values[present], minlength=size).reshape(n_students, n_weeks)
+            counts[:, :, i] = np.bincount(cell[present], minlength=size).reshape(n_students, n_weeks)
+        rows = np.bincount(cell, minlength=size).reshape(n_students, n_weeks)
+        np.cumsum(sums, axis=1, out=sums)
+        np.cumsum(counts, axis=1, out=counts)
+        rows = np.cumsum(rows, axis=1).astype('int16')
+        return cls(students, weeks, metrics, sums, counts, rows)
+
+    @property
+    def nbytes(self):
+        return self._sums.nbytes + self._counts.nbytes + self._rows.nbytes
+
+    def week_bounds(self, first=None, last=None):
+        """(lo, hi) prefix positions of the weeks first..last (inclusive)."""
+        lo = 0 if first is None else int(np.searchsorted(self.weeks, first, side='left'))
+        hi = len(self.weeks) if last is None else int(np.searchsorted(self.weeks, last, side='right'))
+        return lo, max(lo, hi)
+
+    def _take(self, prefix, students):
+        """prefix restricted to students (all when None); unknown ids get an all-zero row."""
+        if students is None:
+            return prefix
+        students = np.asarray(students)
+        if not len(self.students):
+            return np.zeros((len(students),) + prefix.shape[1:], dtype=prefix.dtype)
+        pos = np.searchsorted(self.students, students).clip(0, len(self.students) - 1)
+        found = self.students[pos] == students
+        taken = prefix[pos]
+        taken[~found] = 0
+        return taken
+
+    def _range(self, prefix, metrics, first, last, students):
+        lo, hi = self.week_bounds(first, last)
+        prefix = self._take(prefix, students)
+        if metrics is None:
+            return prefix[:, hi] - prefix[:, lo]
+        if isinstance(metrics, str):
+            i = self._column[metrics]
+            return prefix[:, hi, i] - prefix[:, lo, i]
+        cols = [self._column[m] for m in metrics]
+        return prefix[:, hi][:, cols] - prefix[:, lo][:, cols]
+
+    def sum(self, metrics, first=None, last=None, students=None):
+        """Total of metrics (one name -> 1-D, a list -> students × metrics) over weeks first..last."""
+        return self._range(self._sums, metrics, first, last, students)
+
+    def count(self, metrics, first=None, last=None, students=None):
+        """Number of weeks with a non-null value of metrics in first..last."""
+        return self._range(self._counts, metrics, first, last, students)
+
+    def mean(self, metrics, first=None, last=None, students=None):
+        """Average of the non-null weekly values of metrics in first..last; NaN where there are none."""
+        total = self.sum(metrics, first, last, students).astype('float64')
+        n = self.count(metrics, first, last, students)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(n > 0, total / n, np.nan)
+
+    def row_count(self, first=None, last=None, students=None):
+        """Number of weeks in first..last that have a row, per student."""
+        return self._range(self._rows, None, first, last, students)
+
+    def attendance_rate(self, size, first=None, last=None, students=None):
+        """Attended / scheduled {size} ('large' / 'small') sessions over first..last; NaN where none were scheduled."""
+        attended, scheduled = self.sum(
+            [f'num_attended_{size}_session', f'num_scheduled_{size}_session'], first, last, students
+        ).astype('float64').T
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(scheduled > 0, attended / scheduled, np.nan)
+
+    def bin_sums(self, metric, edges, students=None):
+        """students × bins totals of one metric, bin b covering prefix positions edges[b]..edges[b + 1]."""
+        return np.diff(self._take(self._sums[:, edges, self._column[metric]], students), axis=1)
+
+    def bin_counts(self, metric, edges, students=None):
+        """students × bins number of weeks with a non-null value of one metric (bins as in bin_sums)."""
+        return np.diff(self._take(self._counts[:, edges, self._column[metric]], students), axis=1)
+
+    def weekly(self, metric, students=None):
+        """students × weeks values of one metric per week (NaN where the week has no value)."""
+        i = self._column[metric]
+        sums = np.diff(self._take(self._sums[:, :, i], students), axis=1).astype('float64')
+        present = np.diff(self._take(self._counts[:, :, i], students), axis=1) > 0
+        return np.where(present, sums, np.nan)
+
+
+def engagement_tensor(engagement_df):
+    """
+    WeekTensor of ENGAGEMENT_METRICS by student_id and week (float32 sums),
+    built once per loaded engagement frame.
+    """
+    with _lock:
+        hit = _cache.get('tensor')
+        if hit is not None and hit[0] is engagement_df:
+            return hit[1]
+    metrics = [m for m in ENGAGEMENT_METRICS if m in engagement_df.columns]
+    tensor = WeekTensor.from_frame(engagement_df, 'student_id', 'week', metrics, dtype='float32')
+    with _lock:
+        _cache['tensor'] = (engagement_df, tensor)
+    return tensor
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
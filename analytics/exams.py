@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Exam-score metrics over institution-1-test-data.csv (and tier.csv): first
+attempt outcomes, exam tiers, borderline students, score improvement and the
+anticipated/second attempt date distribution.
+
+Every metric reads the same classified test table and per-student summary
+(test_table / student_test_summary), built once per loaded test frame.
+"""
+
+import threading
+
+import pandas as pd
+
+SCORE_MIN = 472
+SCORE_MAX = 528
+PASSING_SCORE = 502
+BORDERLINE_SCORE = 495
+
+# test_name -> row_kind; every other test_name is a practice exam
+ROW_KIND_BY_TEST_NAME = {
+    'First Attempt': 'first attempt',
+    'Second Exam Attempt': 'second attempt',
+    'Anticipated Exam Date': 'anticipated date',
+    'Anticipated Test Date': 'anticipated date',
+}
+ROW_KINDS = ['practice', 'first attempt', 'second attempt', 'anticipated date']
+OUTCOME_ORDER = ['Passed', 'Borderline', 'Below 495']
+DISTRIBUTION_MONTHS = ['January', 'February', 'March', 'April', 'May']
+
+# tier.csv windows merged onto the first attempt table: window -> column suffix
+ATTENDANCE_WINDOWS = {'Jan 2026-Current': '', 'Jun-Dec 2025': '_JunDec'}
+
+_cache = {}   # kind -> (test frame it was built from, value)
+_lock = threading.Lock()
+
+
+def test_table(test_df):
+    """
+    The test rows classified once (cached per loaded frame): row_kind
+    (categorical: practice / first attempt / second attempt / anticipated date)
+    and score, actual_exam_score when it is a valid MCAT score (472-528) else NaN.
+    """
+    return _cached('table', test_df, _classify)
+
+
+def student_test_summary(test_df):
+    """
+    Per-student aggregates over test_table(), indexed by student_id (cached per
+    loaded frame): practice_count (valid practice scores), score_min /
+    score_max (any valid score), first_attempt_date / first_attempt_score (the
+    first First Attempt row with a positive score; NaN when that score is not
+    valid) and highest_practice.
+    """
+    return _cached('summary', test_df, _summarize)
+
+
+def _cached(kind, test_df, build):
+    with _lock:
+        hit = _cache.get(kind)
+        if hit is not None and hit[0] is test_df:
+            return hit[1]
+    value = build(test_df)
+    with _lock:
+        _cache[kind] = (test_df, value)
+    return value
+
+
+def _classify(test_df):
+    table = test_df.copy()
+    kind = table['test_name'].map(ROW_KIND_BY_TEST_NAME).fillna('practice')
+    table['row_kind'] = pd.Categorical(kind, categories=ROW_KINDS)
+    raw = pd.to_numeric(table['actual_exam_score'], errors='coerce')
+    table['score'] = raw.where(raw.between(SCORE_MIN, SCORE_MAX))
+    return table
+
+
+def _summarize(test_df):
+    table = test_table(test_df)
+    raw = pd.to_numeric(table['actual_exam_score'], errors='coerce')
+    valid = table[table['score'].notna()]
+    practice = valid[valid['row_kind'] == 'practice']
+    first = table[(table['row_kind'] == 'first attempt') & (raw > 0)].groupby('student_id')[['test_date', 'score']].first()
+    summary = pd.DataFrame(index=pd.Index(table['student_id'].dropna().unique(), name='student_id')).sort_index()
+    summary['practice_count'] = practice.groupby('student_id').size()
+    summary['practice_count'] = summary['practice_count'].fillna(0).astype(int)
+    summary['score_min'] = valid.groupby('student_id')['score'].min()
+    summary['score_max'] = valid.groupby('student_id')['score'].max()
+    summary['first_attempt_date'] = first['test_date']
+    summary['first_attempt_score'] = first['score']
+    summary['highest_practice'] = practice.groupby('student_id')['score'].max()
+    return summary
+
+
+def practice_exam_counts(test_df):
+    """student_id, exam_count: number of valid practice exam scores per student."""
+    counts = student_test_summary(test_df)['practice_count']
+    return counts[counts > 0].rename('exam_count').reset_index()
+
+
+def highest_practice_scores(test_df):
+    """Highest valid practice exam score per student, as a float Series indexed by student_id."""
+    if test_df is None or test_df.empty:
+        return pd.Series(dtype=float)
+    return student_test_summary(test_df)['highest_practice'].dropna()
+
+
+def outcome_label(score):
+    if score >= PASSING_SCORE:
+        return 'Passed'
+    elif score >= BORDERLINE_SCORE:
+        return 'Borderline'
+    else:
+        return 'Below 495'
+
+
+def exam_tier_label(n):
+    if n > 5:
+        return 'Tier 1'
+    elif n >= 3:
+        return 'Tier 2'
+    else:
+        return 'Tier 3'
+
+
+def first_attempt_outcomes(test_df, tier_df=None):
+    """
+    One row per student with a valid First Attempt score: first_attempt_date,
+    first_attempt_score(_clean), first_attempt_outcome, exam_count, exam_tier,
+    large/small group attendance tiers for the current and Jun-Dec windows
+    ('No data' when the student has no tier row, '—' without tier.csv) and
+    the attendance_tier_1_or_2 / exam_tier_1_or_2 flags.
+    """
+    summary = student_test_summary(test_df)
+    first_attempt = summary.loc[summary['first_attempt_score'].notna(), ['first_attempt_date', 'first_attempt_score']]
+    first_attempt = first_attempt.reset_index()
+    first_attempt['first_attempt_score_clean'] = first_attempt['first_attempt_score']
+    first_attempt['first_attempt_outcome'] = first_attempt['first_attempt_score_clean'].apply(outcome_label)
+
+    # Exam tier from practice exam count
+    first_attempt['exam_count'] = first_attempt['student_id'].map(summary['practice_count']).fillna(0).astype(int)
+    first_attempt['exam_tier'] = first_attempt['exam_count'].apply(exam_tier_label)
+
+    # Attendance tiers from tier.csv
+    tier_cols = ['large_group_tier', 'small_group_tier']
+    if tier_df is not None and not tier_df.empty:
+        for window, suffix in ATTENDANCE_WINDOWS.items():
+            window_tiers = tier_df.loc[tier_df['date_window'] == window, ['student_id'] + tier_cols]
+            window_tiers = window_tiers.rename(columns={c: c + suffix for c in tier_cols})
+            first_attempt = first_attempt.merge(window_tiers, on='student_id', how='left')
+        for suffix in ATTENDANCE_WINDOWS.values():
+            for col in tier_cols:
+                first_attempt[col + suffix] = first_attempt[col + suffix].astype(object).fillna('No data')
+    else:
+        for suffix in ATTENDANCE_WINDOWS.values():
+            for col in tier_cols:
+                first_attempt[col + suffix] = '—'
+
+    first_attempt['attendance_tier_1_or_2'] = (
+        first_attempt['large_group_tier'].isin(['Tier 1', 'Tier 2']) &
+        first_attempt['small_group_tier'].isin(['Tier 1', 'Tier 2'])
+    )
+    first_attempt['exam_tier_1_or_2'] = first_attempt['exam_tier'].isin(['Tier 1', 'Tier 2'])
+    return first_attempt
+
+
+def first_attempt_outcome_counts(first_attempt):
+    """Outcome, Count for the outcomes present, in OUTCOME_ORDER."""
+    counts = first_attempt['first_attempt_outcome'].value_counts()
+    present = [o for o in OUTCOME_ORDER if o in counts.index]
+    return pd.DataFrame({'Outcome': present, 'Count': [int(counts.get(o, 0)) for o in present]})
+
+
+def borderline_scores(first_attempt, test_df):
+    """
+    student_id, Lowest, First Attempt, Highest for borderline (495-501) first
+    attempts, over every valid score the student reported.
+    """
+    borderline = first_attempt[
+        (first_attempt['first_attempt_score_clean'] >= BORDERLINE_SCORE) &
+        (first_attempt['first_attempt_score_clean'] < PASSING_SCORE)
+    ]
+    columns = ['student_id', 'Lowest', 'First Attempt', 'Highest']
+    if borderline.empty:
+        return pd.DataFrame(columns=columns)
+    scores = student_test_summary(test_df)
+    out = borderline[['student_id']].join(scores[['score_min', 'score_max']], on='student_id')
+    out['First Attempt'] = borderline['first_attempt_score'].astype(float).values
+    out = out.rename(columns={'score_min': 'Lowest', 'score_max': 'Highest'})
+    return out[columns].reset_index(drop=True)
+
+
+def score_improvement(test_df, max_points=30):
+    """
+    Points improved (highest - lowest valid score, 1..max_points) -> number of
+    students, sorted by points.
+    """
+    summary = student_test_summary(test_df)
+    improvement = (summary['score_max'] - summary['score_min']).dropna()
+    improvement = improvement[improvement > 0]
+    improvement = improvement[improvement.between(1, max_points)].reset_index(drop=True)
+    df_freq = improvement.value_counts().sort_index().reset_index()
+    df_freq.columns = ['Points improved', 'Number of students']
+    return df_freq
+
+
+def test_date_distribution(test_df):
+    """
+    Anticipated / second attempt dates in DISTRIBUTION_MONTHS as
+    (anticipated, second_attempt): anticipated has Month, Segment, Count
+    stacked by whether the student reported a First Attempt; second_attempt
+    has month_name, Count. Both are None when there is nothing to show.
+    """
+    table = test_table(test_df)
+    attempt_df = table[table['row_kind'].isin(['anticipated date', 'second attempt'])].copy()
+    attempt_df['test_date'] = pd.to_datetime(attempt_df['test_date'], errors='coerce')
+    attempt_df = attempt_df.dropna(subset=['test_date'])
+    attempt_df['month_name'] = attempt_df['test_date'].dt.month_name()
+    attempt_df = attempt_df[attempt_df['month_name'].isin(DISTRIBUTION_MONTHS)]
+    if attempt_df.empty:
+        return None, None
+
+    with_first_attempt = set(
+        table.loc[table['row_kind'] == 'first attempt', 'student_id'].dropna().astype(int)
+    )
+    ant_df = attempt_df[attempt_df['row_kind'] == 'anticipated date']
+    sa_df = attempt_df[attempt_df['row_kind'] == 'second attempt']
+
+    anticipated = None
+    if not ant_df.empty:
+        stack_rows = []
+        for month in DISTRIBUTION_MONTHS:
+            ids_in_month = ant_df.loc[ant_df['month_name'] == month, 'student_id'].dropna().astype(int).unique()
+            reported = sum(1 for i in ids_in_month if i in with_first_attempt)
+            stack_rows.append({'Month': month, 'Segment': 'Reported exam score', 'Count': reported})
+            stack_rows.append({'Month': month, 'Segment': 'Not reported', 'Count': len(ids_in_month) - reported})
+        anticipated = pd.DataFrame(stack_rows)
+
+    second_attempt = None
+    if not sa_df.empty:
+        second_attempt = sa_df.groupby('month_name').size().reset_index(name='Count')
+    return anticipated, second_attempt
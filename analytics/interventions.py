@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Intervention groups and outreach responses from Interventions_initial.csv.
+
+The export is sectioned: a title row naming the group, then that group's own
+header row, then one row per student. load_interventions() reads it with the
+csv module (so quoted cells such as "489, 484 (Both JW Exams)" stay one field)
+into a long table with one row per (student, group), cached until the file
+changes on disk; the metrics below are computed from that table.
+"""
+
+import csv
+import os
+import re
+import threading
+
+import pandas as pd
+
+from analytics.exams import SCORE_MAX, SCORE_MIN
+
+# Section header substring in the CSV -> intervention group
+INTERVENTION_SECTIONS = {
+    'Students with No Reported Practice Exam Scores': 'No reported practice scores',
+    'Students with No Anticipated Exam Date': 'No anticipated exam date',
+    'Tier 3 Students': 'Low attendance in classes',
+}
+INTERVENTION_COLUMNS = ['student_id', 'group', 'responded', 'passing', 'most_recent_score']
+_SCORE_RE = re.compile(r'\d{3}')
+
+_tables = {}   # abspath -> ((mtime_ns, size), table)
+_lock = threading.Lock()
+
+
+def _score(cell):
+    """First in-range exam score in a free-text cell ('493 (JW), 499 (AAMC)' -> 493), else None."""
+    for match in _SCORE_RE.findall(cell or ''):
+        if SCORE_MIN <= int(match) <= SCORE_MAX:
+            return int(match)
+    return None
+
+
+def _passing(cell):
+    answer = (cell or '').strip().lower()
+    return True if answer == 'yes' else False if answer == 'no' else None
+
+
+def _read_rows(path):
+    """One dict per student row, with the columns located from each section's header row."""
+    rows = []
+    group, columns = None, None
+    with open(path, newline='', encoding='utf-8') as f:
+        for cells in csv.reader(f):
+            cells = [c.strip() for c in cells]
+            if not cells or not cells[0]:
+                continue
+            title = next((g for h, g in INTERVENTION_SECTIONS.items() if h in cells[0]), None)
+            if title is not None:
+                group, columns = title, None
+                continue
+            if group is None:
+                continue
+            if columns is None and cells[0].lower() == 'student id':
+                columns = [c.lower() for c in cells]
+                continue
+            try:
+                sid = int(cells[0])
+            except ValueError:
+                continue
+            if sid <= 0:
+                continue
+            named = dict(zip(columns or [], cells))
+            score_col = next((c for c in named if c.startswith('most recent')), None)
+            rows.append({
+                'student_id': sid,
+                'group': group,
+                # Low-attendance rows have two response columns (email, survey); either counts
+                'responded': any(v.upper() == 'TRUE' for c, v in named.items() if c.startswith('responded')),
+                'passing': _passing(named.get('passing')),
+                'most_recent_score': _score(named.get(score_col)),
+            })
+    return rows
+
+
+def _build_table(path):
+    table = pd.DataFrame(_read_rows(path), columns=INTERVENTION_COLUMNS)
+    table = table.astype({
+        'student_id': 'int64',
+        'group': pd.CategoricalDtype(list(INTERVENTION_SECTIONS.values())),
+        'responded': bool,
+        'passing': 'boolean',
+        'most_recent_score': 'Int16',
+    })
+    # A student listed twice in a section is one membership; either row responding counts
+    return table.groupby(['student_id', 'group'], observed=True, sort=False, as_index=False).agg(
+        responded=('responded', 'any'),
+        passing=('passing', 'first'),
+        most_recent_score=('most_recent_score', 'first'),
+    )
+
+
+def load_interventions(path):
+    """
+    student_id, group, responded, passing (nullable), most_recent_score
+    (nullable) for every student in every intervention section, in file
+    order. Parsed once per file version.
+    """
+    path = os.path.abspath(path)
+    st_ = os.stat(path)
+    stamp = (st_.st_mtime_ns, st_.st_size)
+    with _lock:
+        hit = _tables.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+    table = _build_table(path)
+    with _lock:
+        _tables[path] = (stamp, table)
+    return table
+
+
+def clear_cache():
+    with _lock:
+        _tables.clear()
+
+
+def intervention_groups(table):
+    """{group: set of student_ids} for every group in INTERVENTION_SECTIONS order (empty sets included)."""
+    members = {group: set() for group in INTERVENTION_SECTIONS.values()}
+    for group, ids in table.groupby('group', observed=True)['student_id']:
+        members[group] = set(ids)
+    return members
+
+
+def responded_ids(table):
+    """Student IDs that responded to outreach in any group."""
+    return set(table.loc[table['responded'], 'student_id'])
+
+
+def intervention_summary(table):
+    """Total intervened students, how many responded, and the response rate (None when no one)."""
+    n_total = table['student_id'].nunique()
+    n_responded = table.loc[table['responded'], 'student_id'].nunique()
+    return {
+        'total': n_total,
+        'responded': n_responded,
+        'response_rate': n_responded / n_total if n_total > 0 else None,
+    }
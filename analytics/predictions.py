@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+March-May predictions: untested students' practice scores, the first-time vs
+second-time taker split and the score outlook by exam month.
+
+Students without a First Attempt score are placed by their mcat_source first
+exam date and predicted from their highest practice score; students with one
+are placed by their convata Next Attempt Date and their First Attempt score.
+
+prediction_table() joins the three sources once (per loaded convata, test and
+mcat_source frame) into one row per student with the exam month and predictor
+score already resolved; the metrics below are filters and crosstabs over it.
+Exam months are monthly Period keys, matched against the months of the exam
+season year (the year most exam dates fall in) rather than date prefixes.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from analytics.convata import clean_convata, first_exam_dates
+from analytics.dates import as_dates, exam_year, month_key, season_months
+from analytics.exams import BORDERLINE_SCORE, PASSING_SCORE, highest_practice_scores
+
+TAKER_MONTHS = {4: 'April', 5: 'May'}
+OUTLOOK_MONTHS = {3: 'March', 4: 'April', 5: 'May'}
+TAKER_TYPES = ['First-time exam taker', 'Second-time exam taker']
+OUTLOOK_GROUPS = ['> 502 (Passing)', '495–501 (Borderline)', '< 495 (Below)']
+
+_cache = {}   # 'table' -> ((convata, test, mcat_source frames it was built from), table)
+_lock = threading.Lock()
+
+
+def prediction_table(convata_df, test_df, mcat_src):
+    """
+    One row per student in convata or with a practice score: student_id,
+    in_convata, highest_practice, first_attempt, next_attempt_date and
+    first_exam_date (datetimes), taker (first- / second-time), exam_date,
+    exam_month (monthly Period, NaT when unknown) and predicted_score. Cached
+    on the identity of the three loaded frames.
+    """
+    sources = (convata_df, test_df, mcat_src)
+    with _lock:
+        hit = _cache.get('table')
+        if hit is not None and all(a is b for a, b in zip(hit[0], sources)):
+            return hit[1]
+    table = _build_table(convata_df, test_df, mcat_src)
+    with _lock:
+        _cache['table'] = (sources, table)
+    return table
+
+
+def _build_table(convata_df, test_df, mcat_src):
+    convata = clean_convata(convata_df)
+    convata = pd.DataFrame({
+        'student_id': convata['Student ID'],
+        'first_attempt': convata['First Attempt'].astype(float),
+        'next_attempt_date': as_dates(convata.get('Next Attempt Date', pd.Series(pd.NaT, index=convata.index))),
+        'in_convata': True,
+    }).drop_duplicates('student_id', keep='last')
+
+    practice = highest_practice_scores(test_df).astype(float)
+    practice = pd.DataFrame({'student_id': practice.index.astype('int64'), 'highest_practice': practice.to_numpy()})
+
+    table = convata.merge(practice, on='student_id', how='outer')
+    table['in_convata'] = table['in_convata'].fillna(False).astype(bool)
+
+    first_exam = first_exam_dates(mcat_src)['date'].rename('first_exam_date')
+    table = table.merge(first_exam, left_on='student_id', right_index=True, how='left')
+
+    tested = table['first_attempt'].notna()
+    table['taker'] = np.where(tested, TAKER_TYPES[1], TAKER_TYPES[0])
+    table['exam_date'] = table['next_attempt_date'].where(tested, table['first_exam_date'])
+    table['exam_month'] = month_key(table['exam_date'])
+    table['predicted_score'] = table['first_attempt'].where(tested, table['highest_practice'])
+    return table
+
+
+def untested_summary(table):
+    """Students with a practice score but no First Attempt yet, and how many practice above 502."""
+    untested = table.loc[table['highest_practice'].notna() & table['first_attempt'].isna(), 'highest_practice']
+    total = len(untested)
+    above = int((untested > PASSING_SCORE).sum())
+    return {'untested': total, 'above_502': above, 'pct_above_502': above / total if total > 0 else 0}
+
+
+def _month_counts(months, labels, month_names, label_name):
+    """Month, <label_name>, Count for every (month, label) pair that occurs, months in calendar order."""
+    month = pd.Categorical(months.map(month_names).astype(object), categories=list(month_names.values()), ordered=True)
+    counts = pd.crosstab(month, labels.to_numpy(), rownames=['Month'], colnames=[label_name]).stack()
+    counts = counts[counts > 0].rename('Count').reset_index()
+    counts['Month'] = pd.Categorical(counts['Month'], categories=list(month_names.values()), ordered=True)
+    return counts
+
+
+def taker_shares(table):
+    """
+    Month, Type, Count, Percentage (within month) of first- vs second-time
+    takers in April and May; None when nobody tests in those months.
+    """
+    months = season_months(exam_year(table['exam_date']), TAKER_MONTHS)
+    rows = table[table['in_convata'] & table['exam_month'].isin(list(months))]
+    if rows.empty:
+        return None
+    counts = _month_counts(rows['exam_month'], rows['taker'], months, 'Type')
+    month_totals = counts.groupby('Month', observed=True)['Count'].transform('sum')
+    counts['Percentage'] = (counts['Count'] / month_totals * 100).round(1)
+    return counts
+
+
+def practice_groups(scores):
+    """Score group label per predicted score."""
+    return pd.Series(
+        np.select([scores > PASSING_SCORE, scores >= BORDERLINE_SCORE], OUTLOOK_GROUPS[:2], OUTLOOK_GROUPS[2]),
+        index=scores.index,
+    )
+
+
+def score_outlook(table):
+    """
+    Month, Group, Count of predicted score groups for students with a practice
+    score, by exam month (March-May); None when nobody falls in those months.
+    """
+    months = season_months(exam_year(table['exam_date']), OUTLOOK_MONTHS)
+    rows = table[table['highest_practice'].notna() & table['exam_month'].isin(list(months))]
+    if rows.empty:
+        return None
+    return _month_counts(rows['exam_month'], practice_groups(rows['predicted_score']), months, 'Group')
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Time the computation behind each dashboard view, and build_tier_csv, on a data
+directory (by default a synthetic cohort from synth_cohort.py).
+
+Each stage is timed cold: data_loader's cache is cleared before every repeat,
+so CSV parsing and index builds are included the way a fresh file version
+hits the dashboard. The startup view times main.py's imports (and the chart
+libraries the views import on demand) in a fresh interpreter, i.e. the
+cold-start cost after a deploy. Results are appended as one JSON line per run to
+RESULTS_PATH and compared with the previous run at the same scale and label.
+
+Usage:
+    python benchmark.py --students 10000              # generates synthetic/10000 if missing
+    python benchmark.py --data-dir . --label real     # the checked-in institution-1 files
+    python benchmark.py --students 100000 --views march_may build_tier_csv --repeat 1
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+
+import analytics
+import build_tier_csv
+import data_loader
+import student_charts
+import synth_cohort
+from analytics.cohort import COHORT_SORTS, HEATMAP_METRICS
+from analytics.engagement import THROUGH_WEEK
+from student_index import engagement_index, student_rows, test_index, tier_index
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join('benchmarks', 'results.jsonl')
+# Libraries main.py imports only inside the views that use them
+VIEW_IMPORTS = {
+    'plotly.express (Current Status, Cohort, March-May)': 'import plotly.express',
+    'altair (Individual Student)': 'import student_charts',
+}
+INDIVIDUAL_SAMPLE = 50   # students looked up per repeat in the Individual Student view
+
+
+def _timed(timings, stage, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[stage] = time.perf_counter() - start
+    return result
+
+
+def bench_current_status(timings):
+    test_df = _timed(timings, 'load test', data_loader.load_dataset, 'test')
+    tier_df = _timed(timings, 'load tier', data_loader.load_dataset, 'tier')
+    first_attempt = _timed(timings, 'first attempt outcomes', analytics.first_attempt_outcomes, test_df, tier_df)
+    _timed(timings, 'outcome counts', analytics.first_attempt_outcome_counts, first_attempt)
+    _timed(timings, 'borderline scores', analytics.borderline_scores, first_attempt, test_df)
+    _timed(timings, 'score improvement', analytics.score_improvement, test_df)
+    _timed(timings, 'test date distribution', analytics.test_date_distribution, test_df)
+    path = data_loader.resolve_path('Interventions_initial.csv')
+    if path:
+        table = _timed(timings, 'interventions parse', analytics.load_interventions, path)
+        _timed(timings, 'interventions summary', analytics.intervention_summary, table)
+        _timed(timings, 'interventions groups', analytics.intervention_groups, table)
+
+
+def bench_individual_student(timings):
+    engagement, by_student = _timed(timings, 'engagement index', engagement_index)
+    tests, tests_by_student = _timed(timings, 'test index', test_index)
+    tier, tiers_by_student = _timed(timings, 'tier index', tier_index)
+
+    def lookups():
+        for sid in list(by_student)[:INDIVIDUAL_SAMPLE]:
+            rows = student_rows(by_student, engagement, sid)
+            rows[rows['week'] <= THROUGH_WEEK]
+            if tests is not None:
+                student_rows(tests_by_student, tests, sid)
+            if tier is not None:
+                student_tier = student_rows(tiers_by_student, tier, sid)
+                for window in tier['date_window'].unique():
+                    student_tier[student_tier['date_window'] == window]
+
+    _timed(timings, f'{INDIVIDUAL_SAMPLE} student lookups', lookups)
+
+    sample = list(by_student)[:INDIVIDUAL_SAMPLE]
+    _timed(timings, f'charts: {INDIVIDUAL_SAMPLE} students, cold', student_chart_payloads, sample)
+    payloads = _timed(timings, f'charts: {INDIVIDUAL_SAMPLE} students, cached', student_chart_payloads, sample)
+    _timed(timings, f'charts: {INDIVIDUAL_SAMPLE} students, serialize', lambda: [payload_bytes(*p) for p in payloads])
+
+
+def _student_chart_rows(students):
+    """(chart, student_id, rows) for every Individual Student chart main.py draws for each student."""
+    engagement, by_student = engagement_index()
+    tests, tests_by_student = test_index()
+    for sid in students:
+        for chart in student_charts.CHARTS:
+            if chart != 'exam_scores':
+                yield chart, sid, student_rows(by_student, engagement, sid)
+            elif tests is not None and sid in tests_by_student:
+                yield chart, sid, tests_by_student[sid]
+
+
+def student_chart_payloads(students):
+    """(spec, data) of every Individual Student chart for each student."""
+    return [student_charts.student_chart(*args) for args in _student_chart_rows(students)]
+
+
+def payload_bytes(spec, data):
+    """Bytes Streamlit sends for a chart: the spec as JSON plus the data as an Arrow IPC stream."""
+    table = pa.Table.from_pandas(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return len(json.dumps(spec)) + sink.getvalue().size
+
+
+def chart_payload_kb():
+    """
+    Average KB per student of the Individual Student charts: as sent (folded,
+    plotted columns only) and as the student's unprojected rows the charts
+    used to carry, over the first INDIVIDUAL_SAMPLE students.
+    """
+    _, by_student = engagement_index()
+    sample = list(by_student)[:INDIVIDUAL_SAMPLE]
+    if not sample:
+        return {}
+    charts = full = 0
+    for chart, sid, rows in _student_chart_rows(sample):
+        spec, data = student_charts.student_chart(chart, sid, rows)
+        charts += payload_bytes(spec, data)
+        last_week = student_charts.CHARTS[chart][3]
+        full += payload_bytes(spec, rows if last_week is None else rows[rows['week'] <= last_week])
+    return {'charts': round(charts / len(sample) / 1024, 1), 'full rows': round(full / len(sample) / 1024, 1)}
+
+
+def bench_cohort(timings):
+    engagement = _timed(timings, 'load engagement', data_loader.load_dataset, 'engagement')
+    tensor = _timed(timings, 'engagement tensor', analytics.engagement_tensor, engagement)
+
+    def rolling_rates():
+        for last in tensor.weeks:
+            for size in ('large', 'small'):
+                tensor.attendance_rate(size, last - 3, last)
+
+    _timed(timings, f'attendance rates, {len(tensor.weeks)} 4-week windows', rolling_rates)
+
+    test_df = _timed(timings, 'load test', data_loader.load_dataset, 'test')
+    tier_df = _timed(timings, 'load tier', data_loader.load_dataset, 'tier')
+    for sort_by in COHORT_SORTS:
+        groups = _timed(timings, f'groups: {sort_by}', analytics.cohort_groups, tensor, sort_by, test_df, tier_df)
+        for metric in HEATMAP_METRICS:
+            _timed(timings, f'heatmap: {metric.split()[0].lower()}, by {sort_by.split()[0].lower()}', analytics.cohort_heatmap, tensor, metric, groups)
+
+
+def bench_march_may(timings):
+    raw_convata = _timed(timings, 'load convata', data_loader.load_dataset, 'convata')
+    test_df = _timed(timings, 'load test', data_loader.load_dataset, 'test')
+    mcat_src = _timed(timings, 'load mcat_source', data_loader.load_dataset, 'mcat_source')
+    highest = _timed(timings, 'highest practice', analytics.highest_practice_scores, test_df)
+    convata = _timed(timings, 'convata tiers', analytics.convata_tiers, raw_convata, test_df)
+    _timed(timings, 'outcome counts', analytics.score_outcome_counts, convata)
+    dates = _timed(timings, 'first exam dates', analytics.first_exam_dates, mcat_src)
+    _timed(timings, 'took no score', analytics.took_no_score, mcat_src, highest)
+    _timed(timings, 'student detail', analytics.student_detail, convata, dates)
+    table = _timed(timings, 'prediction table', analytics.prediction_table, raw_convata, test_df, mcat_src)
+    _timed(timings, 'untested summary', analytics.untested_summary, table)
+    _timed(timings, 'taker shares', analytics.taker_shares, table)
+    _timed(timings, 'score outlook', analytics.score_outlook, table)
+
+
+def bench_build_tier_csv(timings):
+    # Write into a scratch directory so benchmarking never replaces the real tier.csv
+    saved = build_tier_csv.OUT_PATH, build_tier_csv.OUT_PATH_ALT
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        build_tier_csv.OUT_PATH = os.path.join(tmp, 'tier.csv')
+        build_tier_csv.OUT_PATH_ALT = os.path.join(tmp, 'unused', 'tier.csv')
+        try:
+            _timed(timings, 'main()', build_tier_csv.main)
+        finally:
+            build_tier_csv.OUT_PATH, build_tier_csv.OUT_PATH_ALT = saved
+
+
+def _main_imports():
+    """main.py's module-level import statements, as source."""
+    with open(os.path.join(REPO_DIR, 'main.py'), encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def _fresh_import_time(setup, stmt):
+    """Seconds to exec stmt in a new interpreter after setup (both import sources)."""
+    code = (
+        f'import time\n{setup}\n_t = time.perf_counter()\n{stmt}\n'
+        'print(time.perf_counter() - _t)'
+    )
+    out = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def bench_startup(timings):
+    # Cold interpreter each time: main.py's top-level imports, then each lazily imported library on top
+    main_imports = _main_imports()
+    timings['main.py imports'] = _fresh_import_time('', main_imports)
+    for stage, stmt in VIEW_IMPORTS.items():
+        timings[stage] = _fresh_import_time(main_imports, stmt)
+
+
+VIEWS = {
+    'startup': bench_startup,
+    'current_status': bench_current_status,
+    'individual_student': bench_individual_student,
+    'cohort': bench_cohort,
+    'march_may': bench_march_may,
+    'build_tier_csv': bench_build_tier_csv,
+}
+
+
+def run(views, repeat):
+    """{view: {stage: {'min': s, 'median': s}, 'total': {...}}} over repeat cold runs."""
+    results = {}
+    for view in views:
+        runs = []
+        for _ in range(repeat):
+            data_loader.clear_cache()
+            analytics.interventions.clear_cache()
+            analytics.engagement.clear_cache()
+            student_charts.clear_cache()
+            timings = {}
+            VIEWS[view](timings)
+            timings['total'] = sum(timings.values())
+            runs.append(timings)
+        results[view] = {
+            stage: {'min': min(r[stage] for r in runs), 'median': statistics.median(r[stage] for r in runs)}
+            for stage in runs[0]
+        }
+    return results
+
+
+def dataset_rows():
+    rows = {}
+    for name in data_loader.DATASETS:
+        df = data_loader.load_dataset(name)
+        rows[name] = 0 if df is None else len(df)
+    return rows
+
+
+def dataset_memory():
+    """{dataset: KB} of the full frames as loaded (after dataset_rows() has loaded them)."""
+    report = data_loader.memory_report()
+    report = report[report['columns'] == 'all']
+    return dict(zip(report['dataset'], report['kb']))
+
+
+def _git_commit(repo_dir):
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_dir, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def previous_run(results_path, label, students):
+    """Most recent recorded run with the same label and student count, or None."""
+    if not os.path.exists(results_path):
+        return None
+    last = None
+    with open(results_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get('label') == label and rec.get('students') == students:
+                last = rec
+    return last
+
+
+def print_report(record, previous):
+    print(f"\n{record['label']}: {record['students']} students, rows {record['rows']}")
+    print(f"  loaded frames (KB): {record.get('memory_kb')}")
+    if record.get('chart_payload_kb'):
+        print(f"  individual student charts (KB per student): {record['chart_payload_kb']}")
+    for view, stages in record['results'].items():
+        print(f'\n  {view}')
+        for stage, t in stages.items():
+            line = f"    {stage:<44} {t['median'] * 1000:10.1f} ms  (min {t['min'] * 1000:.1f})"
+            before = (previous or {}).get('results', {}).get(view, {}).get(stage)
+            if before and before['median'] > 0:
+                line += f"  {(t['median'] / before['median'] - 1) * 100:+.0f}% vs {previous.get('commit') or previous['timestamp']}"
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard view computations and build_tier_csv.')
+    parser.add_argument('--students', type=int, default=1000, help='Synthetic cohort size (ignored with --data-dir).')
+    parser.add_argument('--data-dir', help='Benchmark the CSVs in this directory instead of a synthetic cohort.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--views', nargs='+', choices=list(VIEWS), default=list(VIEWS))
+    parser.add_argument('--label', help='Name to compare runs under (default: synthetic or the data dir).')
+    parser.add_argument('--results', default=RESULTS_PATH, help=f'JSONL file to append results to (default: {RESULTS_PATH}).')
+    args = parser.parse_args()
+
+    results_path = os.path.abspath(args.results)
+    if args.data_dir:
+        data_dir = args.data_dir
+        label = args.label or os.path.basename(os.path.abspath(data_dir))
+    else:
+        data_dir = os.path.join('synthetic', str(args.students))
+        label = args.label or 'synthetic'
+        if not os.path.exists(os.path.join(data_dir, synth_cohort.FILENAMES['engagement'])):
+            print(f'Generating {args.students} students in {data_dir} ...')
+            synth_cohort.generate(args.students, data_dir, seed=args.seed)
+
+    # data_loader and build_tier_csv resolve their files relative to the working directory
+    os.chdir(data_dir)
+    results = run(args.views, args.repeat)
+    rows = dataset_rows()
+    memory_kb = dataset_memory()
+    payload_kb = chart_payload_kb() if 'individual_student' in args.views else None
+    record = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'label': label,
+        'students': int(data_loader.load_dataset('engagement')['student_id'].nunique()) if rows['engagement'] else 0,
+        'rows': rows,
+        'memory_kb': memory_kb,
+        'chart_payload_kb': payload_kb,
+        'repeat': args.repeat,
+        'commit': _git_commit(REPO_DIR),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'results': results,
+    }
+    print_report(record, previous_run(results_path, label, record['students']))
+
+    os.makedirs(os.path.dirname(results_path), exist_ok=True)
+    with open(results_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+    print(f'\nAppended to {results_path}')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Convert the dashboard CSVs into typed Parquet snapshots (see data_loader.py).
+The dashboard reads a snapshot instead of its CSV for as long as the CSV is
+unchanged; re-run this after updating any of the CSVs.
+Usage: python build_snapshots.py [dataset ...]
+Default datasets: engagement, test, tier, convata
+"""
+import os
+import sys
+
+from data_loader import DATASETS, SNAPSHOT_DATASETS, write_snapshot
+
+
+def main():
+    names = sys.argv[1:] or SNAPSHOT_DATASETS
+    unknown = [n for n in names if n not in DATASETS]
+    if unknown:
+        print(f"Unknown dataset(s): {', '.join(unknown)}. Known: {', '.join(DATASETS)}")
+        sys.exit(1)
+
+    for name in names:
+        out = write_snapshot(name)
+        if out is None:
+            print(f"  {name}: {DATASETS[name]['filename']} not found, skipped")
+            continue
+        print(f"  {name}: {DATASETS[name]['filename']} -> {out} ({os.path.getsize(out) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
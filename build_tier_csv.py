@@ -1,14 +1,38 @@
 #!/usr/bin/env python3
 """
 Build tier.csv from institution-1-engagement-data.csv:
-Small Group and Large Group attendance tiers per student_id across two time windows.
-Output: tier.csv (or path given by OUT_PATH).
+Small Group and Large Group attendance tiers per student_id per date window.
+Output: tier.csv (or path given by OUT_PATH), one row per student_id per window.
+Other --windows sets are written to WINDOWS_OUT_PATH (or --output), so they
+never replace the default windows the dashboard reads from tier.csv.
+
+Windows default to the two program windows (Jun-Dec 2025, Jan 2026-Current);
+--windows accepts any mix of named, monthly, trailing and rolling N-week windows,
+all computed from a single pass over the data (see resolve_windows).
+
+--batch DIR_OR_GLOB builds one <institution>-tier.csv per
+institution-*-engagement-data.csv across a process pool, plus a combined
+tier_summary.csv of the tier counts.
+
+With --incremental, per-student per-window running sums and a watermark (byte
+offset, last week / start_date processed) are kept in STATE_PATH / WATERMARK_PATH,
+and each run only reads and folds in rows appended since the last run; appended
+rows from before the watermark week mean the file was rewritten, and trigger a
+full rebuild.
 """
 
-import pandas as pd
-import numpy as np
+import argparse
+import glob
+import io
+import json
 import os
-from datetime import datetime
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from analytics.engagement import WeekTensor
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -17,12 +41,19 @@ INPUT_CSV = "institution-1-engagement-data.csv"
 # Prefer project directory; if /mnt/data exists (e.g. in a container), write there too
 OUT_PATH = "tier.csv"
 OUT_PATH_ALT = "/mnt/data/tier.csv"
+# Any other --windows set goes here unless --output says otherwise: the dashboard reads the default windows from tier.csv
+WINDOWS_OUT_PATH = "tier_windows.csv"
 
 WINDOW_A_START = "2025-06-01"
 WINDOW_A_END = "2025-12-31"
 WINDOW_A_LABEL = "Jun-Dec 2025"
 WINDOW_B_START = "2026-01-01"
 WINDOW_B_LABEL = "Jan 2026-Current"
+DEFAULT_WINDOWS = ["default"]
+
+# Incremental state: running sums per (student_id, date_window) + watermark
+STATE_PATH = "tier_state.csv"
+WATERMARK_PATH = "tier_state.json"
 
 # Column detection (aggregated format)
 AGG_COLS = {
@@ -35,147 +66,167 @@ AGG_COLS = {
 }
 
 
+DATE_FORMATS = ("%m/%d/%y", "%m/%d/%Y", "%Y-%m-%d")
+
+
 def parse_date(s):
-    """Parse US-style or ISO date."""
-    if pd.isna(s) or s == "":
-        return pd.NaT
-    s = str(s).strip()
-    try:
-        return pd.to_datetime(s)
-    except Exception:
-        pass
-    for fmt in ("%m/%d/%y", "%m/%d/%Y", "%Y-%m-%d"):
-        try:
-            return datetime.strptime(s, fmt)
-        except ValueError:
-            continue
-    return pd.NaT
-
-
-def assign_window(dt, window_b_start, max_date):
-    if pd.isna(dt):
-        return None
-    if dt >= window_b_start and dt <= max_date:
-        return WINDOW_B_LABEL
-    if WINDOW_A_START <= str(dt)[:10] <= WINDOW_A_END:
-        return WINDOW_A_LABEL
-    return None
+    """Parse a column of US-style or ISO dates; each format is tried once over the whole column."""
+    s = s.astype("string").str.strip()
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        todo = out.isna() & s.notna() & (s != "")
+        if not todo.any():
+            break
+        out[todo] = pd.to_datetime(s[todo], format=fmt, errors="coerce")
+    # Anything left (e.g. timestamps with a time part) falls back to inference
+    todo = out.isna() & s.notna() & (s != "")
+    if todo.any():
+        out[todo] = pd.to_datetime(s[todo], format="mixed", errors="coerce")
+    return out
+
+
+def resolve_windows(specs, days, max_date):
+    """
+    Expand window specs into (label, start, end) tuples; both ends inclusive.
+
+      default            Jun-Dec 2025 and Jan 2026-Current (through max_date)
+      monthly            one window per calendar month present in days
+      trailing:N         the last N weeks through max_date
+      rolling:N          an N-week window ending at every week start in days
+      LABEL=START..END   a named window; an empty END means through max_date
+
+    days are the sorted unique week start dates in the data.
+    """
+    days = pd.DatetimeIndex(days)
+    windows = []
+    for spec in specs:
+        kind, _, arg = spec.partition(":")
+        if spec == "default":
+            windows.append((WINDOW_A_LABEL, pd.Timestamp(WINDOW_A_START), pd.Timestamp(WINDOW_A_END)))
+            windows.append((WINDOW_B_LABEL, pd.Timestamp(WINDOW_B_START), max_date))
+        elif spec == "monthly":
+            for month in days.to_period("M").unique():
+                windows.append((month.strftime("%b %Y"), month.start_time, month.end_time.normalize()))
+        elif kind in ("trailing", "rolling") and arg.isdigit() and int(arg) > 0:
+            n = int(arg)
+            span = pd.Timedelta(days=7 * (n - 1))
+            if kind == "trailing":
+                if pd.notna(max_date):
+                    windows.append((f"Trailing {n} weeks", max_date.normalize() - span, max_date))
+            else:
+                for d in days:
+                    windows.append((f"{n} weeks to {d:%Y-%m-%d}", d - span, d))
+        elif "=" in spec and ".." in spec:
+            label, _, bounds = spec.partition("=")
+            start, _, end = bounds.partition("..")
+            windows.append((label, pd.Timestamp(start), pd.Timestamp(end) if end else max_date))
+        else:
+            raise ValueError(
+                f"Unknown window spec {spec!r}. Expected default, monthly, trailing:N, "
+                "rolling:N or LABEL=YYYY-MM-DD..YYYY-MM-DD."
+            )
+    return windows
+
+
+def attendance_rate(scheduled, attended):
+    """attended / scheduled, NaN where nothing was scheduled."""
+    return attended.div(scheduled.where(scheduled != 0))
 
 
 def tier_from_rate(rate, scheduled):
-    if scheduled == 0 or pd.isna(scheduled):
-        return "No Scheduled Sessions"
-    if pd.isna(rate):
-        return "No Scheduled Sessions"
-    if rate > 0.70:  # Tier 1: >70%
-        return "Tier 1"
-    if rate >= 0.50 and rate <= 0.70:  # Tier 2: 50–70%
-        return "Tier 2"
-    return "Tier 3"
-
-
-def main():
-    # ---------------------------------------------------------------------------
-    # 1) Load and detect format
-    # ---------------------------------------------------------------------------
-    if not os.path.exists(INPUT_CSV):
-        raise FileNotFoundError(f"Input file not found: {INPUT_CSV}")
-
-    df = pd.read_csv(INPUT_CSV)
-
-    # Drop completely empty columns (e.g. Unnamed: 16)
-    df = df.dropna(axis=1, how="all")
-
-    # Detect: aggregated columns present?
-    has_agg = all(
-        c in df.columns
-        for c in [
-            AGG_COLS["student_id"],
-            AGG_COLS["num_attended_small_session"],
-            AGG_COLS["num_scheduled_small_session"],
-            AGG_COLS["num_attended_large_session"],
-            AGG_COLS["num_scheduled_large_session"],
-        ]
+    """Vectorized tier label for a rate column and its scheduled-session counts."""
+    no_sched = (scheduled == 0) | scheduled.isna() | rate.isna()
+    return pd.Series(
+        np.select(
+            [no_sched, rate > 0.70, rate >= 0.50],  # Tier 1: >70%, Tier 2: 50–70%
+            ["No Scheduled Sessions", "Tier 1", "Tier 2"],
+            default="Tier 3",
+        ),
+        index=rate.index,
     )
-    date_col = AGG_COLS["date_col"] if AGG_COLS["date_col"] in df.columns else None
 
-    if has_agg and date_col:
-        print("Detected: aggregated format (num_attended_* / num_scheduled_* per row).")
-        print(f"Using date column: {date_col}")
-    else:
-        # Would need log-level handling and session type/scheduled/attended flags
-        raise ValueError(
-            "Aggregated columns not found. Expected: student_id, num_attended_small_session, "
-            "num_scheduled_small_session, num_attended_large_session, num_scheduled_large_session, "
-            "and a date column (e.g. start_date) for window assignment."
-        )
 
-    sid = AGG_COLS["student_id"]
-    df["_parsed_date"] = df[date_col].apply(parse_date)
-    max_date = df["_parsed_date"].max()
-    window_b_start_dt = pd.Timestamp(WINDOW_B_START)
+SUM_COLS = [
+    "num_scheduled_small_session",
+    "num_attended_small_session",
+    "num_scheduled_large_session",
+    "num_attended_large_session",
+]
+
 
-    df["date_window"] = df["_parsed_date"].apply(
-        lambda d: assign_window(d, window_b_start_dt, max_date)
+def detect_date_col(columns):
+    """Return the window date column, or raise if the aggregated columns are missing."""
+    has_agg = all(c in columns for c in [AGG_COLS["student_id"]] + SUM_COLS)
+    date_col = AGG_COLS["date_col"] if AGG_COLS["date_col"] in columns else None
+    if has_agg and date_col:
+        return date_col
+    # Would need log-level handling and session type/scheduled/attended flags
+    raise ValueError(
+        "Aggregated columns not found. Expected: student_id, num_attended_small_session, "
+        "num_scheduled_small_session, num_attended_large_session, num_scheduled_large_session, "
+        "and a date column (e.g. start_date) for window assignment."
     )
-    df = df[df["date_window"].notna()].copy()
+
+
+def window_sums(df, date_col, windows=DEFAULT_WINDOWS, max_date=None):
+    """
+    Sum the session counts per student_id per date_window for every window in
+    windows. The rows are laid out once as a student x week-start tensor of
+    prefix sums (analytics.engagement.WeekTensor); every window covers a
+    contiguous run of week starts, so its sums for all students are one
+    difference of two prefix slices, however many windows overlap.
+    Students with no rows in a window get no row for it.
+    max_date caps open-ended windows (defaults to the latest date in df).
+    Returns (sums, window labels in spec order).
+    """
+    sid = AGG_COLS["student_id"]
+    parsed = parse_date(df[date_col])
+    df = df[[sid] + SUM_COLS].copy()
+    if max_date is None:
+        max_date = parsed.max()
+    df["_day"] = parsed.dt.normalize()
 
     # Coerce numeric
-    for col in [
-        "num_attended_small_session",
-        "num_scheduled_small_session",
-        "num_attended_large_session",
-        "num_scheduled_large_session",
-    ]:
+    for col in SUM_COLS:
         df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
 
-    # ---------------------------------------------------------------------------
-    # 2) Aggregate per student_id per date_window
-    # ---------------------------------------------------------------------------
-    grp = df.groupby([sid, "date_window"], as_index=False).agg(
-        num_scheduled_small_session=("num_scheduled_small_session", "sum"),
-        num_attended_small_session=("num_attended_small_session", "sum"),
-        num_scheduled_large_session=("num_scheduled_large_session", "sum"),
-        num_attended_large_session=("num_attended_large_session", "sum"),
-    )
+    tensor = WeekTensor.from_frame(df, sid, "_day", SUM_COLS)
+    resolved = resolve_windows(windows, tensor.weeks, max_date)
 
-    # ---------------------------------------------------------------------------
-    # 3) Rates and tiers
-    # ---------------------------------------------------------------------------
-    def rate(sched, att):
-        if sched == 0:
-            return np.nan
-        return att / sched
+    # students x labels (labels sorted, as a groupby would); windows sharing a label add up
+    labels = sorted({label for label, _, _ in resolved})
+    column = {label: i for i, label in enumerate(labels)}
+    totals = np.zeros((len(tensor.students), len(labels), len(SUM_COLS)), dtype="int64")
+    has_rows = np.zeros((len(tensor.students), len(labels)), dtype=bool)
+    for label, start, end in resolved:
+        start, end = np.datetime64(start, "ns"), np.datetime64(end, "ns")
+        totals[:, column[label]] += tensor.sum(SUM_COLS, start, end).astype("int64")
+        has_rows[:, column[label]] |= tensor.row_count(start, end) > 0
 
-    grp["small_group_attendance_rate"] = grp.apply(
-        lambda r: rate(r["num_scheduled_small_session"], r["num_attended_small_session"]), axis=1
-    )
-    grp["large_group_attendance_rate"] = grp.apply(
-        lambda r: rate(r["num_scheduled_large_session"], r["num_attended_large_session"]), axis=1
-    )
+    shape = has_rows.shape
+    sums = pd.DataFrame({
+        sid: pd.Series(np.broadcast_to(tensor.students[:, None], shape)[has_rows], dtype=df[sid].dtype),
+        "date_window": pd.Series(np.broadcast_to(np.array(labels, dtype=object), shape)[has_rows], dtype="str"),
+    })
+    sums[SUM_COLS] = totals[has_rows]
+    return sums, list(dict.fromkeys(label for label, _, _ in resolved))
 
-    grp["small_group_tier"] = grp.apply(
-        lambda r: tier_from_rate(
-            r["small_group_attendance_rate"], r["num_scheduled_small_session"]
-        ),
-        axis=1,
-    )
-    grp["large_group_tier"] = grp.apply(
-        lambda r: tier_from_rate(
-            r["large_group_attendance_rate"], r["num_scheduled_large_session"]
-        ),
-        axis=1,
-    )
 
-    # Round rates to 3 decimals; leave blank when no scheduled
-    grp["small_group_attendance_rate"] = grp["small_group_attendance_rate"].round(3)
-    grp["large_group_attendance_rate"] = grp["large_group_attendance_rate"].round(3)
-    grp.loc[grp["num_scheduled_small_session"] == 0, "small_group_attendance_rate"] = np.nan
-    grp.loc[grp["num_scheduled_large_session"] == 0, "large_group_attendance_rate"] = np.nan
+def tiers_from_sums(grp, window_order=None):
+    """
+    Rates, tiers and final column order from per-student per-window sums.
+    Rows are sorted by student_id, then by window_order (defaults to the two program windows).
+    """
+    sid = AGG_COLS["student_id"]
+    grp = grp.copy()
+    for size in ("small", "large"):
+        sched = grp[f"num_scheduled_{size}_session"]
+        rate = attendance_rate(sched, grp[f"num_attended_{size}_session"])
+        grp[f"{size}_group_tier"] = tier_from_rate(rate, sched)
+        # Round rates to 3 decimals; blank (NaN) when no scheduled
+        grp[f"{size}_group_attendance_rate"] = rate.round(3)
 
-    # ---------------------------------------------------------------------------
-    # 4) Final column order (exact sheet format, no extra tiers)
-    # ---------------------------------------------------------------------------
+    # Final column order (exact sheet format, no extra tiers)
     out = grp[
         [
             sid,
@@ -190,49 +241,338 @@ def main():
             "large_group_tier",
         ]
     ].copy()
+    # Ensure date_window order (default: Jun-Dec 2025 then Jan 2026-Current)
+    if window_order is None:
+        window_order = [WINDOW_A_LABEL, WINDOW_B_LABEL]
+    window_order = list(window_order) + sorted(set(out["date_window"]) - set(window_order))
+    out["date_window"] = pd.Categorical(out["date_window"], categories=window_order, ordered=True)
     out = out.sort_values([sid, "date_window"]).reset_index(drop=True)
+    out["date_window"] = out["date_window"].astype(str)
+    return out
+
+
+def load_watermark(state_path=STATE_PATH, watermark_path=WATERMARK_PATH):
+    if not (os.path.exists(watermark_path) and os.path.exists(state_path)):
+        return None
+    with open(watermark_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(sums, watermark, state_path=STATE_PATH, watermark_path=WATERMARK_PATH):
+    sums.to_csv(state_path, index=False)
+    with open(watermark_path, "w", encoding="utf-8") as f:
+        json.dump(watermark, f, indent=2)
+
+
+def make_watermark(input_csv, df, date_col, offset, header, max_date, windows, window_order):
+    week = int(pd.to_numeric(df["week"], errors="coerce").max()) if "week" in df.columns and not df.empty else None
+    last_start = parse_date(df[date_col]).max() if not df.empty else pd.NaT
+    return {
+        "input": os.path.abspath(input_csv),
+        "offset": offset,
+        "header": header,
+        "week": week,
+        "start_date": None if pd.isna(last_start) else last_start.strftime("%Y-%m-%d"),
+        "max_date": None if pd.isna(max_date) else max_date.strftime("%Y-%m-%d"),
+        "windows": list(windows),
+        "window_order": list(window_order),
+    }
+
+
+def read_header(input_csv):
+    with open(input_csv, "rb") as f:
+        return f.readline().decode("utf-8").rstrip("\r\n")
 
-    # Ensure date_window order: Jun-Dec 2025 then Jan 2026-Current
-    out["date_window"] = pd.Categorical(
-        out["date_window"], categories=[WINDOW_A_LABEL, WINDOW_B_LABEL], ordered=True
+
+def incremental_sums(input_csv, header, watermark, windows, state_path=STATE_PATH, verbose=True):
+    """
+    Fold rows appended after the watermark into the stored sums, reading only
+    the bytes past the stored offset. Returns (sums, watermark), or None when
+    the input no longer extends the processed file (rewritten, truncated,
+    different header or window specs) and a full rebuild is needed.
+    """
+    size = os.path.getsize(input_csv)
+    if (
+        watermark.get("input") != os.path.abspath(input_csv)
+        or watermark.get("header") != header
+        or watermark.get("windows") != list(windows)
+        or size < watermark["offset"]
+    ):
+        return None
+
+    sid = AGG_COLS["student_id"]
+    state = pd.read_csv(state_path)
+    with open(input_csv, "rb") as f:
+        f.seek(watermark["offset"])
+        tail = f.read()
+    names = pd.read_csv(io.StringIO(header)).columns
+    new = pd.read_csv(io.BytesIO(tail), header=None, names=names) if tail.strip() else pd.DataFrame(columns=names)
+    date_col = detect_date_col(new.columns)
+
+    # The byte offset already folds every row once (a week may arrive over several appends);
+    # rows older than the watermark mean the file was rewritten rather than appended to
+    if watermark.get("week") is not None and "week" in new.columns:
+        if (pd.to_numeric(new["week"], errors="coerce") < watermark["week"]).any():
+            return None
+    elif watermark.get("start_date"):
+        if (parse_date(new[date_col]) < pd.Timestamp(watermark["start_date"])).any():
+            return None
+
+    # Window B is capped at the latest date seen so far; it only ever moves forward
+    dates = [parse_date(new[date_col]).max()]
+    if watermark.get("max_date"):
+        dates.append(pd.Timestamp(watermark["max_date"]))
+    max_date = pd.Series(dates, dtype="datetime64[ns]").max()
+
+    if verbose:
+        print(f"Incremental: folding {len(new)} new rows (watermark week {watermark.get('week')}).")
+    new_sums, new_order = window_sums(new, date_col, windows, max_date)
+    sums = (
+        pd.concat([state, new_sums], ignore_index=True)
+        .groupby([sid, "date_window"], as_index=False)[SUM_COLS]
+        .sum()
     )
-    out = out.sort_values([sid, "date_window"]).reset_index(drop=True)
-    out["date_window"] = out["date_window"].astype(str)
+    window_order = list(dict.fromkeys(watermark.get("window_order", []) + new_order))
+    wm = make_watermark(
+        input_csv, new, date_col, watermark["offset"] + len(tail), header, max_date, windows, window_order
+    )
+    for key in ("week", "start_date"):
+        if wm[key] is None or (watermark.get(key) is not None and watermark[key] > wm[key]):
+            wm[key] = watermark.get(key)
+    return sums, wm
+
+
+def build_tiers(
+    input_csv=INPUT_CSV,
+    windows=DEFAULT_WINDOWS,
+    incremental=False,
+    state_path=STATE_PATH,
+    watermark_path=WATERMARK_PATH,
+    verbose=True,
+):
+    """
+    Tier table for one engagement export. Returns (out, window_order).
+    With incremental=True, running sums and the watermark live in state_path / watermark_path.
+    """
+    # ---------------------------------------------------------------------------
+    # 1) Load and detect format
+    # ---------------------------------------------------------------------------
+    if not os.path.exists(input_csv):
+        raise FileNotFoundError(f"Input file not found: {input_csv}")
+
+    header = read_header(input_csv)
+
+    result = None
+    if incremental:
+        # Windows that slide with the latest date cannot be folded into running sums
+        if any(w.startswith(("trailing:", "rolling:")) for w in windows):
+            raise ValueError("--incremental supports fixed windows only (default, monthly, LABEL=START..END).")
+        watermark = load_watermark(state_path, watermark_path)
+        if watermark is not None:
+            result = incremental_sums(input_csv, header, watermark, windows, state_path, verbose)
+        if result is None and verbose:
+            print("Incremental: no usable state, running a full rebuild.")
 
     # ---------------------------------------------------------------------------
-    # 5) Save
+    # 2) Aggregate per student_id per date_window
     # ---------------------------------------------------------------------------
-    out.to_csv(OUT_PATH, index=False)
-    print(f"Saved: {os.path.abspath(OUT_PATH)}")
-    if os.path.isdir(os.path.dirname(OUT_PATH_ALT)):
+    if result is not None:
+        grp, watermark = result
+    else:
+        with open(input_csv, "rb") as f:
+            raw = f.read()
+        df = pd.read_csv(io.BytesIO(raw))
+
+        # Drop completely empty columns (e.g. Unnamed: 16)
+        df = df.dropna(axis=1, how="all")
+
+        date_col = detect_date_col(df.columns)
+        if verbose:
+            print("Detected: aggregated format (num_attended_* / num_scheduled_* per row).")
+            print(f"Using date column: {date_col}")
+
+        max_date = parse_date(df[date_col]).max()
+        grp, window_order = window_sums(df, date_col, windows, max_date)
+        watermark = make_watermark(input_csv, df, date_col, len(raw), header, max_date, windows, window_order)
+
+    if incremental:
+        save_state(grp, watermark, state_path, watermark_path)
+        if verbose:
+            print(f"Watermark: week {watermark['week']}, start_date {watermark['start_date']}")
+
+    # ---------------------------------------------------------------------------
+    # 3) Rates and tiers
+    # ---------------------------------------------------------------------------
+    return tiers_from_sums(grp, watermark["window_order"]), watermark["window_order"]
+
+
+def tier_counts(out, window_order):
+    """Long table of students per (date_window, group, tier) -- what the summary prints."""
+    rows = []
+    for group in ("small", "large"):
+        counts = out.groupby(["date_window", f"{group}_group_tier"]).size()
+        for (w, tier), n in counts.items():
+            rows.append({"date_window": w, "group": group, "tier": tier, "students": int(n)})
+    counts = pd.DataFrame(rows, columns=["date_window", "group", "tier", "students"])
+    counts["date_window"] = pd.Categorical(counts["date_window"], categories=window_order, ordered=True)
+    counts = counts.sort_values(["group", "date_window", "tier"], ascending=[False, True, True])
+    counts["date_window"] = counts["date_window"].astype(str)
+    return counts.reset_index(drop=True)
+
+
+def print_summary(out, window_order):
+    counts = tier_counts(out, window_order)
+    for group in ("small", "large"):
+        print(f"\n--- {group.capitalize()} group tier counts by date_window ---")
+        sub_g = counts[counts["group"] == group]
+        for w in window_order:
+            sub = sub_g[sub_g["date_window"] == w]
+            if sub.empty:
+                print(f"  {w}: (no rows)")
+                continue
+            print(f"  {w}:")
+            for tier, n in zip(sub["tier"], sub["students"]):
+                print(f"    {tier}: {n}")
+
+
+def output_path(windows, output=None):
+    """Where a run writes its table: output if given, tier.csv for the default windows, else WINDOWS_OUT_PATH."""
+    if output:
+        return output
+    return OUT_PATH if list(windows) == DEFAULT_WINDOWS else WINDOWS_OUT_PATH
+
+
+def main(incremental=False, windows=DEFAULT_WINDOWS, output=None):
+    out_path = output_path(windows, output)
+    # Each output keeps its own incremental state (tier.csv -> tier_state.csv / tier_state.json)
+    stem = os.path.splitext(out_path)[0]
+    out, window_order = build_tiers(INPUT_CSV, windows, incremental, f"{stem}_state.csv", f"{stem}_state.json")
+
+    # ---------------------------------------------------------------------------
+    # 4) Save
+    # ---------------------------------------------------------------------------
+    out.to_csv(out_path, index=False)
+    print(f"Saved: {os.path.abspath(out_path)}")
+    if out_path == OUT_PATH and os.path.isdir(os.path.dirname(OUT_PATH_ALT)):
         out.to_csv(OUT_PATH_ALT, index=False)
         print(f"Also saved: {OUT_PATH_ALT}")
 
     # ---------------------------------------------------------------------------
-    # 6) Summaries: tier counts per date_window
+    # 5) Summaries: tier counts per date_window
     # ---------------------------------------------------------------------------
-    print("\n--- Small group tier counts by date_window ---")
-    for w in [WINDOW_A_LABEL, WINDOW_B_LABEL]:
-        sub = out[out["date_window"] == w]
-        if sub.empty:
-            print(f"  {w}: (no rows)")
-            continue
-        counts = sub["small_group_tier"].value_counts().sort_index()
-        print(f"  {w}:")
-        for tier, n in counts.items():
-            print(f"    {tier}: {n}")
-
-    print("\n--- Large group tier counts by date_window ---")
-    for w in [WINDOW_A_LABEL, WINDOW_B_LABEL]:
-        sub = out[out["date_window"] == w]
-        if sub.empty:
-            print(f"  {w}: (no rows)")
-            continue
-        counts = sub["large_group_tier"].value_counts().sort_index()
-        print(f"  {w}:")
-        for tier, n in counts.items():
-            print(f"    {tier}: {n}")
+    print_summary(out, window_order)
+
+
+# ---------------------------------------------------------------------------
+# Batch: many institutions across a process pool
+# ---------------------------------------------------------------------------
+BATCH_PATTERN = "institution-*-engagement-data.csv"
+BATCH_SUMMARY = "tier_summary.csv"
+
+
+def institution_name(input_csv):
+    """institution-7-engagement-data.csv -> institution-7"""
+    name = os.path.basename(input_csv)
+    return name[: -len("-engagement-data.csv")] if name.endswith("-engagement-data.csv") else os.path.splitext(name)[0]
+
+
+def batch_inputs(sources):
+    """Expand directories (searched for BATCH_PATTERN) and glob patterns into a sorted list of files."""
+    paths = []
+    for src in sources:
+        pattern = os.path.join(src, BATCH_PATTERN) if os.path.isdir(src) else src
+        paths.extend(glob.glob(pattern))
+    return sorted(set(paths))
+
+
+def _build_one(input_csv, out_dir, windows, incremental):
+    """Worker: build and save one institution's tier table; returns its tier counts."""
+    inst = institution_name(input_csv)
+    out_dir = out_dir or os.path.dirname(input_csv)
+    out, window_order = build_tiers(
+        input_csv,
+        windows,
+        incremental,
+        state_path=os.path.join(out_dir, f"{inst}-{STATE_PATH}"),
+        watermark_path=os.path.join(out_dir, f"{inst}-{WATERMARK_PATH}"),
+        verbose=False,
+    )
+    out_path = os.path.join(out_dir, f"{inst}-tier.csv")
+    out.to_csv(out_path, index=False)
+    counts = tier_counts(out, window_order)
+    counts.insert(0, "institution", inst)
+    return out_path, counts
+
+
+def run_batch(sources, out_dir=None, windows=DEFAULT_WINDOWS, incremental=False, workers=None):
+    """
+    Build one <institution>-tier.csv per engagement export across a process pool
+    and write the combined tier counts to BATCH_SUMMARY. out_dir defaults to each
+    input's own directory (the summary then goes to the current directory).
+    """
+    inputs = batch_inputs(sources)
+    if not inputs:
+        raise FileNotFoundError(f"No engagement exports matched: {' '.join(sources)}")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    summaries = []
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_build_one, p, out_dir, windows, incremental): p for p in inputs}
+        for fut in as_completed(futures):
+            try:
+                out_path, counts = fut.result()
+            except Exception as e:
+                failed.append(futures[fut])
+                print(f"FAILED {futures[fut]}: {e}")
+                continue
+            print(f"Saved: {os.path.abspath(out_path)}")
+            summaries.append(counts)
+
+    if summaries:
+        summary = pd.concat(summaries, ignore_index=True).sort_values("institution", kind="stable")
+        summary_path = os.path.join(out_dir or ".", BATCH_SUMMARY)
+        summary.to_csv(summary_path, index=False)
+        print(f"Saved: {os.path.abspath(summary_path)}")
+
+        print("\n--- Tier counts by institution ---")
+        table = summary.pivot_table(
+            index=["institution", "date_window"], columns=["group", "tier"], values="students", aggfunc="sum", fill_value=0, sort=False
+        )
+        print(table.to_string())
+    print(f"\n{len(inputs) - len(failed)} of {len(inputs)} institutions built.")
+    return failed
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build tier.csv from engagement data.")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=f"Only fold in rows appended since the last run (state in {STATE_PATH} / {WATERMARK_PATH}).",
+    )
+    parser.add_argument(
+        "--windows",
+        nargs="+",
+        default=DEFAULT_WINDOWS,
+        metavar="SPEC",
+        help="Windows to tier: default, monthly, trailing:N, rolling:N, LABEL=YYYY-MM-DD..YYYY-MM-DD.",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help=f"Output CSV (default: {OUT_PATH} for the default windows, {WINDOWS_OUT_PATH} for any other set).",
+    )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="DIR_OR_GLOB",
+        help=f"Build every {BATCH_PATTERN} under these directories / globs in parallel.",
+    )
+    parser.add_argument("--out-dir", help="Batch output directory (default: next to each input).")
+    parser.add_argument("--workers", type=int, help="Batch process count (default: CPU count).")
+    args = parser.parse_args()
+    if args.batch:
+        sys.exit(1 if run_batch(args.batch, args.out_dir, args.windows, args.incremental, args.workers) else 0)
+    main(incremental=args.incremental, windows=args.windows, output=args.output)
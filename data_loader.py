@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Shared data-loading layer for every CSV the dashboard reads.
+
+Each dataset is registered once in DATASETS (file name, date columns and their
+format, numeric columns, and the compact dtype each known column is stored
+as: nullable small ints for counts, float32 for rates and scores,
+categoricals for repeated labels). load_dataset() resolves the first existing
+path, parses and dtype-coerces it, and caches the DataFrame keyed on
+path + mtime + size, so every view and every Streamlit rerun gets the same
+object until the file on disk changes. memory_report() lists what the cached
+frames hold.
+
+When build_snapshots.py has written a typed Parquet snapshot of a dataset
+(SNAPSHOT_DIR/<name>.parquet) that is still current for its CSV, it is read
+instead of the CSV: no re-parsing, and columns= projects at read time.
+pyarrow is optional; without it everything falls back to the CSVs.
+
+Frames are shared: callers must .copy() before adding or overwriting columns.
+"""
+
+import json
+import os
+import threading
+
+import pandas as pd
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+DATA_DIRS = ['', 'TJEY25/', 'student-data/', 'student_data/']
+
+DATASETS = {
+    'engagement': {
+        'filename': 'institution-1-engagement-data.csv',
+        'dates': {'start_date': '%m/%d/%y', 'end_date': '%m/%d/%y'},
+        'numeric': [
+            'cars_accuracy', 'sciences_accuracy', 'class_accuracy', 'completed_lessons',
+            'total_completed_passages_discrete_sets', 'score_trends_on_completed_dailies',
+            'num_attended_large_session', 'num_scheduled_large_session',
+            'num_attended_small_session', 'num_scheduled_small_session',
+            'class_participation', 'homework_participation',
+        ],
+        'dtypes': {
+            'week': 'int16',
+            'cars_accuracy': 'float32', 'sciences_accuracy': 'float32', 'class_accuracy': 'float32',
+            'score_trends_on_completed_dailies': 'float32',
+            'class_participation': 'float32', 'homework_participation': 'float32',
+            'completed_lessons': 'Int16', 'total_completed_passages_discrete_sets': 'Int16',
+            'num_attended_large_session': 'Int8', 'num_scheduled_large_session': 'Int8',
+            'num_attended_small_session': 'Int8', 'num_scheduled_small_session': 'Int8',
+        },
+    },
+    'test': {
+        'filename': 'institution-1-test-data.csv',
+        'dates': {'test_date': '%Y-%m-%d'},
+        'numeric': ['actual_exam_score'],
+        'dtypes': {'test_name': 'category', 'actual_exam_score': 'float32'},
+    },
+    'tier': {
+        'filename': 'tier.csv',
+        'dates': {},
+        'numeric': [
+            'num_scheduled_small_session', 'num_attended_small_session', 'small_group_attendance_rate',
+            'num_scheduled_large_session', 'num_attended_large_session', 'large_group_attendance_rate',
+        ],
+        'dtypes': {
+            'date_window': 'category', 'small_group_tier': 'category', 'large_group_tier': 'category',
+            'num_scheduled_small_session': 'Int16', 'num_attended_small_session': 'Int16',
+            'num_scheduled_large_session': 'Int16', 'num_attended_large_session': 'Int16',
+            'small_group_attendance_rate': 'float32', 'large_group_attendance_rate': 'float32',
+        },
+    },
+    'convata': {
+        'filename': 'convata_data.csv',
+        'dates': {'Next Attempt Date': '%m/%d/%y'},
+        'numeric': ['First Attempt'],
+        'dtypes': {'First Attempt': 'float32'},
+    },
+    'roster': {
+        'filename': 'roster.csv',
+        'dates': {},
+        'numeric': [],
+        'dtypes': {},
+    },
+    'mcat_source': {
+        'filename': 'mcat_source_data.csv',
+        'dates': {'first_exam_date': '%m/%d/%y', 'second_exam_date': '%m/%d/%y'},
+        'numeric': ['first_exam_score'],
+        'dtypes': {'college': 'category', 'category': 'category', 'first_exam_score': 'float32'},
+    },
+}
+
+SNAPSHOT_DIR = 'snapshots'
+SNAPSHOT_DATASETS = ['engagement', 'test', 'tier', 'convata']
+# Parquet schema metadata: [mtime_ns, size] of the CSV the snapshot was built from
+SNAPSHOT_SOURCE_KEY = b'institution_tj_source'
+
+_cache = {}
+_cache_lock = threading.RLock()
+
+
+def resolve_path(filename):
+    """Return the first existing path for filename under DATA_DIRS, or None."""
+    for base in DATA_DIRS:
+        path = f'{base}{filename}'
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _read(path, spec):
+    df = pd.read_csv(path)
+    # Drop completely empty trailing columns (e.g. Unnamed: 16)
+    df = df.drop(columns=[c for c in df.columns if c.startswith('Unnamed:') and df[c].isna().all()])
+    for col in spec['numeric']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return compact(parse_dates(df, spec), spec)
+
+
+def parse_dates(df, spec):
+    """Parse the columns in spec['dates'] with their explicit format (blank / '—' become NaT); parsed columns are left alone."""
+    for col, fmt in spec['dates'].items():
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = pd.to_datetime(df[col], format=fmt, errors='coerce')
+    return df
+
+
+def compact(df, spec):
+    """Cast the columns in spec['dtypes'] to their compact dtype; a column whose values don't fit keeps its dtype."""
+    for col, dtype in spec.get('dtypes', {}).items():
+        if col in df.columns and df[col].dtype != dtype:
+            try:
+                df[col] = df[col].astype(dtype)
+            except (TypeError, ValueError, OverflowError):
+                pass
+    return df
+
+
+def _stamp(path):
+    try:
+        st_ = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), st_.st_mtime_ns, st_.st_size)
+
+
+def snapshot_path(name):
+    return os.path.join(SNAPSHOT_DIR, f'{name}.parquet')
+
+
+def _read_snapshot(path, source, columns):
+    """Read a snapshot if it was built from the current CSV (or the CSV is gone); else None."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    try:
+        schema = pq.read_schema(path)
+        recorded = json.loads((schema.metadata or {}).get(SNAPSHOT_SOURCE_KEY, b'null'))
+        if source is not None and recorded != [source[1], source[2]]:
+            return None
+        if columns is not None:
+            columns = [c for c in columns if c in schema.names]
+        return pq.read_table(path, columns=columns).to_pandas()
+    except Exception:
+        return None
+
+
+def load_dataset(name, columns=None):
+    """
+    Load a registered dataset by name ('engagement', 'test', 'tier', ...),
+    optionally projected to columns. Returns the cached DataFrame, or None when
+    the file is missing or unreadable.
+    """
+    spec = DATASETS[name]
+    path = resolve_path(spec['filename'])
+    source = _stamp(path) if path is not None else None
+    snapshot = _stamp(snapshot_path(name))
+    if source is None and snapshot is None:
+        return None
+    cols = tuple(columns) if columns is not None else None
+    key = (source, snapshot)
+
+    with _cache_lock:
+        hit = _cache.get((name, cols))
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        df = _read_snapshot(snapshot_path(name), source, cols) if snapshot is not None else None
+        if df is not None:
+            # Snapshots written before a column was given a date format still hold its strings
+            df = compact(parse_dates(df, spec), spec)
+        if df is None and source is not None:
+            if cols is not None:
+                full = load_dataset(name)
+                df = None if full is None else full[[c for c in cols if c in full.columns]]
+            else:
+                try:
+                    df = _read(path, spec)
+                except Exception:
+                    return None
+        if df is None:
+            return None
+        _cache[(name, cols)] = (key, df)
+        return df
+
+
+def memory_report():
+    """Dataset, columns (projection or 'all'), rows and deep memory in KB of every cached frame."""
+    with _cache_lock:
+        entries = list(_cache.items())
+    rows = []
+    for (name, cols), (_, df) in entries:
+        rows.append({
+            'dataset': name,
+            'columns': 'all' if cols is None else ', '.join(cols),
+            'rows': len(df),
+            'kb': round(df.memory_usage(deep=True).sum() / 1024, 1),
+        })
+    return pd.DataFrame(rows, columns=['dataset', 'columns', 'rows', 'kb'])
+
+
+def write_snapshot(name):
+    """Parse a dataset's CSV and write it as a typed Parquet snapshot; returns the path or None."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    spec = DATASETS[name]
+    path = resolve_path(spec['filename'])
+    source = _stamp(path) if path is not None else None
+    if source is None:
+        return None
+    table = pa.Table.from_pandas(_read(path, spec), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SNAPSHOT_SOURCE_KEY] = json.dumps([source[1], source[2]]).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    out = snapshot_path(name)
+    tmp = f'{out}.{os.getpid()}.tmp'
+    pq.write_table(table, tmp)
+    os.replace(tmp, out)
+    return out
+
+
+def clear_cache():
+    """Drop every cached dataset (e.g. after rebuilding tier.csv in-process)."""
+    with _cache_lock:
+        _cache.clear()
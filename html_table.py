@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Column-wise HTML rendering for the badge tables in the March-May view.
+
+render_table() takes the raw values (numbers, datetimes, missing as NaN /
+NaT), sorts and pages them first, then formats only the visible page one
+column at a time (formats map a column to a label function such as
+int_labels; badge columns map each distinct value to its <span> once) and
+joins the cells into the same markup DataFrame.to_html(escape=False,
+index=False) produces. Rendered pages are kept in a small LRU keyed on a
+hash of the frame's data plus the formats, badge colours, sort and page, so
+reruns that don't change the table reuse the HTML.
+"""
+
+import hashlib
+import html
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+MEMORY_CACHE_TABLES = 128
+PAGE_SIZE = 50
+BADGE_STYLE = 'color:white;padding:2px 10px;border-radius:10px;font-weight:bold;font-size:0.85rem;'
+DEFAULT_BADGE_COLOR = '#9E9E9E'
+
+_tables = OrderedDict()   # (data digest, badges, sort_by, ascending, page, page_size) -> HTML, LRU
+_lock = threading.Lock()
+
+
+def badge(text, color=DEFAULT_BADGE_COLOR):
+    return f'<span style="background:{color};{BADGE_STYLE}">{text}</span>'
+
+
+def badges(values, colors):
+    """Badge HTML per value, coloured from colors; each distinct value is formatted once."""
+    return values.map({v: badge(v, colors.get(v, DEFAULT_BADGE_COLOR)) for v in values.unique()})
+
+
+def int_labels(values, missing='—'):
+    """Numbers as integer strings ('502'), missing as missing."""
+    present = values.dropna()
+    return present.astype('int64').astype(str).reindex(values.index, fill_value=missing)
+
+
+def percent_labels(values, missing='—'):
+    """Fractions as percentages with one decimal ('87.5%'), missing as missing."""
+    present = values.dropna()
+    return present.map('{:.1%}'.format).reindex(values.index, fill_value=missing)
+
+
+def page_count(n_rows, page_size=PAGE_SIZE):
+    return max(1, -(-n_rows // page_size)) if page_size else 1
+
+
+def _digest(df):
+    h = hashlib.sha1(repr(list(df.columns)).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _cells(values):
+    """'<td>...</td>' lines for a column of already-formatted values."""
+    return '      <td>' + values + '</td>'
+
+
+def _build(df, formats, badge_colors, sort_by, ascending, page, page_size):
+    if sort_by is not None:
+        # Sort on the raw values, missing ones last in either direction
+        df = df.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+    if page_size:
+        df = df.iloc[page * page_size:(page + 1) * page_size]
+
+    columns = []
+    for col in df.columns:
+        values = df[col]
+        if col in formats:
+            values = formats[col](values)
+        if col in badge_colors:
+            columns.append(_cells(badges(values.astype(str), badge_colors[col])))
+        else:
+            text = values.astype(object).where(values.notna(), 'NaN').map(str).map(html.escape)
+            columns.append(_cells(text))
+
+    header = '\n'.join(f'      <th>{html.escape(str(col))}</th>' for col in df.columns)
+    if len(df):
+        cells = columns[0]
+        for column in columns[1:]:
+            cells = cells + '\n' + column
+        body = '\n'.join('    <tr>\n' + cells + '\n    </tr>') + '\n'
+    else:
+        body = ''
+    return (
+        '<table border="1" class="dataframe">\n'
+        '  <thead>\n'
+        '    <tr style="text-align: right;">\n'
+        f'{header}\n'
+        '    </tr>\n'
+        '  </thead>\n'
+        '  <tbody>\n'
+        f'{body}'
+        '  </tbody>\n'
+        '</table>'
+    )
+
+
+def render_table(df, badge_colors=None, sort_by=None, ascending=True, page=0, page_size=None, formats=None):
+    """
+    HTML for one page of df (all of it without page_size). df holds raw
+    values; formats maps column -> module-level function turning a column of
+    them into display strings (int_labels, percent_labels, date_labels, ...).
+    badge_colors maps column -> {value: colour} for columns shown as badges;
+    sort_by sorts on the raw values (missing last) before paging.
+    """
+    badge_colors = badge_colors or {}
+    formats = formats or {}
+    key = (
+        _digest(df),
+        tuple((col, f'{fn.__module__}.{fn.__qualname__}') for col, fn in sorted(formats.items())),
+        tuple((col, tuple(sorted(colors.items()))) for col, colors in sorted(badge_colors.items())),
+        sort_by, ascending, page, page_size,
+    )
+    with _lock:
+        cached = _tables.get(key)
+        if cached is not None:
+            _tables.move_to_end(key)
+            return cached
+    rendered = _build(df, formats, badge_colors, sort_by, ascending, page, page_size)
+    with _lock:
+        _tables[key] = rendered
+        while len(_tables) > MEMORY_CACHE_TABLES:
+            _tables.popitem(last=False)
+    return rendered
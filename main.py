@@ -4,21 +4,29 @@ import os
 import shutil
 import pandas as pd
 import streamlit as st
-from datetime import datetime, date
 import hmac
-import altair as alt
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import plotly.figure_factory as ff
-from plotly.subplots import make_subplots
-import seaborn as sns
-import matplotlib.pyplot as plt
-from scipy import stats
-from scipy.stats import pearsonr, spearmanr, kendalltau, ttest_ind
 import warnings
+from analytics import (
+    borderline_scores, cohort_groups, cohort_heatmap, convata_tiers, date_labels, engagement_tensor,
+    first_attempt_outcome_counts, first_attempt_outcomes, first_exam_dates, highest_practice_scores,
+    intervention_groups, intervention_summary, load_interventions, prediction_table, score_improvement,
+    score_outcome_counts, score_outlook, student_detail, taker_shares, test_date_distribution, took_no_score,
+    untested_summary,
+)
+from analytics.cohort import COHORT_SORTS, DEFAULT_TIER_WINDOW, HEATMAP_METRICS
+from analytics.dates import as_dates
+from analytics.engagement import THROUGH_WEEK
+from data_loader import load_dataset, memory_report, resolve_path
+from html_table import PAGE_SIZE, int_labels, percent_labels, render_table
+from html_table import page_count as table_page_count
+from pdf_render import page_count, render_page, render_pages
+from perf_log import SectionTimer, row_count
+from student_index import engagement_index, index_by_student, student_rows, test_index, tier_index
 warnings.filterwarnings('ignore')
 
+# Per-section wall time for this run (sidebar Performance panel + perf_log.jsonl)
+perf = SectionTimer()
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="Institution TJ Scholar Dashboard",
@@ -228,12 +236,16 @@ BRAND_COLORS = {
 }
 
 TIER_COLORS = {'Tier 1': '#4CAF50', 'Tier 2': '#FF9800', 'Tier 3': '#EF5350'}
+# tier.csv date_window label -> heading shown above the tier buttons
+TIER_WINDOW_DISPLAY = {'Jun-Dec 2025': 'Jun–Dec 2025', 'Jan 2026-Current': 'Jan 2026–Current'}
 OUTCOME_COLORS = {
     'Passing': '#4CAF50',
     'Borderline': '#FF9800',
     'Below 495': '#EF5350',
     'No score reported': '#9E9E9E'
 }
+# Display format of the score / date columns the March-May badge tables share
+SCORE_AND_DATE_FORMATS = {'First Attempt': int_labels, '1st Exam Date': date_labels, 'Next Attempt Date': date_labels}
 
 # ── Helper functions ───────────────────────────────────────────────────────────
 
@@ -264,6 +276,12 @@ def load_jfd_data():
     return jfd_df
 
 
+@st.cache_resource
+def load_jfd_index():
+    """JFD rows grouped once by student_id (read-only; shared across sessions)."""
+    return index_by_student(load_jfd_data())
+
+
 def apply_light_mode_styling(fig):
     """Apply consistent light mode styling to Plotly charts."""
     fig.update_layout(
@@ -316,38 +334,50 @@ def get_name(student_id, roster_df):
     return match.iloc[0]['Name Surname']
 
 
-def tier_badge(tier_str):
-    color = TIER_COLORS.get(tier_str, '#9E9E9E')
-    return (
-        f'<span style="background:{color};color:white;padding:2px 10px;'
-        f'border-radius:10px;font-weight:bold;font-size:0.85rem;">{tier_str}</span>'
-    )
-
-
-def outcome_badge(outcome_str):
-    color = OUTCOME_COLORS.get(outcome_str, '#9E9E9E')
-    return (
-        f'<span style="background:{color};color:white;padding:2px 10px;'
-        f'border-radius:10px;font-weight:bold;font-size:0.85rem;">{outcome_str}</span>'
-    )
-
-
-def assign_tier(value, thresholds):
+def badge_table(df, key, badge_colors=None, formats=None):
     """
-    Assign Tier 1/2/3 string based on value and thresholds dict.
-    thresholds = {'tier1_min': 0.70, 'tier2_min': 0.40}
+    Render df as an HTML badge table with server-side sort and pagination.
+    df holds raw values, so sorting is by value; formats maps column -> label
+    function applied to the visible page, badge_colors maps column ->
+    {value: colour} for the columns shown as badges.
     """
-    if pd.isna(value):
-        return 'Tier 3'
-    if value >= thresholds['tier1_min']:
-        return 'Tier 1'
-    if value >= thresholds['tier2_min']:
-        return 'Tier 2'
-    return 'Tier 3'
-
-
-def tier_num(tier_str):
-    return {'Tier 1': 1, 'Tier 2': 2, 'Tier 3': 3}.get(tier_str, 3)
+    sort_by, ascending, page = None, True, 0
+    if len(df) > 1:
+        c1, c2, c3 = st.columns([3, 2, 2])
+        choice = c1.selectbox('Sort by', ['Default order'] + list(df.columns), key=f'{key}_sort')
+        if choice != 'Default order':
+            sort_by = choice
+            ascending = c2.radio('Order', ['Ascending', 'Descending'], horizontal=True, key=f'{key}_order') == 'Ascending'
+        n_pages = table_page_count(len(df), PAGE_SIZE)
+        if n_pages > 1:
+            page = c3.number_input(f'Page (of {n_pages})', 1, n_pages, 1, key=f'{key}_page') - 1
+    html = render_table(df, badge_colors, sort_by, ascending, page, PAGE_SIZE, formats)
+    st.markdown(html, unsafe_allow_html=True)
+
+
+PDF_THUMB_ZOOM = 0.3
+PDF_FULL_ZOOM = 2.0
+PDF_THUMBS_PER_ROW = 6
+
+
+def render_pdf_viewer(pdf_path, key):
+    """
+    Paginated PDF viewer: a low-resolution thumbnail strip of every page, then only
+    the selected page rasterized at full resolution (both cached by pdf_render).
+    """
+    n_pages = page_count(pdf_path)
+    if n_pages == 0:
+        return
+    page = 1
+    if n_pages > 1:
+        thumbs = render_pages(pdf_path, zoom=PDF_THUMB_ZOOM)
+        for start in range(0, n_pages, PDF_THUMBS_PER_ROW):
+            cols = st.columns(PDF_THUMBS_PER_ROW)
+            for col, i in zip(cols, range(start, min(start + PDF_THUMBS_PER_ROW, n_pages))):
+                with col:
+                    st.image(io.BytesIO(thumbs[i]), caption=f"Page {i + 1}", use_container_width=True)
+        page = st.select_slider("Page", options=list(range(1, n_pages + 1)), key=key)
+    st.image(io.BytesIO(render_page(pdf_path, page - 1, zoom=PDF_FULL_ZOOM)), use_container_width=True)
 
 
 # ── Page title ─────────────────────────────────────────────────────────────────
@@ -391,19 +421,16 @@ view_mode = st.sidebar.radio(
     [
         "EY25 Scholar March-May Engagement, Interventions, and Predictions",
         "Individual Student Data - EY25",
+        "Cohort Engagement - EY25",
     ],
     label_visibility="visible",
 )
+show_perf = st.sidebar.checkbox("Performance", value=False, help="Show how long each section of this page took.")
 
 # Student roster reference (collapsed expander) — hidden on programming/partner pages
 if view_mode not in ("EY 26 Programming", "EY25 Summer Retester Cohort"):
-    roster_path = None
-    for path in ['roster.csv', './roster.csv']:
-        if os.path.exists(path):
-            roster_path = path
-            break
-    if roster_path:
-        roster_df_ref = pd.read_csv(roster_path)
+    roster_df_ref = load_dataset('roster')
+    if roster_df_ref is not None:
         with st.expander("Student roster (reference)", expanded=False):
             display_cols = {'student_id': 'Student ID'}
             if 'display_name' in roster_df_ref.columns:
@@ -413,55 +440,21 @@ if view_mode not in ("EY 26 Programming", "EY25 Summer Retester Cohort"):
                 use_container_width=True,
                 hide_index=True
             )
+perf.lap('page setup, roster')
 
 # ══════════════════════════════════════════════════════════════════════════════
 # VIEW: Individual Student Data - EY25
 # ══════════════════════════════════════════════════════════════════════════════
 if view_mode == "Individual Student Data - EY25":
-    data_paths = [
-        '',
-        'TJEY25/',
-        './TJEY25/',
-        'student-data/',
-        './student-data/',
-        'student_data/',
-        './student_data/',
-    ]
-
-    individual_data_available = False
-    test_data_available = False
-    base_path_used = None
+    from student_charts import student_chart  # imports altair: charting libraries load with the first view that draws charts
 
-    for base_path in data_paths:
-        try:
-            engagement_path = f'{base_path}institution-1-engagement-data.csv'
-            if not os.path.exists(engagement_path):
-                continue
-            df_engagement_attendance = pd.read_csv(engagement_path, parse_dates=['start_date', 'end_date'])
-            individual_data_available = True
-            base_path_used = base_path
-            test_path = f'{base_path}institution-1-test-data.csv'
-            if os.path.exists(test_path):
-                df_test_scores = pd.read_csv(test_path, parse_dates=['test_date'])
-                df_test_scores['test_date'] = pd.to_datetime(df_test_scores['test_date']).dt.date
-                test_data_available = True
-            else:
-                df_test_scores = None
-            break
-        except Exception:
-            continue
+    # Per-student indexes: one groupby per file version, then O(1) lookups per selection
+    df_engagement_attendance, engagement_by_student = engagement_index()
+    individual_data_available = df_engagement_attendance is not None
 
-    if individual_data_available and not test_data_available:
-        for base_path in data_paths:
-            test_path = f'{base_path}institution-1-test-data.csv'
-            try:
-                if os.path.exists(test_path):
-                    df_test_scores = pd.read_csv(test_path, parse_dates=['test_date'])
-                    df_test_scores['test_date'] = pd.to_datetime(df_test_scores['test_date']).dt.date
-                    test_data_available = True
-                    break
-            except Exception:
-                continue
+    df_test_scores, tests_by_student = test_index()
+    test_data_available = df_test_scores is not None
+    perf.lap('load engagement/test indexes', rows=row_count(df_engagement_attendance))
 
     if not individual_data_available:
         st.error("**Individual Student Dashboard Data Not Found**")
@@ -476,21 +469,10 @@ if view_mode == "Individual Student Data - EY25":
             pass
 
     if individual_data_available:
-        student_id = st.selectbox("Choose a student:", list(df_engagement_attendance['student_id'].unique()))
-
         st.markdown("**Surveys & resources:**")
         st.markdown("- [Texas JAMP Scholars | MCAT Exam Schedule & Scores Survey](https://docs.google.com/spreadsheets/d/10YBmWD7qFD0fjbD-8TK1gxNMVpwJyTLtOFtT1huh-FI/edit?usp=sharing)")
         st.write(' ')
 
-        tier_df = None
-        for path in ['tier.csv', './tier.csv']:
-            try:
-                if os.path.exists(path):
-                    tier_df = pd.read_csv(path)
-                    break
-            except Exception:
-                continue
-
         st.markdown("**Tier definitions**")
         st.markdown("""
         <div class="tier-flex">
@@ -516,240 +498,234 @@ if view_mode == "Individual Student Data - EY25":
         """, unsafe_allow_html=True)
         st.write(' ')
 
-        jfd_df = load_jfd_data()
-        tier_cols = ['survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier']
-        if jfd_df is not None and 'student_id' in jfd_df.columns:
-            jfd_student = jfd_df[jfd_df['student_id'] == student_id]
-            if not jfd_student.empty:
-                display_tier_cols = [c for c in tier_cols if c in jfd_student.columns]
-                if display_tier_cols:
-                    tier_table = jfd_student[['student_id'] + display_tier_cols].head(1)
-                    tier_table.columns = ['Student ID'] + [c.replace('_', ' ').title() for c in display_tier_cols]
-                    st.markdown("**Tiers (text)**")
-                    st.dataframe(tier_table, use_container_width=True, hide_index=True)
-                    st.write(' ')
-
-        df_engagement_attendance_student_filtered = df_engagement_attendance[
-            df_engagement_attendance['student_id'] == student_id
-        ].copy()
-        df_engagement_attendance_student_filtered['date_range'] = df_engagement_attendance_student_filtered.apply(
-            lambda row: f"{row['start_date'].strftime('%m/%d/%y')} - {row['end_date'].strftime('%m/%d/%y')}", axis=1
-        )
+        tier_df, tiers_by_student = tier_index()
+
+        # Only this part reruns when another student is picked; the indexes above are reused
+        @st.fragment
+        def student_section():
+            # A fragment rerun happens after the full run's timer was written: time it on its own
+            timer = SectionTimer() if perf.written else perf
+            student_id = st.selectbox("Choose a student:", list(engagement_by_student))
+
+            jfd_df = load_jfd_data()
+            tier_cols = ['survey_tier', 'large_group_tier', 'small_group_tier', 'class_participation_tier']
+            if jfd_df is not None and 'student_id' in jfd_df.columns:
+                jfd_student = student_rows(load_jfd_index(), jfd_df, student_id)
+                if not jfd_student.empty:
+                    display_tier_cols = [c for c in tier_cols if c in jfd_student.columns]
+                    if display_tier_cols:
+                        tier_table = jfd_student[['student_id'] + display_tier_cols].head(1)
+                        tier_table.columns = ['Student ID'] + [c.replace('_', ' ').title() for c in display_tier_cols]
+                        st.markdown("**Tiers (text)**")
+                        st.dataframe(tier_table, use_container_width=True, hide_index=True)
+                        st.write(' ')
+
+            df_engagement_attendance_student_filtered = student_rows(
+                engagement_by_student, df_engagement_attendance, student_id
+            )
 
-        for col in ['num_attended_large_session', 'num_scheduled_large_session',
-                    'num_attended_small_session', 'num_scheduled_small_session']:
-            if col in df_engagement_attendance_student_filtered.columns:
-                df_engagement_attendance_student_filtered[col] = pd.to_numeric(
-                    df_engagement_attendance_student_filtered[col], errors='coerce'
-                ).fillna(0)
-
-        denom_lg = df_engagement_attendance_student_filtered['num_scheduled_large_session'].replace(0, np.nan)
-        denom_sm = df_engagement_attendance_student_filtered['num_scheduled_small_session'].replace(0, np.nan)
-        df_engagement_attendance_student_filtered['large_session'] = (
-            df_engagement_attendance_student_filtered['num_attended_large_session'] / denom_lg
-        )
-        df_engagement_attendance_student_filtered['small_session'] = (
-            df_engagement_attendance_student_filtered['num_attended_small_session'] / denom_sm
-        )
+            if test_data_available:
+                df_test_scores_student_filtered = student_rows(tests_by_student, df_test_scores, student_id)
+            else:
+                df_test_scores_student_filtered = None
+            timer.lap('tiers, student slice', rows=len(df_engagement_attendance_student_filtered))
 
-        if test_data_available:
-            df_test_scores_student_filtered = df_test_scores[df_test_scores['student_id'] == student_id]
-        else:
-            df_test_scores_student_filtered = None
+            st.write(' ')
+            st.write(' ')
 
-        st.write(' ')
-        st.write(' ')
+            # Tier showcase buttons
+            def tier_button_color(tier_str):
+                if not tier_str or tier_str == "—" or "No " in str(tier_str):
+                    return "#9E9E9E"
+                if "Tier 1" in str(tier_str):
+                    return "#4CAF50"
+                if "Tier 2" in str(tier_str):
+                    return "#FF9800"
+                return "#EF5350"
+
+            if tier_df is not None and not tier_df.empty:
+                student_tier = student_rows(tiers_by_student, tier_df, student_id)
+                # Every window in tier.csv (build_tier_csv.py --windows), in file order
+                tier_windows = list(dict.fromkeys(tier_df['date_window']))
+
+                def get_tier_val(df_window, col):
+                    if df_window.empty or col not in df_window.columns:
+                        return "—"
+                    val = df_window.iloc[0][col]
+                    return val if pd.notna(val) else "—"
+
+                per_row = min(4, len(tier_windows))
+                for start in range(0, len(tier_windows), per_row):
+                    for col_w, window in zip(st.columns(per_row), tier_windows[start:start + per_row]):
+                        df_window = student_tier[student_tier['date_window'] == window]
+                        lg = get_tier_val(df_window, 'large_group_tier')
+                        sm = get_tier_val(df_window, 'small_group_tier')
+                        with col_w:
+                            st.markdown(f"**{TIER_WINDOW_DISPLAY.get(window, window)}**")
+                            st.markdown(f"""
+                    <div class="tier-button-block">
+                      <div class="tier-button-label">Large Group Attendance</div>
+                      <div class="tier-button" style="background:{tier_button_color(lg)}">{lg}</div>
+                    </div>
+                    <div class="tier-button-block">
+                      <div class="tier-button-label">Small Group Attendance</div>
+                      <div class="tier-button" style="background:{tier_button_color(sm)}">{sm}</div>
+                    </div>
+                    """, unsafe_allow_html=True)
+                st.write(' ')
+
+            # Practice Exam Scores
+            if test_data_available and df_test_scores_student_filtered is not None and not df_test_scores_student_filtered.empty:
+                st.subheader('8 Exams are Required for the JW MCAT Course, 4 Are Due by December 31, 2025')
+                st.write('Students were asked to update us with practice exam schedules and scores throughout the program.')
+                st.write(' ')
+                exam_display = df_test_scores_student_filtered[['test_name', 'test_date', 'actual_exam_score']].copy()
+                st.dataframe(exam_display, use_container_width=True)
+                st.write(' ')
+
+                spec, data = student_chart('exam_scores', student_id, df_test_scores_student_filtered)
+                st.vega_lite_chart(data, spec, use_container_width=True)
+                timer.lap('chart: practice exam scores', rows=len(data))
+                st.write(' ')
+            elif test_data_available:
+                st.info('No practice exam records for this student.')
+                st.write(' ')
+
+            # Attendance
+            st.header('Attendance')
+            _att_max = df_engagement_attendance_student_filtered['end_date'].max() if not df_engagement_attendance_student_filtered.empty else None
+            _att_through = _att_max.strftime('%B %d, %Y') if _att_max is not None and hasattr(_att_max, 'strftime') else '—'
+            st.caption(f'Updated through {_att_through}.')
+            st.write(
+                'Below demonstrates the weekly percentage of attendance by students within our "All Student" and "Small Group" classes.\n\n'
+                'For example, if there are two large classes and a student attends one of them, they would receive a 50% attendance rate for that week. '
+                'A data point with 0% indicates no attendance during that week, while the absence of a data point reflects that no classes were held that week.'
+            )
+            st.write(' ')
 
-        # Tier showcase buttons
-        def tier_button_color(tier_str):
-            if not tier_str or tier_str == "—" or "No " in str(tier_str):
-                return "#9E9E9E"
-            if "Tier 1" in str(tier_str):
-                return "#4CAF50"
-            if "Tier 2" in str(tier_str):
-                return "#FF9800"
-            return "#EF5350"
-
-        if tier_df is not None and not tier_df.empty:
-            student_tier = tier_df[tier_df['student_id'] == student_id]
-            jun_dec = student_tier[student_tier['date_window'] == 'Jun-Dec 2025'] if not student_tier.empty else pd.DataFrame()
-            jan_cur = student_tier[student_tier['date_window'] == 'Jan 2026-Current'] if not student_tier.empty else pd.DataFrame()
-
-            def get_tier_val(df_window, col):
-                if df_window.empty or col not in df_window.columns:
-                    return "—"
-                val = df_window.iloc[0][col]
-                return val if pd.notna(val) else "—"
-
-            lg_jd = get_tier_val(jun_dec, 'large_group_tier')
-            sm_jd = get_tier_val(jun_dec, 'small_group_tier')
-            lg_jc = get_tier_val(jan_cur, 'large_group_tier')
-            sm_jc = get_tier_val(jan_cur, 'small_group_tier')
-
-            col_a, col_b = st.columns(2)
-            with col_a:
-                st.markdown("**Jun–Dec 2025**")
-                st.markdown(f"""
-                <div class="tier-button-block">
-                  <div class="tier-button-label">Large Group Attendance</div>
-                  <div class="tier-button" style="background:{tier_button_color(lg_jd)}">{lg_jd}</div>
-                </div>
-                <div class="tier-button-block">
-                  <div class="tier-button-label">Small Group Attendance</div>
-                  <div class="tier-button" style="background:{tier_button_color(sm_jd)}">{sm_jd}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            with col_b:
-                st.markdown("**Jan 2026–Current**")
-                st.markdown(f"""
-                <div class="tier-button-block">
-                  <div class="tier-button-label">Large Group Attendance</div>
-                  <div class="tier-button" style="background:{tier_button_color(lg_jc)}">{lg_jc}</div>
-                </div>
-                <div class="tier-button-block">
-                  <div class="tier-button-label">Small Group Attendance</div>
-                  <div class="tier-button" style="background:{tier_button_color(sm_jc)}">{sm_jc}</div>
-                </div>
-                """, unsafe_allow_html=True)
+            spec, data = student_chart('attendance', student_id, df_engagement_attendance_student_filtered)
+            st.vega_lite_chart(data, spec, use_container_width=True)
+            timer.lap('chart: attendance', rows=len(data))
             st.write(' ')
 
-        # Practice Exam Scores
-        if test_data_available and df_test_scores_student_filtered is not None and not df_test_scores_student_filtered.empty:
-            st.subheader('8 Exams are Required for the JW MCAT Course, 4 Are Due by December 31, 2025')
-            st.write('Students were asked to update us with practice exam schedules and scores throughout the program.')
+            df_through_week_29 = df_engagement_attendance_student_filtered[
+                df_engagement_attendance_student_filtered['week'] <= THROUGH_WEEK
+            ]
+            _w29_max = df_through_week_29['end_date'].max() if not df_through_week_29.empty else None
+            _w29_through = _w29_max.strftime('%B %d, %Y') if _w29_max is not None and hasattr(_w29_max, 'strftime') else '—'
+
+            # Completed Question Sets
+            st.header('Completed Question Sets')
+            st.caption(f'Updated through {_w29_through}.')
+            st.write('This graph displays the number of question sets completed within our question bank per week.')
             st.write(' ')
-            exam_display = df_test_scores_student_filtered[['test_name', 'test_date', 'actual_exam_score']].copy()
-            st.dataframe(exam_display, use_container_width=True)
+
+            spec, data = student_chart('question_sets', student_id, df_engagement_attendance_student_filtered)
+            st.vega_lite_chart(data, spec, use_container_width=True)
+            timer.lap('chart: question sets', rows=len(data))
             st.write(' ')
 
-            point_exam_scores = alt.Chart(df_test_scores_student_filtered).mark_point().transform_fold(
-                fold=['actual_exam_score'],
-                as_=['variable', 'value']
-            ).encode(
-                x=alt.X('yearmonthdate(test_date):O', axis=alt.Axis(labelAngle=-45, title='Test Date')),
-                y=alt.Y('value:Q', axis=alt.Axis(title='Practice Exam Score'), scale=alt.Scale(domain=[470, 528])),
-                tooltip=[
-                    alt.Tooltip('test_date:T', title='Test Date'),
-                    alt.Tooltip('value:Q', title='Exam Score')
-                ],
-                color=alt.Color('variable:N', legend=alt.Legend(
-                    title='Exam Scores', orient='bottom',
-                    labelExpr="'Practice Exam Score'"
-                ))
+            # Accuracy
+            st.header('Accuracy')
+            st.subheader('Average Accuracy (%) on Question Sets Per Week')
+            st.caption(f'Updated through {_w29_through}.')
+            st.write(
+                'During Session Practice: "In-Class Questions" refer to accuracy for question sets given during class.\n\n'
+                'Self-Learning Practice: "CARS Questions" and "Science Questions" refer to weekly performance on independent practice sets.'
             )
-            st.altair_chart(point_exam_scores, use_container_width=True)
             st.write(' ')
-        elif test_data_available:
-            st.info('No practice exam records for this student.')
+
+            spec, data = student_chart('accuracy', student_id, df_engagement_attendance_student_filtered)
+            st.vega_lite_chart(data, spec, use_container_width=True)
+            timer.lap('chart: accuracy', rows=len(data))
             st.write(' ')
 
-        # Attendance
-        st.header('Attendance')
-        _att_max = df_engagement_attendance_student_filtered['end_date'].max() if not df_engagement_attendance_student_filtered.empty else None
-        _att_through = _att_max.strftime('%B %d, %Y') if _att_max is not None and hasattr(_att_max, 'strftime') else '—'
-        st.caption(f'Updated through {_att_through}.')
-        st.write(
-            'Below demonstrates the weekly percentage of attendance by students within our "All Student" and "Small Group" classes.\n\n'
-            'For example, if there are two large classes and a student attends one of them, they would receive a 50% attendance rate for that week. '
-            'A data point with 0% indicates no attendance during that week, while the absence of a data point reflects that no classes were held that week.'
-        )
-        st.write(' ')
+            # Completed Lessons
+            st.header('Completed Lessons')
+            st.subheader('Self-Learning with Jack Westin Course or Question Bank')
+            st.caption(f'Updated through {_w29_through}.')
+            st.write('This graph displays the number of video lessons or assignments within the Self-Paced JW Complete MCAT Course completed per week.')
+            st.write(' ')
 
-        line_attendance = alt.Chart(df_engagement_attendance_student_filtered).mark_line(point=True).transform_fold(
-            fold=['large_session', 'small_session'],
-            as_=['variable', 'value']
-        ).encode(
-            x=alt.X('week:O', axis=alt.Axis(labelAngle=0, title='Week')),
-            y=alt.Y('value:Q', axis=alt.Axis(title='Weekly Attendance Rate', format='%'), scale=alt.Scale(domain=[0, 1])),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Weekly Attendance Rate', format='0.0%')
-            ],
-            color=alt.Color('variable:N', legend=alt.Legend(
-                title='Session Type', orient='bottom',
-                labelExpr="datum.value == 'large_session' ? 'Classes with All Students' : 'Small Group Sessions'"
-            ))
-        )
-        st.altair_chart(line_attendance, use_container_width=True)
-        st.write(' ')
+            spec, data = student_chart('lessons', student_id, df_engagement_attendance_student_filtered)
+            st.vega_lite_chart(data, spec, use_container_width=True)
+            timer.lap('chart: completed lessons', rows=len(data))
+            if timer is not perf:
+                timer.write_log(view_mode, fragment='student')
 
-        df_through_week_29 = df_engagement_attendance_student_filtered[
-            df_engagement_attendance_student_filtered['week'] <= 29
-        ]
-        _w29_max = df_through_week_29['end_date'].max() if not df_through_week_29.empty else None
-        _w29_through = _w29_max.strftime('%B %d, %Y') if _w29_max is not None and hasattr(_w29_max, 'strftime') else '—'
+        student_section()
 
-        # Completed Question Sets
-        st.header('Completed Question Sets')
-        st.caption(f'Updated through {_w29_through}.')
-        st.write('This graph displays the number of question sets completed within our question bank per week.')
-        st.write(' ')
+# ══════════════════════════════════════════════════════════════════════════════
+# VIEW: Cohort Engagement - EY25
+# ══════════════════════════════════════════════════════════════════════════════
+elif view_mode == "Cohort Engagement - EY25":
+    import plotly.express as px
+
+    st.header("Cohort Engagement - EY25")
+    st.write(
+        "Weekly attendance and completed question sets across the whole cohort. Each row is a band of students "
+        "from the same group, ordered within the group by their value over the weeks shown (highest first); "
+        "in a large cohort neighbouring students (and weeks) are combined so the chart stays readable."
+    )
+    st.write(" ")
 
-        line_question_sets = alt.Chart(df_through_week_29).mark_line(point=True).encode(
-            x=alt.X('week:O', axis=alt.Axis(labelAngle=0, title='Week')),
-            y=alt.Y('total_completed_passages_discrete_sets', axis=alt.Axis(title='Completed Number of Question Sets')),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('total_completed_passages_discrete_sets', title='Completed Count')
-            ]
-        )
-        st.altair_chart(line_question_sets, use_container_width=True)
-        st.write(' ')
+    engagement_df = load_dataset('engagement')
+    perf.lap('CSV loads', rows=row_count(engagement_df))
 
-        # Accuracy
-        st.header('Accuracy')
-        st.subheader('Average Accuracy (%) on Question Sets Per Week')
-        st.caption(f'Updated through {_w29_through}.')
-        st.write(
-            'During Session Practice: "In-Class Questions" refer to accuracy for question sets given during class.\n\n'
-            'Self-Learning Practice: "CARS Questions" and "Science Questions" refer to weekly performance on independent practice sets.'
-        )
-        st.write(' ')
+    if engagement_df is None or engagement_df.empty:
+        st.info("The cohort view requires `institution-1-engagement-data.csv`.")
+    else:
+        # Prefix sums per student and week, built once per file version
+        tensor = engagement_tensor(engagement_df)
+        perf.lap('engagement tensor', rows=len(tensor.students))
+
+        c1, c2, c3 = st.columns(3)
+        metric = c1.selectbox("Metric", list(HEATMAP_METRICS), key='cohort_metric')
+        sort_by = c2.radio("Group students by", COHORT_SORTS, horizontal=True, key='cohort_sort')
+        tier_df = load_dataset('tier')
+        tier_window = DEFAULT_TIER_WINDOW
+        if sort_by == COHORT_SORTS[0] and tier_df is not None and not tier_df.empty:
+            # Same tiers as the badges in the other views: tier.csv, one date window
+            windows = list(dict.fromkeys(tier_df['date_window']))
+            tier_window = c3.selectbox(
+                "Tier window", windows, index=windows.index(DEFAULT_TIER_WINDOW) if DEFAULT_TIER_WINDOW in windows else 0,
+                key='cohort_tier_window',
+            )
 
-        line_engagement_accuracy = alt.Chart(df_through_week_29).mark_line(point=True).transform_fold(
-            fold=['sciences_accuracy', 'cars_accuracy', 'class_accuracy'],
-            as_=['variable', 'value']
-        ).encode(
-            x=alt.X('week:O', axis=alt.Axis(labelAngle=0, title='Week')),
-            y=alt.Y('value:Q', axis=alt.Axis(title='Average Accuracy (%)', format='%')),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Accuracy Rate', format='0.1%')
-            ],
-            color=alt.Color('variable:N', legend=alt.Legend(
-                title='Subject', orient='bottom',
-                labelExpr="datum.value == 'cars_accuracy' ? 'CARS Questions' : datum.value == 'class_accuracy' ? 'In-Class Questions' : 'Science Questions'"
-            ))
-        )
-        st.altair_chart(line_engagement_accuracy, use_container_width=True)
-        st.write(' ')
+        groups = cohort_groups(tensor, sort_by, load_dataset('test'), tier_df, tier_window)
+        # Question sets are shown through THROUGH_WEEK, as on the per-student charts
+        last_week = THROUGH_WEEK if metric == 'Completed question sets' else None
+        matrix, bands = cohort_heatmap(tensor, metric, groups, last_week=last_week)
+        perf.lap('cohort heatmap', rows=matrix.size)
 
-        # Completed Lessons
-        st.header('Completed Lessons')
-        st.subheader('Self-Learning with Jack Westin Course or Question Bank')
-        st.caption(f'Updated through {_w29_through}.')
-        st.write('This graph displays the number of video lessons or assignments within the Self-Paced JW Complete MCAT Course completed per week.')
-        st.write(' ')
+        st.caption(" · ".join(f"{group}: {n} students" for group, n in groups.value_counts(sort=False).items() if n))
 
-        line_engagement = alt.Chart(df_through_week_29).mark_line(point=True).transform_fold(
-            ['completed_lessons'], as_=['variable', 'value']
-        ).encode(
-            x=alt.X('week:O', axis=alt.Axis(labelAngle=0, title='Week')),
-            y=alt.Y('value:Q', axis=alt.Axis(title='Completed Count')),
-            tooltip=[
-                alt.Tooltip('week:O', title='Week'),
-                alt.Tooltip('date_range:N', title='Date Range'),
-                alt.Tooltip('value:Q', title='Completed Number of Lessons')
-            ],
-            color=alt.Color('variable:N', legend=alt.Legend(
-                title='Type', orient='bottom',
-                labelExpr="'Completed Course Lessons'"
-            ))
-        )
-        st.altair_chart(line_engagement, use_container_width=True)
+        if matrix.empty:
+            st.info("No engagement weeks to show.")
+        else:
+            is_rate = HEATMAP_METRICS[metric][1] is not None
+            fig_heatmap = px.imshow(
+                matrix.round(3),
+                aspect='auto',
+                color_continuous_scale='RdYlGn' if is_rate else 'Blues',
+                zmin=0,
+                zmax=1 if is_rate else None,
+                labels={'x': 'Week', 'y': 'Students', 'color': 'Attendance' if is_rate else 'Question sets'},
+            )
+            fig_heatmap.update_traces(
+                hovertemplate='Students %{y}<br>Week %{x}<br>' + ('%{z:.0%}' if is_rate else '%{z:.1f} per week') + '<extra></extra>'
+            )
+            fig_heatmap.update_xaxes(type='category')
+            fig_heatmap.update_yaxes(type='category')
+            if is_rate:
+                fig_heatmap.update_layout(coloraxis_colorbar=dict(tickformat='.0%'))
+            # White rule between groups
+            for row in (bands['group'] != bands['group'].shift()).to_numpy().nonzero()[0][1:]:
+                fig_heatmap.add_hline(y=row - 0.5, line_color='white', line_width=3)
+            fig_heatmap.update_layout(height=max(400, 12 * len(matrix)), margin={'t': 30})
+            fig_heatmap = apply_light_mode_styling(fig_heatmap)
+            st.plotly_chart(fig_heatmap, use_container_width=True)
+            perf.lap('chart: cohort heatmap', rows=matrix.size)
 
 # ══════════════════════════════════════════════════════════════════════════════
 # VIEW: EY25 Summer Retester Cohort
@@ -824,15 +800,8 @@ elif view_mode == "EY25 Summer Retester Cohort":
         st.write(" ")
         st.subheader("Retaker cohort calendar")
         try:
-            import fitz
-            doc = fitz.open(EY25_SUMMER_PDF)
-            for i in range(len(doc)):
-                page = doc.load_page(i)
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_bytes = pix.tobytes("png")
-                st.image(io.BytesIO(img_bytes), use_container_width=True)
-            doc.close()
+            render_pdf_viewer(EY25_SUMMER_PDF, key='ey25_summer_pdf_page')
+            perf.lap('calendar PDF')
         except Exception:
             st.caption("PDF available in app assets; enable PyMuPDF to view.")
     st.write(" ")
@@ -841,35 +810,15 @@ elif view_mode == "EY25 Summer Retester Cohort":
 # VIEW: Current Status EY25
 # ══════════════════════════════════════════════════════════════════════════════
 elif view_mode == "Current Status EY25":
+    import plotly.express as px
+
     st.header("Current Status EY25")
     st.write(" ")
 
-    tier_df = None
-    for path in ['tier.csv', './tier.csv']:
-        try:
-            if os.path.exists(path):
-                tier_df = pd.read_csv(path)
-                break
-        except Exception:
-            continue
-
-    test_df = None
-    for path in ['institution-1-test-data.csv', './institution-1-test-data.csv', 'student-data/institution-1-test-data.csv']:
-        try:
-            if os.path.exists(path):
-                test_df = pd.read_csv(path, parse_dates=['test_date'])
-                break
-        except Exception:
-            continue
-
-    engagement_df = None
-    for path in ['institution-1-engagement-data.csv', './institution-1-engagement-data.csv', 'student-data/institution-1-engagement-data.csv']:
-        try:
-            if os.path.exists(path):
-                engagement_df = pd.read_csv(path, parse_dates=['start_date', 'end_date'])
-                break
-        except Exception:
-            continue
+    tier_df = load_dataset('tier')
+    test_df = load_dataset('test')
+    engagement_df = load_dataset('engagement', columns=['student_id'])
+    perf.lap('CSV loads', rows=row_count(test_df))
 
     has_tier = tier_df is not None and not tier_df.empty
     has_test = test_df is not None and not test_df.empty
@@ -890,94 +839,8 @@ elif view_mode == "Current Status EY25":
     st.write(" ")
 
     if has_test and not test_df.empty:
-        test_df['actual_exam_score'] = pd.to_numeric(test_df['actual_exam_score'], errors='coerce')
-        first_attempt_designated = test_df[
-            (test_df['test_name'] == 'First Attempt') &
-            test_df['actual_exam_score'].notna() &
-            (test_df['actual_exam_score'] > 0)
-        ]
-        if first_attempt_designated.empty:
-            first_attempt = pd.DataFrame(columns=['student_id', 'first_attempt_date', 'first_attempt_score'])
-        else:
-            first_attempt = first_attempt_designated.groupby('student_id').first().reset_index()[
-                ['student_id', 'test_date', 'actual_exam_score']
-            ]
-            first_attempt = first_attempt.rename(columns={
-                'actual_exam_score': 'first_attempt_score',
-                'test_date': 'first_attempt_date'
-            })
-
-        first_attempt['first_attempt_score_clean'] = pd.to_numeric(
-            first_attempt['first_attempt_score'], errors='coerce'
-        )
-        first_attempt = first_attempt[
-            first_attempt['first_attempt_score_clean'].notna() &
-            (first_attempt['first_attempt_score_clean'] >= 472) &
-            (first_attempt['first_attempt_score_clean'] <= 528)
-        ]
-
-        def outcome_label(score):
-            if score >= 502:
-                return 'Passed'
-            elif score >= 495:
-                return 'Borderline'
-            else:
-                return 'Below 495'
-
-        first_attempt['first_attempt_outcome'] = first_attempt['first_attempt_score_clean'].apply(outcome_label)
-
-        # Exam tier from practice exam count
-        practice_scores = test_df[
-            (test_df['test_name'] != 'First Attempt') &
-            (test_df['test_name'] != 'Second Exam Attempt') &
-            (test_df['test_name'] != 'Anticipated Test Date') &
-            (test_df['test_name'] != 'Anticipated Exam Date') &
-            pd.to_numeric(test_df['actual_exam_score'], errors='coerce').between(472, 528)
-        ]
-        exam_counts = practice_scores.groupby('student_id').size().reset_index(name='exam_count')
-        first_attempt = first_attempt.merge(exam_counts, on='student_id', how='left')
-        first_attempt['exam_count'] = first_attempt['exam_count'].fillna(0).astype(int)
-
-        def exam_tier_label(n):
-            if n > 5:
-                return 'Tier 1'
-            elif n >= 3:
-                return 'Tier 2'
-            else:
-                return 'Tier 3'
-
-        first_attempt['exam_tier'] = first_attempt['exam_count'].apply(exam_tier_label)
-
-        # Attendance tiers from tier.csv
-        if has_tier:
-            tier_recent = tier_df[tier_df['date_window'] == 'Jan 2026-Current']
-            tier_jd = tier_df[tier_df['date_window'] == 'Jun-Dec 2025']
-            lg_recent = tier_recent[['student_id', 'large_group_tier', 'small_group_tier']].rename(
-                columns={'large_group_tier': 'large_group_tier', 'small_group_tier': 'small_group_tier'}
-            )
-            lg_jd = tier_jd[['student_id', 'large_group_tier', 'small_group_tier']].rename(
-                columns={'large_group_tier': 'large_group_tier_JunDec', 'small_group_tier': 'small_group_tier_JunDec'}
-            )
-            first_attempt = first_attempt.merge(lg_recent, on='student_id', how='left')
-            first_attempt = first_attempt.merge(lg_jd, on='student_id', how='left')
-            for col in ['large_group_tier', 'small_group_tier', 'large_group_tier_JunDec', 'small_group_tier_JunDec']:
-                if col in first_attempt.columns:
-                    first_attempt[col] = first_attempt[col].fillna('No data')
-        else:
-            first_attempt['large_group_tier'] = '—'
-            first_attempt['small_group_tier'] = '—'
-            first_attempt['large_group_tier_JunDec'] = '—'
-            first_attempt['small_group_tier_JunDec'] = '—'
-
-        first_attempt['attendance_tier_1_or_2'] = (
-            first_attempt['large_group_tier'].isin(['Tier 1', 'Tier 2']) &
-            first_attempt['small_group_tier'].isin(['Tier 1', 'Tier 2'])
-        )
-        first_attempt['exam_tier_1_or_2'] = first_attempt['exam_tier'].isin(['Tier 1', 'Tier 2'])
-        passed = first_attempt['first_attempt_outcome'] == 'Passed'
-        tier12_att_or_exam = first_attempt['attendance_tier_1_or_2'] | first_attempt['exam_tier_1_or_2']
-        n_passed = int(passed.sum())
-        n_passed_tier12 = int((passed & tier12_att_or_exam).sum())
+        first_attempt = first_attempt_outcomes(test_df, tier_df if has_tier else None)
+        perf.lap('first attempt outcomes', rows=len(first_attempt))
         outcome_counts = first_attempt['first_attempt_outcome'].value_counts()
 
         o1, o2, o3 = st.columns(3)
@@ -986,135 +849,88 @@ elif view_mode == "Current Status EY25":
                 st.metric(out, int(outcome_counts.get(out, 0)))
         st.write(" ")
 
-        outcome_order_top = ["Passed", "Borderline", "Below 495"]
-        outcome_for_chart_top = [o for o in outcome_order_top if o in outcome_counts.index]
-        counts_list_top = [int(outcome_counts.get(o, 0)) for o in outcome_for_chart_top]
-        if outcome_for_chart_top and sum(counts_list_top) > 0:
-            df_outcome_top = pd.DataFrame({"Outcome": outcome_for_chart_top, "Count": counts_list_top})
+        df_outcome_top = first_attempt_outcome_counts(first_attempt)
+        if not df_outcome_top.empty and df_outcome_top['Count'].sum() > 0:
             color_map_top = {"Passed": "#10b981", "Borderline": "#f59e0b", "Below 495": "#ef4444"}
             fig_outcome_top = px.bar(df_outcome_top, x="Outcome", y="Count", color="Outcome",
                 color_discrete_map=color_map_top, title="First Final Exam Score outcome (counts)")
             fig_outcome_top.update_layout(showlegend=False, xaxis_tickangle=-25)
             fig_outcome_top = apply_light_mode_styling(fig_outcome_top)
             st.plotly_chart(fig_outcome_top, use_container_width=True)
+            perf.lap('chart: first attempt outcomes')
         st.write(" ")
 
         # Borderline students
-        borderline = first_attempt[
-            (first_attempt['first_attempt_score_clean'] >= 495) &
-            (first_attempt['first_attempt_score_clean'] < 502)
-        ]
-        if not borderline.empty:
-            borderline_ids = borderline['student_id'].tolist()
-            test_valid = test_df[test_df['student_id'].isin(borderline_ids)].copy()
-            test_valid['actual_exam_score'] = pd.to_numeric(test_valid['actual_exam_score'], errors='coerce')
-            test_valid = test_valid[test_valid['actual_exam_score'].notna() & (test_valid['actual_exam_score'] > 0)]
-            first_scores = borderline.set_index('student_id')['first_attempt_score']
-            low_fa_high = []
-            for sid in borderline_ids:
-                rows = test_valid[test_valid['student_id'] == sid]
-                if rows.empty:
-                    continue
-                scores = rows['actual_exam_score'].values
-                low, high = float(scores.min()), float(scores.max())
-                fa = float(first_scores.loc[sid]) if sid in first_scores.index else np.nan
-                low_fa_high.append({'student_id': sid, 'Lowest': low, 'First Attempt': fa, 'Highest': high})
-            df_borderline_scores = pd.DataFrame(low_fa_high)
-            if not df_borderline_scores.empty:
-                st.subheader("Borderline students: baseline to score increase")
-                st.caption("Students whose **First Attempt** actual MCAT score is **495–501**.")
-                plot_df = df_borderline_scores[['student_id', 'Lowest', 'First Attempt', 'Highest']].copy()
-                plot_df = plot_df.rename(columns={'Lowest': 'Baseline', 'First Attempt': 'Actual'})
-                plot_ids = plot_df['student_id'].tolist()
-                plot_df['student_id'] = plot_df['student_id'].astype(str)
-                plot_df = plot_df.melt(id_vars=['student_id'], value_vars=['Baseline', 'Actual', 'Highest'],
-                                       var_name='Metric', value_name='Score')
-                fig_borderline = px.bar(plot_df, x='student_id', y='Score', color='Metric', barmode='group',
-                    title='Borderline students: baseline, actual (First Attempt), and highest score',
-                    color_discrete_map={'Baseline': '#94a3b8', 'Actual': '#f59e0b', 'Highest': '#10b981'},
-                    category_orders={'student_id': [str(i) for i in plot_ids]})
-                y_min = max(472, int(plot_df['Score'].min()) - 10)
-                y_max = min(528, int(plot_df['Score'].max()) + 10)
-                fig_borderline.update_layout(
-                    xaxis_title='Student ID',
-                    xaxis={'type': 'category', 'categoryorder': 'array', 'categoryarray': [str(i) for i in plot_ids]},
-                    yaxis={'title': 'Score', 'range': [y_min, y_max], 'dtick': 5},
-                    bargap=0.2, bargroupgap=0.02,
-                    legend={'orientation': 'h', 'yanchor': 'top', 'y': 0.99, 'xanchor': 'right', 'x': 0.99,
-                            'bgcolor': 'rgba(255,255,255,0.8)'},
-                    margin={'t': 100}
-                )
-                fig_borderline = apply_light_mode_styling(fig_borderline)
-                st.plotly_chart(fig_borderline, use_container_width=True)
+        df_borderline_scores = borderline_scores(first_attempt, test_df)
+        perf.lap('borderline scores', rows=len(df_borderline_scores))
+        if not df_borderline_scores.empty:
+            st.subheader("Borderline students: baseline to score increase")
+            st.caption("Students whose **First Attempt** actual MCAT score is **495–501**.")
+            plot_df = df_borderline_scores[['student_id', 'Lowest', 'First Attempt', 'Highest']].copy()
+            plot_df = plot_df.rename(columns={'Lowest': 'Baseline', 'First Attempt': 'Actual'})
+            plot_ids = plot_df['student_id'].tolist()
+            plot_df['student_id'] = plot_df['student_id'].astype(str)
+            plot_df = plot_df.melt(id_vars=['student_id'], value_vars=['Baseline', 'Actual', 'Highest'],
+                                   var_name='Metric', value_name='Score')
+            fig_borderline = px.bar(plot_df, x='student_id', y='Score', color='Metric', barmode='group',
+                title='Borderline students: baseline, actual (First Attempt), and highest score',
+                color_discrete_map={'Baseline': '#94a3b8', 'Actual': '#f59e0b', 'Highest': '#10b981'},
+                category_orders={'student_id': [str(i) for i in plot_ids]})
+            y_min = max(472, int(plot_df['Score'].min()) - 10)
+            y_max = min(528, int(plot_df['Score'].max()) + 10)
+            fig_borderline.update_layout(
+                xaxis_title='Student ID',
+                xaxis={'type': 'category', 'categoryorder': 'array', 'categoryarray': [str(i) for i in plot_ids]},
+                yaxis={'title': 'Score', 'range': [y_min, y_max], 'dtick': 5},
+                bargap=0.2, bargroupgap=0.02,
+                legend={'orientation': 'h', 'yanchor': 'top', 'y': 0.99, 'xanchor': 'right', 'x': 0.99,
+                        'bgcolor': 'rgba(255,255,255,0.8)'},
+                margin={'t': 100}
+            )
+            fig_borderline = apply_light_mode_styling(fig_borderline)
+            st.plotly_chart(fig_borderline, use_container_width=True)
+            perf.lap('chart: borderline students', rows=len(plot_df))
         st.write(" ")
 
         # Score improvement frequency
-        test_valid_all = test_df[
-            pd.to_numeric(test_df['actual_exam_score'], errors='coerce').between(472, 528)
-        ].copy()
-        test_valid_all['actual_exam_score'] = pd.to_numeric(test_valid_all['actual_exam_score'], errors='coerce')
-        score_range = test_valid_all.groupby('student_id')['actual_exam_score'].agg(['min', 'max'])
-        score_range['improvement'] = score_range['max'] - score_range['min']
-        improved_df = score_range[score_range['improvement'] > 0].reset_index()
-        improvements_1_30 = improved_df['improvement'][improved_df['improvement'].between(1, 30)]
-        if not improvements_1_30.empty:
+        df_freq = score_improvement(test_df)
+        perf.lap('score improvement', rows=len(df_freq))
+        if not df_freq.empty:
             st.subheader("Score improvement frequency")
             st.caption("Among students with 2+ valid scores: improvement = highest − lowest. X = points improved, Y = number of students.")
-            freq = improvements_1_30.value_counts().sort_index()
-            df_freq = freq.reset_index()
-            df_freq.columns = ['Points improved', 'Number of students']
             fig_freq = px.bar(df_freq, x='Points improved', y='Number of students',
                 title='Frequency of score improvement')
             fig_freq.update_layout(xaxis={'dtick': 1, 'range': [-0.5, 30.5]}, margin={'t': 80})
             fig_freq = apply_light_mode_styling(fig_freq)
             st.plotly_chart(fig_freq, use_container_width=True)
+            perf.lap('chart: score improvement')
         st.write(" ")
 
         # Test date distribution
-        attempt_df = test_df[test_df['test_name'].isin(['Anticipated Exam Date', 'Second Exam Attempt',
-                                                         'Anticipated Test Date'])].copy()
-        attempt_df['test_date'] = pd.to_datetime(attempt_df['test_date'], errors='coerce')
-        attempt_df = attempt_df.dropna(subset=['test_date'])
-        attempt_df['month_name'] = attempt_df['test_date'].dt.month_name()
-        month_order = ['January', 'February', 'March', 'April', 'May']
-        attempt_df = attempt_df[attempt_df['month_name'].isin(month_order)]
-
-        if not attempt_df.empty:
+        df_ant_stack, sa_counts = test_date_distribution(test_df)
+        perf.lap('test date distribution')
+        if df_ant_stack is not None or sa_counts is not None:
             st.subheader("Test date distribution: Anticipated Exam Date and Second Exam Attempt")
-            students_with_first_attempt = set(
-                test_df.loc[test_df['test_name'] == 'First Attempt', 'student_id'].dropna().astype(int)
-            )
             col1, col2 = st.columns(2)
-            ant_df = attempt_df[attempt_df['test_name'].isin(['Anticipated Exam Date', 'Anticipated Test Date'])]
-            sa_df = attempt_df[attempt_df['test_name'] == 'Second Exam Attempt']
             with col1:
-                if not ant_df.empty:
-                    stack_rows = []
-                    for month in month_order:
-                        month_students = ant_df[ant_df['month_name'] == month]
-                        ids_in_month = month_students['student_id'].dropna().astype(int).unique()
-                        reported = sum(1 for i in ids_in_month if i in students_with_first_attempt)
-                        not_reported = len(ids_in_month) - reported
-                        stack_rows.append({'Month': month, 'Segment': 'Reported exam score', 'Count': reported})
-                        stack_rows.append({'Month': month, 'Segment': 'Not reported', 'Count': not_reported})
-                    df_ant_stack = pd.DataFrame(stack_rows)
+                if df_ant_stack is not None:
                     fig_ant = px.bar(df_ant_stack, x='Month', y='Count', color='Segment', barmode='stack',
                         title='Anticipated Exam Date — by month (Jan–May)',
                         color_discrete_map={'Reported exam score': '#10b981', 'Not reported': '#94a3b8'})
                     fig_ant.update_layout(xaxis_tickangle=-25, yaxis_title='Number of students', margin={'t': 80})
                     fig_ant = apply_light_mode_styling(fig_ant)
                     st.plotly_chart(fig_ant, use_container_width=True)
+                    perf.lap('chart: anticipated exam dates')
             with col2:
-                if not sa_df.empty:
-                    sa_counts = sa_df.groupby('month_name').size().reset_index(name='Count')
-                    sa_counts = sa_counts[sa_counts['month_name'].isin(month_order)]
+                if sa_counts is not None:
                     fig_sa = px.bar(sa_counts, x='month_name', y='Count',
                         title='Second Exam Attempt — by month',
                         color_discrete_sequence=[BRAND_COLORS['secondary']],
-                        category_orders={'month_name': month_order})
+                        category_orders={'month_name': ['January', 'February', 'March', 'April', 'May']})
                     fig_sa.update_layout(xaxis_title='Month', xaxis_tickangle=-25, margin={'t': 80})
                     fig_sa = apply_light_mode_styling(fig_sa)
                     st.plotly_chart(fig_sa, use_container_width=True)
+                    perf.lap('chart: second exam attempts')
         st.write(" ")
 
         # Interventions
@@ -1130,69 +946,24 @@ elif view_mode == "Current Status EY25":
         """)
         st.write(" ")
 
-        interventions_path = None
-        for path in ['Interventions_initial.csv', './Interventions_initial.csv']:
-            if os.path.exists(path):
-                interventions_path = path
-                break
+        interventions_path = resolve_path('Interventions_initial.csv')
 
         if interventions_path:
-            with open(interventions_path, 'r', encoding='utf-8') as f:
-                lines = [line.rstrip() for line in f]
-            group_ids = {
-                'No reported practice scores': [],
-                'No anticipated exam date': [],
-                'Low attendance in classes': []
-            }
-            responded_ids = set()
-            current = None
-            for line in lines:
-                if 'Students with No Reported Practice Exam Scores' in line:
-                    current = 'No reported practice scores'
-                    continue
-                if 'Students with No Anticipated Exam Date' in line:
-                    current = 'No anticipated exam date'
-                    continue
-                if 'Tier 3 Students' in line:
-                    current = 'Low attendance in classes'
-                    continue
-                if current is None:
-                    continue
-                parts = [p.strip() for p in line.split(',')]
-                if not parts:
-                    continue
-                try:
-                    sid = int(parts[0])
-                    if sid > 0 and sid not in group_ids[current]:
-                        group_ids[current].append(sid)
-                    if current == 'Low attendance in classes':
-                        responded = (len(parts) > 2 and parts[2].upper() == 'TRUE') or \
-                                    (len(parts) > 3 and parts[3].upper() == 'TRUE')
-                    else:
-                        responded = len(parts) > 2 and parts[2].upper() == 'TRUE'
-                    if responded:
-                        responded_ids.add(sid)
-                except (ValueError, IndexError):
-                    continue
-
-            all_intervention_ids = set()
-            for ids in group_ids.values():
-                all_intervention_ids.update(ids)
-
-            n_total = len(all_intervention_ids)
-            n_responded = len(responded_ids & all_intervention_ids)
+            interventions = load_interventions(interventions_path)
+            summary = intervention_summary(interventions)
+            perf.lap('interventions parsing', rows=summary['total'])
 
             ic1, ic2, ic3 = st.columns(3)
             with ic1:
-                st.metric("Total intervened students", n_total)
+                st.metric("Total intervened students", summary['total'])
             with ic2:
-                st.metric("Responded to outreach", n_responded)
+                st.metric("Responded to outreach", summary['responded'])
             with ic3:
-                pct = f"{n_responded / n_total * 100:.0f}%" if n_total > 0 else "—"
-                st.metric("Response rate", pct)
+                rate = summary['response_rate']
+                st.metric("Response rate", f"{rate * 100:.0f}%" if rate is not None else "—")
             st.write(" ")
 
-            for group_name, ids in group_ids.items():
+            for group_name, ids in intervention_groups(interventions).items():
                 if ids:
                     st.markdown(f"**{group_name}** — {len(ids)} students")
         else:
@@ -1328,16 +1099,9 @@ elif view_mode == "EY 26 Programming":
     st.subheader("Calendars")
     if os.path.exists(EY26_PDF_PATH):
         try:
-            import fitz
-            doc = fitz.open(EY26_PDF_PATH)
-            st.caption("Scroll to view all pages.")
-            for i in range(len(doc)):
-                page = doc.load_page(i)
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img_bytes = pix.tobytes("png")
-                st.image(io.BytesIO(img_bytes), use_container_width=True)
-            doc.close()
+            st.caption("Pick a page below the thumbnails to view it at full size.")
+            render_pdf_viewer(EY26_PDF_PATH, key='ey26_pdf_page')
+            perf.lap('calendar PDF')
         except Exception as e:
             st.warning(f"Could not render PDF: {e}")
     else:
@@ -1348,6 +1112,8 @@ elif view_mode == "EY 26 Programming":
 # VIEW: EY25 Scholar March-May Engagement, Interventions, and Predictions
 # ══════════════════════════════════════════════════════════════════════════════
 elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predictions":
+    import plotly.express as px
+
     st.header("EY25 Scholar March-May Engagement, Interventions, and Predictions")
     st.write(" ")
 
@@ -1382,14 +1148,7 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     # Overall tier:     worst of the three above
 
     # ── Load convata_data.csv ──────────────────────────────────────────────────
-    convata_df = None
-    for path in ['convata_data.csv', './convata_data.csv', 'student-data/convata_data.csv']:
-        try:
-            if os.path.exists(path):
-                convata_df = pd.read_csv(path)
-                break
-        except Exception:
-            continue
+    convata_df = load_dataset('convata')
 
     if convata_df is None or convata_df.empty:
         st.info(
@@ -1399,152 +1158,39 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
         )
         st.stop()
 
-    # Clean and parse
-    convata_df = convata_df.dropna(subset=['Student ID'])
-    convata_df['Student ID'] = pd.to_numeric(convata_df['Student ID'], errors='coerce')
-    convata_df = convata_df[convata_df['Student ID'].notna()].copy()
-    convata_df['Student ID'] = convata_df['Student ID'].astype(int)
-
-    for col in ['Class Attendance', 'Class Participation', 'In-Class Accuracy']:
-        if col in convata_df.columns:
-            convata_df[col] = convata_df[col].astype(str).str.replace('%', '').str.strip()
-            convata_df[col] = pd.to_numeric(convata_df[col], errors='coerce').fillna(0) / 100
-
-    convata_df['First Attempt'] = pd.to_numeric(convata_df.get('First Attempt', pd.Series(dtype=float)), errors='coerce')
-
     # ── Load roster (optional, private) ───────────────────────────────────────
-    roster_df = None
-    for path in ['roster.csv', './roster.csv']:
-        try:
-            if os.path.exists(path):
-                roster_df = pd.read_csv(path)
-                roster_df = roster_df.dropna(subset=['Student id'])
-                roster_df['Student id'] = pd.to_numeric(roster_df['Student id'], errors='coerce')
-                roster_df = roster_df[roster_df['Student id'].notna()].copy()
-                roster_df['Student id'] = roster_df['Student id'].astype(int)
-                break
-        except Exception:
-            continue
-
-    # ── Load test data for exam counts ────────────────────────────────────────
-    test_df_c = None
-    for path in ['institution-1-test-data.csv', './institution-1-test-data.csv',
-                 'student-data/institution-1-test-data.csv']:
-        try:
-            if os.path.exists(path):
-                test_df_c = pd.read_csv(path)
-                break
-        except Exception:
-            continue
-
-    # ── Compute exam counts and highest practice score ─────────────────────────
-    highest_practice_map = {}
-    if test_df_c is not None and not test_df_c.empty:
-        practice_mask = (
-            ~test_df_c['test_name'].isin(['First Attempt', 'Second Exam Attempt',
-                                          'Anticipated Test Date', 'Anticipated Exam Date']) &
-            pd.to_numeric(test_df_c['actual_exam_score'], errors='coerce').between(472, 528)
-        )
-        practice_scores_c = test_df_c[practice_mask].copy()
-        practice_scores_c['actual_exam_score'] = pd.to_numeric(practice_scores_c['actual_exam_score'], errors='coerce')
-        highest_practice_map = practice_scores_c.groupby('student_id')['actual_exam_score'].max().apply(lambda x: str(int(x))).to_dict()
-
-        exam_counts_c = (
-            test_df_c[practice_mask]
-            .groupby('student_id')
-            .size()
-            .reset_index(name='exam_count')
-            .rename(columns={'student_id': 'Student ID'})
-        )
-        convata_df = convata_df.merge(exam_counts_c, on='Student ID', how='left')
-        convata_df['exam_count'] = convata_df['exam_count'].fillna(0).astype(int)
-    else:
-        convata_df['exam_count'] = 0
-
-    # ── Tier thresholds ────────────────────────────────────────────────────────
-    def _att_tier(rate):
-        if rate > 0.70: return 'Tier 1'
-        if rate >= 0.50: return 'Tier 2'
-        return 'Tier 3'
-
-    def _par_tier(rate):
-        if rate >= 0.60: return 'Tier 1'
-        if rate >= 0.40: return 'Tier 2'
-        return 'Tier 3'
-
-    def _exam_tier(n):
-        if n >= 5: return 'Tier 1'
-        if n >= 3: return 'Tier 2'
-        return 'Tier 3'
-
-    # ── Compute tiers ──────────────────────────────────────────────────────────
-    convata_df['Attendance Tier'] = convata_df['Class Attendance'].apply(_att_tier)
-    convata_df['Participation Tier'] = convata_df['Class Participation'].apply(_par_tier)
-    convata_df['Exam Tier'] = convata_df['exam_count'].apply(_exam_tier)
-    convata_df['Overall Tier Num'] = convata_df.apply(
-        lambda r: max(tier_num(r['Attendance Tier']), tier_num(r['Participation Tier']), tier_num(r['Exam Tier'])),
-        axis=1
-    )
-    convata_df['Overall Tier'] = convata_df['Overall Tier Num'].map({1: 'Tier 1', 2: 'Tier 2', 3: 'Tier 3'})
-
-    # ── Score outcome ──────────────────────────────────────────────────────────
-    def score_outcome(score):
-        if pd.isna(score): return 'No score reported'
-        if score >= 502:   return 'Passing'
-        if score >= 495:   return 'Borderline'
-        return 'Below 495'
-
-    convata_df['Score Outcome'] = convata_df['First Attempt'].apply(score_outcome)
-
-    # ── Cohort-level aggregates ────────────────────────────────────────────────
-    n_students    = len(convata_df)
-    n_passing     = int((convata_df['First Attempt'] >= 502).sum())
-    pct_passing   = n_passing / n_students if n_students > 0 else 0
-    avg_attendance    = convata_df['Class Attendance'].mean()
-    avg_participation = convata_df['Class Participation'].mean()
-
-    # ── Load mcat_source_data.csv for first exam dates and took-no-score list ──
-    mcat_src = None
-    for path in ['mcat_source_data.csv', './mcat_source_data.csv', 'student-data/mcat_source_data.csv']:
-        try:
-            if os.path.exists(path):
-                mcat_src = pd.read_csv(path)
-                break
-        except Exception:
-            continue
-
-    first_exam_date_map = {}
-    took_no_score_list = []
-    if mcat_src is not None and not mcat_src.empty:
-        for _, mr in mcat_src.iterrows():
-            sid = mr.get('student_id')
-            d = str(mr.get('first_exam_date', '')).strip()
-            if pd.notna(sid):
-                first_exam_date_map[int(sid)] = d if d not in ('', 'nan', '—') else '—'
-            if str(mr.get('category', '')).strip() == 'took_no_score':
-                _sid_int = int(sid) if pd.notna(sid) else None
-                took_no_score_list.append({
-                    'Student ID':              _sid_int if _sid_int else '—',
-                    '1st Exam Date':           d if d not in ('', 'nan') else '—',
-                    'Highest Practice Score':  highest_practice_map.get(_sid_int, '—') if _sid_int else '—',
-                    'College':                 mr.get('college', ''),
-                })
+    roster_df = load_dataset('roster')
+    try:
+        roster_df = roster_df.dropna(subset=['Student id'])
+        roster_df['Student id'] = pd.to_numeric(roster_df['Student id'], errors='coerce')
+        roster_df = roster_df[roster_df['Student id'].notna()].copy()
+        roster_df['Student id'] = roster_df['Student id'].astype(int)
+    except Exception:
+        roster_df = None
+
+    # ── Exam counts, tiers and score outcomes ─────────────────────────────────
+    test_df_c = load_dataset('test')
+    perf.lap('CSV loads', rows=len(convata_df))
+    highest_practice = highest_practice_scores(test_df_c)
+    convata_df = convata_tiers(convata_df, test_df_c)
+    perf.lap('convata tiering', rows=len(convata_df))
+
+    # ── First exam dates and took-no-score list from mcat_source_data.csv ─────
+    mcat_src = load_dataset('mcat_source')
+    exam_dates = first_exam_dates(mcat_src)
+    first_exam_by_student = exam_dates['date']
+    df_no_score = took_no_score(mcat_src, highest_practice)
+    perf.lap('first exam dates, took-no-score', rows=len(df_no_score))
 
     # ══════════════════════════════════════════════════════════════════════════
     # SECTION 4 — Score Outcome Distribution
     # ══════════════════════════════════════════════════════════════════════════
     st.subheader("Score Outcomes")
     outcome_order = ['Passing', 'Borderline', 'Below 495', 'No score reported']
-    outcome_counts_c = convata_df['Score Outcome'].value_counts()
-    outcome_data = []
-    for o in outcome_order:
-        cnt = int(outcome_counts_c.get(o, 0))
-        pct = cnt / n_students * 100 if n_students > 0 else 0
-        outcome_data.append({'Outcome': o, 'Count': cnt, 'Pct': f"{pct:.1f}%"})
-    df_outcome_c = pd.DataFrame(outcome_data)
+    df_outcome_c = score_outcome_counts(convata_df)
 
     oc1, oc2, oc3, oc4 = st.columns(4)
-    for col_w, row in zip([oc1, oc2, oc3, oc4], outcome_data):
+    for col_w, row in zip([oc1, oc2, oc3, oc4], df_outcome_c.to_dict('records')):
         with col_w:
             st.metric(row['Outcome'], f"{row['Count']} ({row['Pct']})")
     st.write(" ")
@@ -1560,6 +1206,7 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     fig_outcome_c.update_layout(showlegend=False, margin={'t': 60})
     fig_outcome_c = apply_light_mode_styling(fig_outcome_c)
     st.plotly_chart(fig_outcome_c, use_container_width=True)
+    perf.lap('chart: score outcomes')
     st.write(" ")
 
     # ══════════════════════════════════════════════════════════════════════════
@@ -1567,15 +1214,17 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     # ══════════════════════════════════════════════════════════════════════════
     st.subheader("Took Test — Score Not Yet Reported")
     st.caption(
-        f"{len(took_no_score_list)} students whose 1st exam date has passed "
+        f"{len(df_no_score)} students whose 1st exam date has passed "
         "but no score has been reported. These students need follow-up."
     )
     st.write(" ")
-    if took_no_score_list:
-        df_no_score = pd.DataFrame(took_no_score_list).sort_values('1st Exam Date')
-        st.markdown(df_no_score.to_html(escape=False, index=False), unsafe_allow_html=True)
+    if not df_no_score.empty:
+        badge_table(df_no_score, 'no_score', formats={
+            'Student ID': int_labels, '1st Exam Date': date_labels, 'Highest Practice Score': int_labels,
+        })
     else:
         st.success("All students whose exam date has passed have reported a score.")
+    perf.lap('took-no-score table', rows=len(df_no_score))
     st.write(" ")
 
     # ══════════════════════════════════════════════════════════════════════════
@@ -1584,67 +1233,44 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     st.subheader("Student Detail")
     st.write(" ")
 
-    # Sort: Tier 3 first, then by score urgency within tier
-    outcome_sort_map = {'No score reported': 0, 'Below 495': 1, 'Borderline': 2, 'Passing': 3}
-    convata_df['_outcome_sort'] = convata_df['Score Outcome'].map(outcome_sort_map)
-    detail_sorted = convata_df.sort_values(
-        ['Overall Tier Num', '_outcome_sort', 'Class Attendance'],
-        ascending=[False, True, True]
-    )
-
-    # Split into intervention (not passing) and passing
-    intervention_df = detail_sorted[detail_sorted['Score Outcome'] != 'Passing']
-    passing_df      = detail_sorted[detail_sorted['Score Outcome'] == 'Passing']
-
-    # Split intervention: Jan/Feb only vs March+April
-    def _is_march_or_april(sid):
-        date_str = first_exam_date_map.get(int(sid), '—')
-        return str(date_str).startswith('3') or str(date_str).startswith('4')
-
-    intervention_early   = intervention_df[~intervention_df['Student ID'].apply(_is_march_or_april)]
-    intervention_mar_apr = intervention_df[intervention_df['Student ID'].apply(_is_march_or_april)]
-
-    def _render_tier_table(df_subset):
-        tier_rows = []
-        for _, row in df_subset.iterrows():
-            sid = int(row['Student ID'])
-            score = row['First Attempt']
-            score_display = str(int(score)) if pd.notna(score) else "—"
-            next_date = str(row.get('Next Attempt Date', ''))
-            next_date = next_date if next_date.strip() not in ('', 'nan') else "—"
-            tier_rows.append({
-                'Student ID':              sid,
-                'Exam Tier':               tier_badge(row['Exam Tier']),
-                'Attendance Tier':         tier_badge(row['Attendance Tier']),
-                'Participation Tier':      tier_badge(row['Participation Tier']),
-                'Highest Practice Score':  highest_practice_map.get(sid, '—'),
-                '1st Exam Date':           first_exam_date_map.get(sid, '—'),
-                'First Attempt':           score_display,
-                'Next Attempt Date':       next_date,
-            })
-        df_tier_table = pd.DataFrame(tier_rows)
-        st.markdown(df_tier_table.to_html(escape=False, index=False), unsafe_allow_html=True)
+    # Tier 3 first, then by score urgency within tier; intervention split Jan/Feb vs March+April
+    intervention_early, intervention_mar_apr, passing_df = student_detail(convata_df, exam_dates)
+    perf.lap('student detail split', rows=len(intervention_early) + len(intervention_mar_apr))
+
+    def _render_tier_table(df_subset, key):
+        sids = df_subset['Student ID']
+        next_date = as_dates(df_subset['Next Attempt Date'])
+        df_tier_table = pd.DataFrame({
+            'Student ID':              sids,
+            'Exam Tier':               df_subset['Exam Tier'],
+            'Attendance Tier':         df_subset['Attendance Tier'],
+            'Participation Tier':      df_subset['Participation Tier'],
+            'Highest Practice Score':  sids.map(highest_practice).astype(float),
+            '1st Exam Date':           sids.map(first_exam_by_student),
+            'First Attempt':           df_subset['First Attempt'],
+            'Next Attempt Date':       next_date,
+        })
+        badge_table(
+            df_tier_table, key, {col: TIER_COLORS for col in ['Exam Tier', 'Attendance Tier', 'Participation Tier']},
+            formats={**SCORE_AND_DATE_FORMATS, 'Highest Practice Score': int_labels},
+        )
         st.write(" ")
 
         with st.expander("Engagement detail", expanded=False):
-            detail_rows = []
-            for _, row in df_subset.iterrows():
-                score = row['First Attempt']
-                score_display = str(int(score)) if pd.notna(score) else "—"
-                next_date = str(row.get('Next Attempt Date', ''))
-                next_date = next_date if next_date.strip() not in ('', 'nan') else "—"
-                detail_rows.append({
-                    'Student ID':        int(row['Student ID']),
-                    'Exams Reported':    int(row['exam_count']),
-                    'Attendance':        f"{row['Class Attendance']:.1%}",
-                    'Participation':     f"{row['Class Participation']:.1%}",
-                    'In-Class Accuracy': f"{row['In-Class Accuracy']:.1%}",
-                    'First Attempt':     score_display,
-                    'Score Outcome':     outcome_badge(row['Score Outcome']),
-                    'Next Attempt Date': next_date,
-                })
-            df_detail_table = pd.DataFrame(detail_rows)
-            st.markdown(df_detail_table.to_html(escape=False, index=False), unsafe_allow_html=True)
+            df_detail_table = pd.DataFrame({
+                'Student ID':        sids,
+                'Exams Reported':    df_subset['exam_count'].astype(int),
+                'Attendance':        df_subset['Class Attendance'],
+                'Participation':     df_subset['Class Participation'],
+                'In-Class Accuracy': df_subset['In-Class Accuracy'],
+                'First Attempt':     df_subset['First Attempt'],
+                'Score Outcome':     df_subset['Score Outcome'],
+                'Next Attempt Date': next_date,
+            })
+            badge_table(df_detail_table, f'{key}_detail', {'Score Outcome': OUTCOME_COLORS}, formats={
+                **SCORE_AND_DATE_FORMATS,
+                'Attendance': percent_labels, 'Participation': percent_labels, 'In-Class Accuracy': percent_labels,
+            })
 
     # ── Students Needing Intervention ─────────────────────────────────────────
     st.markdown("#### Students Needing Intervention")
@@ -1653,7 +1279,8 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     if intervention_early.empty:
         st.success("All students with reported scores are passing (≥502).")
     else:
-        _render_tier_table(intervention_early)
+        _render_tier_table(intervention_early, 'intervention_early')
+    perf.lap('intervention tables', rows=len(intervention_early))
 
     st.write(" ")
 
@@ -1663,7 +1290,8 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     if intervention_mar_apr.empty:
         st.success("No March or April test-takers require intervention.")
     else:
-        _render_tier_table(intervention_mar_apr)
+        _render_tier_table(intervention_mar_apr, 'intervention_mar_apr')
+    perf.lap('March/April tables', rows=len(intervention_mar_apr))
 
     st.write(" ")
 
@@ -1673,20 +1301,14 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
         if passing_df.empty:
             st.info("No students have reported a passing score yet.")
         else:
-            passing_rows = []
-            for _, row in passing_df.iterrows():
-                score = row['First Attempt']
-                score_display = str(int(score)) if pd.notna(score) else "—"
-                next_date = str(row.get('Next Attempt Date', ''))
-                next_date = next_date if next_date.strip() not in ('', 'nan') else "—"
-                passing_rows.append({
-                    'Student ID':        int(row['Student ID']),
-                    '1st Exam Date':     first_exam_date_map.get(int(row['Student ID']), '—'),
-                    'First Attempt':     score_display,
-                    'Next Attempt Date': next_date,
-                })
-            df_passing = pd.DataFrame(passing_rows)
-            st.markdown(df_passing.to_html(escape=False, index=False), unsafe_allow_html=True)
+            df_passing = pd.DataFrame({
+                'Student ID':        passing_df['Student ID'],
+                '1st Exam Date':     passing_df['Student ID'].map(first_exam_by_student),
+                'First Attempt':     passing_df['First Attempt'],
+                'Next Attempt Date': as_dates(passing_df['Next Attempt Date']),
+            })
+            badge_table(df_passing, 'passing', formats=SCORE_AND_DATE_FORMATS)
+    perf.lap('passing students table', rows=len(passing_df))
 
     # ══════════════════════════════════════════════════════════════════════════
     # PREDICTIONS
@@ -1694,77 +1316,26 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     st.write(" ")
     st.subheader("Predictions")
 
-    # Build numeric highest practice score map (student_id → float)
-    highest_practice_numeric = {}
-    if test_df_c is not None and not test_df_c.empty:
-        practice_mask_p = (
-            ~test_df_c['test_name'].isin(['First Attempt', 'Second Exam Attempt',
-                                          'Anticipated Test Date', 'Anticipated Exam Date']) &
-            pd.to_numeric(test_df_c['actual_exam_score'], errors='coerce').between(472, 528)
-        )
-        ps = test_df_c[practice_mask_p].copy()
-        ps['actual_exam_score'] = pd.to_numeric(ps['actual_exam_score'], errors='coerce')
-        highest_practice_numeric = ps.groupby('student_id')['actual_exam_score'].max().to_dict()
-
-    # Build convata lookup: student_id → (first_attempt_score, next_attempt_date)
-    convata_lookup = {}
-    if not convata_df.empty:
-        for _, r in convata_df.iterrows():
-            sid_c = int(r['Student ID'])
-            fa = pd.to_numeric(r.get('First Attempt', None), errors='coerce')
-            nd = str(r.get('Next Attempt Date', '')).strip()
-            convata_lookup[sid_c] = (fa, nd)
-
-    # All students with a practice score
-    students_with_practice = {sid: score for sid, score in highest_practice_numeric.items()}
-
-    # Untested students: have a practice score but no first attempt score yet
-    untested = {sid: score for sid, score in students_with_practice.items()
-                if pd.isna(convata_lookup.get(int(sid), (float('nan'), ''))[0])}
-    total_untested = len(untested)
-    untested_above_502 = sum(1 for s in untested.values() if s > 502)
-    pct_untested_above = untested_above_502 / total_untested if total_untested > 0 else 0
+    predictions = prediction_table(load_dataset('convata'), test_df_c, mcat_src)
+    untested = untested_summary(predictions)
+    perf.lap('predictions: untested', rows=untested['untested'])
 
     st.metric(
         label="Scholars who have not yet taken the exam with highest practice score > 502",
-        value=f"{pct_untested_above:.1%}",
-        help=f"{untested_above_502} of {total_untested} students who have not yet taken their first exam"
+        value=f"{untested['pct_above_502']:.1%}",
+        help=f"{untested['above_502']} of {untested['untested']} students who have not yet taken their first exam"
     )
 
     st.write(" ")
 
     # ── Graph 1: First-time vs Second-time exam takers in April and May ────────
-    # First-time: first_exam_date in April (4/) or May (5/), no first attempt score
-    # Second-time: next_attempt_date in April (4/) or May (5/), has first attempt score
-    taker_data = []
-    for sid_c, (fa_score, next_date) in convata_lookup.items():
-        if pd.notna(fa_score):
-            # Already tested — second-time taker, bucketed by next attempt date
-            nd_prefix = next_date.split('/')[0] if '/' in next_date else ''
-            if nd_prefix in ('4', '5'):
-                taker_data.append({
-                    'Month': 'April' if nd_prefix == '4' else 'May',
-                    'Type': 'Second-time exam taker',
-                })
-        else:
-            # Not yet tested — first-time taker, bucketed by first exam date
-            date_str = str(first_exam_date_map.get(sid_c, '—'))
-            fd_prefix = date_str.split('/')[0] if '/' in date_str else ''
-            if fd_prefix in ('4', '5'):
-                taker_data.append({
-                    'Month': 'April' if fd_prefix == '4' else 'May',
-                    'Type': 'First-time exam taker',
-                })
-
-    if taker_data:
-        taker_df = pd.DataFrame(taker_data)
-        month_order = ['April', 'May']
-        taker_df['Month'] = pd.Categorical(taker_df['Month'], categories=month_order, ordered=True)
+    # First-time: first_exam_date in April or May of the exam year, no first attempt score
+    # Second-time: next_attempt_date in April or May of the exam year, has first attempt score
+    taker_counts = taker_shares(predictions)
+    perf.lap('predictions: taker shares')
 
-        # Count and compute percentages within each month
-        taker_counts = taker_df.groupby(['Month', 'Type'], observed=True).size().reset_index(name='Count')
-        month_totals = taker_counts.groupby('Month', observed=True)['Count'].transform('sum')
-        taker_counts['Percentage'] = (taker_counts['Count'] / month_totals * 100).round(1)
+    if taker_counts is not None:
+        month_order = ['April', 'May']
 
         st.markdown("**Share of First-time vs Second-time Takers — April & May**")
         st.caption("Percentage breakdown of first-time vs second-time exam takers within each month.")
@@ -1789,6 +1360,7 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
             yaxis=dict(range=[0, 100], ticksuffix='%'),
         )
         st.plotly_chart(fig_pct, use_container_width=True)
+        perf.lap('chart: taker shares')
 
     st.write(" ")
 
@@ -1798,40 +1370,12 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
     #     (March or April) using their highest practice score as the predictor.
     #   - Students WITH a first attempt score → placed in their Next Attempt Date month
     #     (April or May) using their actual first attempt score as the predictor.
-    chart_data = []
-
-    def _practice_group(score):
-        if score > 502:   return '> 502 (Passing)'
-        if score >= 495:  return '495–501 (Borderline)'
-        return '< 495 (Below)'
-
-    month_prefix_map = {'3': 'March', '4': 'April', '5': 'May'}
-
-    for sid, practice_score in students_with_practice.items():
-        sid_int = int(sid)
-        fa_score, next_date = convata_lookup.get(sid_int, (float('nan'), ''))
+    grouped = score_outlook(predictions)
+    perf.lap('predictions: score outlook')
 
-        if pd.notna(fa_score):
-            # Student has taken an exam — use first attempt score + next attempt date month
-            nd_prefix = next_date.split('/')[0] if '/' in next_date else ''
-            month = month_prefix_map.get(nd_prefix)
-            score_to_use = fa_score
-        else:
-            # Student has not yet taken an exam — use highest practice score + first exam date month
-            date_str = str(first_exam_date_map.get(sid_int, '—'))
-            fd_prefix = date_str.split('/')[0] if '/' in date_str else ''
-            month = month_prefix_map.get(fd_prefix)
-            score_to_use = practice_score
-
-        if month:
-            chart_data.append({'Month': month, 'Group': _practice_group(score_to_use)})
-
-    if chart_data:
-        chart_df = pd.DataFrame(chart_data)
+    if grouped is not None:
         month_order = ['March', 'April', 'May']
         group_order = ['> 502 (Passing)', '495–501 (Borderline)', '< 495 (Below)']
-        chart_df['Month'] = pd.Categorical(chart_df['Month'], categories=month_order, ordered=True)
-        grouped = chart_df.groupby(['Month', 'Group'], observed=True).size().reset_index(name='Count')
 
         st.markdown("**Score Outlook by Exam Month**")
         st.caption(
@@ -1862,5 +1406,17 @@ elif view_mode == "EY25 Scholar March-May Engagement, Interventions, and Predict
             legend_title_text='Score',
         )
         st.plotly_chart(fig_pred, use_container_width=True)
+        perf.lap('chart: score outlook')
     else:
         st.info("No score data available for March, April, or May test-takers.")
+
+# ── Performance panel ──────────────────────────────────────────────────────────
+perf.lap('page end')
+if show_perf:
+    with st.sidebar.expander("Performance", expanded=True):
+        st.metric("Total", f"{perf.total_ms:.0f} ms")
+        st.dataframe(pd.DataFrame(perf.records()).astype({'rows': 'Int64'}), use_container_width=True, hide_index=True)
+        frames = memory_report()
+        st.metric("Loaded frames", f"{frames['kb'].sum():,.0f} KB")
+        st.dataframe(frames, use_container_width=True, hide_index=True)
+perf.write_log(view_mode)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Cached PDF page rasterization for the calendar views.
+
+Pages are rendered with PyMuPDF (fitz) once per PDF content hash + page + zoom
+and kept both in memory and as PNGs under RENDER_CACHE_DIR, so reruns and
+fresh processes serve the bytes directly instead of rasterizing again.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+RENDER_CACHE_DIR = '.render_cache'
+MEMORY_CACHE_PAGES = 64
+
+_pages = OrderedDict()   # (digest, page, zoom) -> PNG bytes, LRU
+_digests = {}            # abspath -> ((mtime_ns, size), digest, page_count)
+_lock = threading.Lock()
+
+
+def _fingerprint(pdf_path):
+    """(sha256 of the file, page count), recomputed only when mtime/size change."""
+    path = os.path.abspath(pdf_path)
+    st_ = os.stat(path)
+    stamp = (st_.st_mtime_ns, st_.st_size)
+    with _lock:
+        hit = _digests.get(path)
+        if hit is not None and hit[0] == stamp:
+            return hit[1], hit[2]
+    with open(path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    import fitz
+    with fitz.open(path) as doc:
+        n_pages = len(doc)
+    with _lock:
+        _digests[path] = (stamp, digest, n_pages)
+    return digest, n_pages
+
+
+def page_count(pdf_path):
+    return _fingerprint(pdf_path)[1]
+
+
+def _disk_path(digest, page, zoom):
+    return os.path.join(RENDER_CACHE_DIR, f'{digest[:32]}-p{page}-z{zoom:g}.png')
+
+
+def _remember(key, png):
+    with _lock:
+        _pages[key] = png
+        _pages.move_to_end(key)
+        while len(_pages) > MEMORY_CACHE_PAGES:
+            _pages.popitem(last=False)
+
+
+def _lookup(key):
+    with _lock:
+        png = _pages.get(key)
+        if png is not None:
+            _pages.move_to_end(key)
+            return png
+    disk = _disk_path(*key)
+    if os.path.exists(disk):
+        with open(disk, 'rb') as f:
+            png = f.read()
+        _remember(key, png)
+        return png
+    return None
+
+
+def _store(key, png):
+    _remember(key, png)
+    try:
+        os.makedirs(RENDER_CACHE_DIR, exist_ok=True)
+        disk = _disk_path(*key)
+        tmp = f'{disk}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(png)
+        os.replace(tmp, disk)
+    except OSError:
+        pass  # read-only deploys still get the in-memory cache
+
+
+def render_pages(pdf_path, zoom=2.0, pages=None):
+    """
+    PNG bytes for the given page indices (default: all pages) at zoom.
+    Cached pages are served directly; the PDF is opened once for any misses.
+    """
+    digest, n_pages = _fingerprint(pdf_path)
+    pages = list(range(n_pages)) if pages is None else list(pages)
+    out = {}
+    missing = []
+    for i in pages:
+        png = _lookup((digest, i, zoom))
+        if png is None:
+            missing.append(i)
+        else:
+            out[i] = png
+    if missing:
+        import fitz
+        with fitz.open(pdf_path) as doc:
+            mat = fitz.Matrix(zoom, zoom)
+            for i in missing:
+                pix = doc.load_page(i).get_pixmap(matrix=mat, alpha=False)
+                out[i] = pix.tobytes("png")
+                _store((digest, i, zoom), out[i])
+    return [out[i] for i in pages]
+
+
+def render_page(pdf_path, page, zoom=2.0):
+    return render_pages(pdf_path, zoom, [page])[0]
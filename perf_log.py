@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Per-section wall time and row counts for one dashboard run.
+
+main.py creates a SectionTimer at the top of every script run and calls
+lap(name, rows) at the end of each section (data loads, metric computations,
+PDF rendering, chart builds); each lap is the time since the previous one, so
+the sections add up to the whole run. At the end of the run the sections are
+shown in the optional sidebar Performance panel and appended as one JSON line
+to PERF_LOG_PATH. Fragment reruns (the per-student section of the Individual
+view) are timed with their own SectionTimer and logged with a 'fragment' key.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+
+PERF_LOG_PATH = os.environ.get('DASHBOARD_PERF_LOG', 'perf_log.jsonl')
+
+
+def row_count(obj):
+    """len() of a DataFrame / Series / collection, or None."""
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+class SectionTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._last = self.started
+        self.sections = []
+        self.written = False
+
+    def lap(self, name, rows=None):
+        """Record the time since the previous lap (or the start) as section name."""
+        now = time.perf_counter()
+        self.sections.append({'section': name, 'ms': round((now - self._last) * 1000, 2), 'rows': rows})
+        self._last = now
+
+    @property
+    def total_ms(self):
+        return round((self._last - self.started) * 1000, 2)
+
+    def records(self):
+        """Sections as a list of {'section', 'ms', 'rows'} dicts, in run order."""
+        return list(self.sections)
+
+    def write_log(self, view, path=PERF_LOG_PATH, **extra):
+        """Append this run as one JSON line; silently skipped on read-only deploys."""
+        self.written = True
+        if not path:
+            return
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'view': view,
+            'total_ms': self.total_ms,
+            'sections': self.sections,
+        }
+        record.update(extra)
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        except OSError:
+            pass
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Vega-Lite specs and data for the Individual Student charts.
+
+Each chart's spec is built from an Altair chart without data once per
+process; the per-student data is folded and projected server-side to just
+the plotted columns (the long variable / value layout transform_fold would
+produce in the browser), so a rerun sends a few hundred bytes per chart
+instead of every engagement column. Chart data is kept in a small LRU keyed
+on (chart, student_id) and checked against the identity of the student's
+rows, which only change with a new file version (see student_index).
+"""
+
+import threading
+from collections import OrderedDict
+
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from analytics.engagement import THROUGH_WEEK
+
+MEMORY_CACHE_CHARTS = 256
+
+_specs = {}
+_data = OrderedDict()   # (chart, student_id) -> (student rows it was built from, chart data), LRU
+_lock = threading.Lock()
+
+_WEEK = alt.X('week:O', axis=alt.Axis(labelAngle=0, title='Week'))
+_WEEK_TIPS = [alt.Tooltip('week:O', title='Week'), alt.Tooltip('date_range:N', title='Date Range')]
+
+
+def _exam_scores():
+    return alt.Chart().mark_point().encode(
+        x=alt.X('yearmonthdate(test_date):O', axis=alt.Axis(labelAngle=-45, title='Test Date')),
+        y=alt.Y('value:Q', axis=alt.Axis(title='Practice Exam Score'), scale=alt.Scale(domain=[470, 528])),
+        tooltip=[
+            alt.Tooltip('test_date:T', title='Test Date'),
+            alt.Tooltip('value:Q', title='Exam Score')
+        ],
+        color=alt.Color('variable:N', legend=alt.Legend(
+            title='Exam Scores', orient='bottom',
+            labelExpr="'Practice Exam Score'"
+        ))
+    )
+
+
+def _attendance():
+    return alt.Chart().mark_line(point=True).encode(
+        x=_WEEK,
+        y=alt.Y('value:Q', axis=alt.Axis(title='Weekly Attendance Rate', format='%'), scale=alt.Scale(domain=[0, 1])),
+        tooltip=_WEEK_TIPS + [alt.Tooltip('value:Q', title='Weekly Attendance Rate', format='0.0%')],
+        color=alt.Color('variable:N', legend=alt.Legend(
+            title='Session Type', orient='bottom',
+            labelExpr="datum.value == 'large_session' ? 'Classes with All Students' : 'Small Group Sessions'"
+        ))
+    )
+
+
+def _question_sets():
+    return alt.Chart().mark_line(point=True).encode(
+        x=_WEEK,
+        y=alt.Y('total_completed_passages_discrete_sets:Q', axis=alt.Axis(title='Completed Number of Question Sets')),
+        tooltip=_WEEK_TIPS + [alt.Tooltip('total_completed_passages_discrete_sets:Q', title='Completed Count')]
+    )
+
+
+def _accuracy():
+    return alt.Chart().mark_line(point=True).encode(
+        x=_WEEK,
+        y=alt.Y('value:Q', axis=alt.Axis(title='Average Accuracy (%)', format='%')),
+        tooltip=_WEEK_TIPS + [alt.Tooltip('value:Q', title='Accuracy Rate', format='0.1%')],
+        color=alt.Color('variable:N', legend=alt.Legend(
+            title='Subject', orient='bottom',
+            labelExpr="datum.value == 'cars_accuracy' ? 'CARS Questions' : datum.value == 'class_accuracy' ? 'In-Class Questions' : 'Science Questions'"
+        ))
+    )
+
+
+def _lessons():
+    return alt.Chart().mark_line(point=True).encode(
+        x=_WEEK,
+        y=alt.Y('value:Q', axis=alt.Axis(title='Completed Count')),
+        tooltip=_WEEK_TIPS + [alt.Tooltip('value:Q', title='Completed Number of Lessons')],
+        color=alt.Color('variable:N', legend=alt.Legend(
+            title='Type', orient='bottom',
+            labelExpr="'Completed Course Lessons'"
+        ))
+    )
+
+
+# Chart -> (Altair chart builder, no data; columns kept, columns folded into variable / value, last week or None)
+CHARTS = {
+    'exam_scores': (_exam_scores, ['test_date'], ['actual_exam_score'], None),
+    'attendance': (_attendance, ['week', 'date_range'], ['large_session', 'small_session'], None),
+    'question_sets': (_question_sets, ['week', 'date_range', 'total_completed_passages_discrete_sets'], [], THROUGH_WEEK),
+    'accuracy': (_accuracy, ['week', 'date_range'], ['sciences_accuracy', 'cars_accuracy', 'class_accuracy'], THROUGH_WEEK),
+    'lessons': (_lessons, ['week', 'date_range'], ['completed_lessons'], THROUGH_WEEK),
+}
+
+
+def fold(rows, keys, columns):
+    """
+    keys repeated once per column plus variable (the column name) and value,
+    row by row in the order Vega-Lite's fold transform emits them; missing
+    values stay NaN (null in the chart data). With more than one column the
+    repeated text columns are categorical, so Arrow sends each string once.
+    """
+    n, k = len(rows), len(columns)
+    data = {}
+    for key in keys:
+        values = rows[key]
+        if k > 1 and values.dtype == 'str':
+            codes, uniques = pd.factorize(values)
+            data[key] = pd.Categorical.from_codes(np.repeat(codes, k), categories=uniques)
+        else:
+            data[key] = np.repeat(values.to_numpy(), k)
+    variable = np.tile(np.arange(k), n)
+    data['variable'] = pd.Categorical.from_codes(variable, categories=columns) if k > 1 else np.array(columns)[variable]
+    values = [rows[col].to_numpy(dtype='float64', na_value=np.nan) for col in columns]
+    data['value'] = np.column_stack(values).ravel() if n else np.empty(0)
+    return pd.DataFrame(data)
+
+
+def chart_spec(chart):
+    """Vega-Lite spec (no data) of one of CHARTS, built once per process; treat as read-only."""
+    with _lock:
+        spec = _specs.get(chart)
+    if spec is None:
+        spec = CHARTS[chart][0]().to_dict()
+        # Data is passed separately; the view size comes from the default theme, Streamlit sizes the chart itself
+        for key in ('data', 'datasets', 'config'):
+            spec.pop(key, None)
+        with _lock:
+            _specs[chart] = spec
+    return spec
+
+
+def chart_data(chart, rows):
+    """The plotted columns of a student's rows for one of CHARTS (folded where the chart folds)."""
+    _, keys, columns, last_week = CHARTS[chart]
+    if last_week is not None:
+        rows = rows[rows['week'] <= last_week]
+    if not columns:
+        return rows[keys].reset_index(drop=True)
+    return fold(rows, keys, columns)
+
+
+def student_chart(chart, student_id, rows):
+    """(spec, data) for one student's chart; data is rebuilt only when the student's rows change."""
+    key = (chart, student_id)
+    with _lock:
+        hit = _data.get(key)
+        if hit is not None and hit[0] is rows:
+            _data.move_to_end(key)
+            return _specs[chart], hit[1]
+    spec = chart_spec(chart)
+    data = chart_data(chart, rows)
+    with _lock:
+        _data[key] = (rows, data)
+        _data.move_to_end(key)
+        while len(_data) > MEMORY_CACHE_CHARTS:
+            _data.popitem(last=False)
+    return spec, data
+
+
+def clear_cache():
+    with _lock:
+        _data.clear()
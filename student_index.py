@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Student-keyed indexes over the shared datasets for the per-student views.
+
+Each index is built with one groupby over the (derived) table and cached on the
+identity of the frame data_loader hands out, which only changes when the file
+on disk does; looking a student up is then a dict access instead of a
+full-table boolean scan.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from data_loader import load_dataset
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def index_by_student(df, key='student_id'):
+    """{student_id: rows} from a single groupby; rows keep their original labels."""
+    if df is None or df.empty or key not in df.columns:
+        return {}
+    return {sid: rows for sid, rows in df.groupby(key, sort=False)}
+
+
+def student_rows(index, df, student_id):
+    """Rows for student_id, or an empty frame with df's columns."""
+    rows = index.get(student_id)
+    if rows is None:
+        return df.iloc[0:0]
+    return rows
+
+
+def with_session_rates(df):
+    """Engagement rows plus date_range and weekly large/small session attendance rates."""
+    df = df.copy()
+    df['date_range'] = df['start_date'].dt.strftime('%m/%d/%y') + ' - ' + df['end_date'].dt.strftime('%m/%d/%y')
+    for col in ['num_attended_large_session', 'num_scheduled_large_session',
+                'num_attended_small_session', 'num_scheduled_small_session']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+    df['large_session'] = df['num_attended_large_session'] / df['num_scheduled_large_session'].replace(0, np.nan)
+    df['small_session'] = df['num_attended_small_session'] / df['num_scheduled_small_session'].replace(0, np.nan)
+    return df
+
+
+def with_test_day(df):
+    """Test rows with test_date as a plain date (as displayed per student)."""
+    df = df.copy()
+    df['test_date'] = df['test_date'].dt.date
+    return df
+
+
+def cached_index(name, derive=None):
+    """
+    (derived frame, {student_id: rows}) for a data_loader dataset, or (None, {})
+    when it is missing. Rebuilt only when the loader returns a different frame.
+    """
+    df = load_dataset(name)
+    if df is None:
+        return None, {}
+    with _lock:
+        hit = _indexes.get((name, derive))
+        if hit is not None and hit[0] is df:
+            return hit[1], hit[2]
+    derived = derive(df) if derive is not None else df
+    index = index_by_student(derived)
+    with _lock:
+        _indexes[(name, derive)] = (df, derived, index)
+    return derived, index
+
+
+def engagement_index():
+    return cached_index('engagement', with_session_rates)
+
+
+def test_index():
+    return cached_index('test', with_test_day)
+
+
+def tier_index():
+    return cached_index('tier')
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Write a synthetic cohort with the same files and columns as institution-1:
+engagement, test, tier, convata, mcat_source, roster and Interventions_initial,
+at any number of students, for benchmarking (see benchmark.py).
+
+Values are random but shaped like the real exports (M/D/YY engagement and
+convata dates, blank small-group weeks, percentage strings in convata, '—'
+for missing mcat_source dates, a trailing empty engagement column), so
+data_loader, build_tier_csv and the analytics package treat them the same.
+tier.csv is built from the synthetic engagement data with build_tier_csv.
+
+Usage: python synth_cohort.py --students 10000 [--weeks 38] [--seed 0] [--out-dir synthetic/10000]
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+import build_tier_csv
+
+PROGRAM_START = pd.Timestamp('2025-06-02')   # Monday of week 1
+DEFAULT_WEEKS = 38
+SMALL_GROUP_FIRST_WEEK = 14                    # small group sessions are blank before this week
+PRACTICE_TEST_NAMES = [
+    'JW Exam 1', 'JW Exam 2', 'JW Exam 3', 'AAMC Free Sample Test (Unscored)',
+    'AAMC Practice Exam 1', 'AAMC Practice Exam 2', 'AAMC Practice Exam 3',
+    'AAMC Practice Exam 4', 'AAMC Practice Exam 5', 'AAMC Practice Exam 6',
+]
+COLLEGES = [
+    'Baylor Univ', 'Texas A&M Univ', 'Univ of Texas at Austin', 'Univ of Texas at El Paso',
+    'Univ of Houston', 'Texas Tech Univ', 'Univ of North Texas',
+]
+FIRST_NAMES = ['Alex', 'Jordan', 'Sam', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_INITIALS = 'ABCDEFGHIJKLMNOPRSTVWZ'
+
+FILENAMES = {
+    'engagement': 'institution-1-engagement-data.csv',
+    'test': 'institution-1-test-data.csv',
+    'tier': 'tier.csv',
+    'convata': 'convata_data.csv',
+    'mcat_source': 'mcat_source_data.csv',
+    'roster': 'roster.csv',
+    'interventions': 'Interventions_initial.csv',
+}
+
+
+def _mdy(dates):
+    """Timestamps -> unpadded M/D/YY strings, as in the engagement and convata exports."""
+    dates = pd.DatetimeIndex(dates)
+    return [f'{d.month}/{d.day}/{d.year % 100:02d}' for d in dates]
+
+
+def _blank(rng, values, p):
+    """values with a fraction p replaced by NaN."""
+    values = values.astype(float)
+    values[rng.random(len(values)) < p] = np.nan
+    return values
+
+
+def _scores(rng, n, mean=497, sd=8):
+    return np.clip(np.round(rng.normal(mean, sd, n)), 472, 528)
+
+
+def engagement(rng, n_students, n_weeks):
+    """One row per student per week; small-group and accuracy columns blank where the real export is."""
+    week = np.repeat(np.arange(1, n_weeks + 1), n_students)
+    student = np.tile(np.arange(1, n_students + 1), n_weeks)
+    n = len(week)
+    starts = PROGRAM_START + pd.to_timedelta(7 * np.arange(n_weeks), unit='D')
+    start_str = np.array(_mdy(starts))
+    end_str = np.array(_mdy(starts + pd.Timedelta(days=6)))
+
+    # Each student attends at a personal rate so the tiers spread out
+    attend_rate = rng.beta(2, 1.5, n_students)[student - 1]
+    sched_large = rng.choice([1, 2], n, p=[0.1, 0.9]).astype(float)
+    att_large = rng.binomial(sched_large.astype(int), attend_rate).astype(float)
+    no_class = rng.random(n) < 0.25
+    sched_large[no_class] = np.nan
+    att_large[no_class] = np.nan
+    sched_small = np.where(week >= SMALL_GROUP_FIRST_WEEK, 1.0, np.nan)
+    att_small = np.where(week >= SMALL_GROUP_FIRST_WEEK, rng.binomial(1, attend_rate * 0.6), np.nan)
+
+    df = pd.DataFrame({
+        'week': week,
+        'start_date': start_str[week - 1],
+        'end_date': end_str[week - 1],
+        'student_id': student,
+        'cars_accuracy': _blank(rng, np.round(rng.uniform(0.3, 1, n), 2), 0.73),
+        'sciences_accuracy': _blank(rng, np.round(rng.uniform(0.4, 1, n), 2), 0.6),
+        'class_accuracy': _blank(rng, np.round(rng.uniform(0.5, 1, n), 2), 0.85),
+        'completed_lessons': _blank(rng, rng.poisson(2.6, n), 0.25),
+        'total_completed_passages_discrete_sets': _blank(rng, rng.poisson(3.5, n), 0.25),
+        'score_trends_on_completed_dailies': _blank(rng, np.round(rng.uniform(0, 1.2, n), 2), 0.34),
+        'num_attended_large_session': att_large,
+        'num_scheduled_large_session': sched_large,
+        'num_attended_small_session': att_small,
+        'num_scheduled_small_session': sched_small,
+        'class_participation': _blank(rng, np.round(rng.uniform(0, 1, n), 2), 0.77),
+        'homework_participation': _blank(rng, np.round(rng.uniform(0, 1, n), 2), 0.77),
+        '': np.nan,   # the export ends every line with a comma
+    })
+    counts = ['completed_lessons', 'total_completed_passages_discrete_sets',
+              'num_attended_large_session', 'num_scheduled_large_session',
+              'num_attended_small_session', 'num_scheduled_small_session']
+    df[counts] = df[counts].astype('Int64')
+    return df
+
+
+def tests(rng, n_students, first_attempt):
+    """Practice exams, First Attempt / Second Exam Attempt scores and anticipated dates (long table)."""
+    ids = np.arange(1, n_students + 1)
+    n_practice = rng.poisson(3, n_students)
+    practice_ids = np.repeat(ids, n_practice)
+    n = len(practice_ids)
+    practice = pd.DataFrame({
+        'student_id': practice_ids,
+        'test_name': rng.choice(PRACTICE_TEST_NAMES, n),
+        'test_date': pd.Timestamp('2025-08-01') + pd.to_timedelta(rng.integers(0, 200, n), unit='D'),
+        'actual_exam_score': _scores(rng, n, 496, 9),
+    })
+
+    taken = ~np.isnan(first_attempt)
+    first = pd.DataFrame({
+        'student_id': ids[taken],
+        'test_name': 'First Attempt',
+        'test_date': pd.Timestamp('2026-01-10') + pd.to_timedelta(rng.integers(0, 90, taken.sum()), unit='D'),
+        'actual_exam_score': first_attempt[taken],
+    })
+    second_ids = ids[taken & (rng.random(n_students) < 0.2)]
+    second = pd.DataFrame({
+        'student_id': second_ids,
+        'test_name': 'Second Exam Attempt',
+        'test_date': pd.Timestamp('2026-03-01') + pd.to_timedelta(rng.integers(0, 90, len(second_ids)), unit='D'),
+        'actual_exam_score': np.nan,
+    })
+    ant_ids = ids[rng.random(n_students) < 0.8]
+    anticipated = pd.DataFrame({
+        'student_id': ant_ids,
+        'test_name': rng.choice(['Anticipated Exam Date', 'Anticipated Test Date'], len(ant_ids), p=[0.9, 0.1]),
+        'test_date': pd.Timestamp('2026-01-05') + pd.to_timedelta(rng.integers(0, 140, len(ant_ids)), unit='D'),
+        'actual_exam_score': np.nan,
+    })
+    df = pd.concat([practice, first, second, anticipated], ignore_index=True)
+    df = df.sort_values(['test_date', 'student_id'], kind='stable')
+    df['test_date'] = df['test_date'].dt.strftime('%Y-%m-%d')
+    df['actual_exam_score'] = df['actual_exam_score'].astype('Int64')
+    return df
+
+
+def convata(rng, n_students, first_attempt):
+    """Percentage-string rates, First Attempt score and (for testers) a Next Attempt Date."""
+    taken = ~np.isnan(first_attempt)
+    next_dates = np.array(_mdy(pd.Timestamp('2026-04-01') + pd.to_timedelta(rng.integers(0, 60, n_students), unit='D')),
+                          dtype=object)
+    next_dates[~taken | (rng.random(n_students) < 0.3)] = ''
+
+    def pct():
+        return [f'{v:.1f}%' for v in np.round(rng.beta(1.2, 1.5, n_students) * 100, 1)]
+
+    return pd.DataFrame({
+        'Student ID': np.arange(1, n_students + 1),
+        'Class Attendance': pct(),
+        'Class Participation': pct(),
+        'In-Class Accuracy': pct(),
+        'First Attempt': first_attempt,
+        'Next Attempt Date': next_dates,
+    })
+
+
+def mcat_source(rng, n_students, first_attempt):
+    """First exam date / score and outcome category per student ('—' for missing dates)."""
+    taken = ~np.isnan(first_attempt)
+    dates = np.array(_mdy(pd.Timestamp('2026-01-10') + pd.to_timedelta(rng.integers(0, 110, n_students), unit='D')),
+                     dtype=object)
+    no_date = ~taken & (rng.random(n_students) < 0.15)
+    took_no_score = ~taken & ~no_date & (rng.random(n_students) < 0.35)
+    dates[no_date] = '—'
+    category = np.select(
+        [no_date, took_no_score, ~taken, first_attempt >= 502, first_attempt >= 495],
+        ['no_date', 'took_no_score', 'future', 'passing', 'borderline'],
+        default='below_495',
+    )
+    return pd.DataFrame({
+        'student_id': np.arange(1, n_students + 1).astype(float),
+        'college': np.where(rng.random(n_students) < 0.85, rng.choice(COLLEGES, n_students), None),
+        'first_exam_date': dates,
+        'first_exam_score': first_attempt,
+        'second_exam_date': '—',
+        'category': category,
+    })
+
+
+def roster(rng, n_students):
+    first = rng.choice(FIRST_NAMES, n_students)
+    last = rng.choice(list(LAST_INITIALS), n_students)
+    return pd.DataFrame({
+        'student_id': np.arange(1, n_students + 1),
+        'display_name': [f'{f} {l}.' for f, l in zip(first, last)],
+    })
+
+
+def interventions(rng, n_students, path):
+    """Sectioned export: three titled blocks, each with its own header row."""
+    sections = [
+        ('Students with No Reported Practice Exam Scores,,,,,',
+         'Student ID,Student Name,Responded to Intervention (Reported Exam Scores),Passing,Most Recent Score,', 0.1),
+        ('Students with No Anticipated Exam Date,,,,,',
+         'Student ID,Student Name,Responded to Intervention (Reported Exam Date),Exam Date,Most Recent Reported Score,', 0.2),
+        ('Tier 3 Students (495–500 or Tier 3 Attendance with <502),,,,,',
+         'Student ID,Student Name,Responded to Email,Responded to Survey,,', 0.3),
+    ]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for title, header, share in sections:
+            f.write(title + '\n' + header + '\n')
+            ids = np.flatnonzero(rng.random(n_students) < share) + 1
+            for sid in ids:
+                a, b = rng.random(2) < 0.4
+                f.write(f'{sid},Student {sid},{str(a).upper()},{str(b).upper()},,\n')
+
+
+def generate(n_students, out_dir, n_weeks=DEFAULT_WEEKS, seed=0):
+    """Write every cohort file for n_students into out_dir; returns {dataset: path}."""
+    rng = np.random.default_rng(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {name: os.path.join(out_dir, filename) for name, filename in FILENAMES.items()}
+
+    first_attempt = np.where(rng.random(n_students) < 0.35, _scores(rng, n_students, 496, 10), np.nan)
+
+    engagement(rng, n_students, n_weeks).to_csv(paths['engagement'], index=False)
+    tests(rng, n_students, first_attempt).to_csv(paths['test'], index=False)
+    convata(rng, n_students, first_attempt).to_csv(paths['convata'], index=False)
+    mcat_source(rng, n_students, first_attempt).to_csv(paths['mcat_source'], index=False)
+    roster(rng, n_students).to_csv(paths['roster'], index=False)
+    interventions(rng, n_students, paths['interventions'])
+
+    tier, _ = build_tier_csv.build_tiers(paths['engagement'], verbose=False)
+    tier.to_csv(paths['tier'], index=False)
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write a synthetic institution cohort.')
+    parser.add_argument('--students', type=int, default=1000)
+    parser.add_argument('--weeks', type=int, default=DEFAULT_WEEKS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out-dir', help='Output directory (default: synthetic/<students>).')
+    args = parser.parse_args()
+    out_dir = args.out_dir or os.path.join('synthetic', str(args.students))
+    for name, path in generate(args.students, out_dir, args.weeks, args.seed).items():
+        print(f'  {name}: {path} ({os.path.getsize(path) / 1024:.0f} KB)')